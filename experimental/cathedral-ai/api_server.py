@@ -4,27 +4,57 @@ Cathedral AI: FastAPI Server
 REST API for querying Cathedral construction substrate.
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Response
+from fastapi.responses import PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
+import asyncio
 import os
+import threading
+
+import metrics
+import profiling
 
 # Import vector store (will fail gracefully if dependencies missing)
 try:
-    from generate_embeddings import CathedralVectorStore
+    from generate_embeddings import DEFAULT_COLLECTION, CathedralVectorStore, LazyModel
+    from snapshot import SnapshotClient
+    from collection_registry import CollectionRegistry
+    from facet_index import parse_timestamp
+    from timelines import TIMELINE_DEPTH
+    from neighbor_graph import DEFAULT_K
 except ImportError:
     print("❌ Could not import CathedralVectorStore")
     print("   Run: python3 generate_embeddings.py first")
     exit(1)
 
+class InstrumentedRoute(APIRoute):
+    """Route whose handler reports its endpoint and timing to metrics
+
+    Routes re-added by include_router keep their original wrapper, so
+    /collections/{collection}/query is reported as /query.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if not hasattr(endpoint, 'uninstrumented'):
+            endpoint = metrics.instrument_endpoint(path, endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Cathedral AI Substrate API",
     description="Query Cathedral construction substrate - what Grok asked for",
     version="1.0.0"
 )
+app.router.route_class = InstrumentedRoute
+
+# Collection-scoped endpoints, served at /... (the startup collection, or
+# ?collection=name) and at /collections/{collection}/...
+router = APIRouter(route_class=InstrumentedRoute)
 
 # CORS middleware (allow cross-origin requests)
 app.add_middleware(
@@ -35,32 +65,104 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize vector store (global)
-vector_store = None
+# Opt-in stack sampling of single requests (see profiling.py); added first
+# so it runs inside the metrics middleware and sees the route template
+app.add_middleware(profiling.ProfilingMiddleware)
+
+# Request/stage latency, counters and in-flight gauges for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Initialize collection registry (global): one encoder, one store per collection
+registry = None
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize vector store on server start"""
-    global vector_store
+    """Load the encoder and the default collection on server start
+
+    With CATHEDRAL_SNAPSHOT set, the collection is served from that snapshot
+    file (mmap, read-only) and the encoder loads in the background.
+    """
+    global registry
     print("🚀 Starting Cathedral AI API Server...")
     try:
-        vector_store = CathedralVectorStore()
+        client = model = None
+        initial = DEFAULT_COLLECTION
+        snapshot_path = os.environ.get('CATHEDRAL_SNAPSHOT')
+        if snapshot_path:
+            print(f"📦 Opening snapshot {snapshot_path}...")
+            client = SnapshotClient(snapshot_path, verify=os.environ.get('CATHEDRAL_SNAPSHOT_VERIFY', '0') == '1')
+            model = LazyModel()
+            initial = client.collection_name
+
+        registry = CollectionRegistry(
+            model=model,
+            client=client,
+            default=initial,
+            max_resident=int(os.environ.get('CATHEDRAL_MAX_RESIDENT_COLLECTIONS', 4)),
+            idle_seconds=float(os.environ.get('CATHEDRAL_COLLECTION_IDLE_SECONDS', 900)) or None,
+            query_cache_size=int(os.environ.get('CATHEDRAL_QUERY_CACHE_SIZE', 1024)),
+            query_cache_distance=float(os.environ.get('CATHEDRAL_QUERY_CACHE_DISTANCE', 0.05)),
+            related_k=int(os.environ.get('CATHEDRAL_RELATED_K', DEFAULT_K)),
+            shards=int(os.environ.get('CATHEDRAL_SHARDS', 0)),
+            shard_by=os.environ.get('CATHEDRAL_SHARD_BY', 'hash')
+        )
+        vector_store = registry.get(create=True)
+        metrics.MODEL_LOAD.set(registry.model_load_seconds)
+        if snapshot_path:
+            threading.Thread(target=model.load, name='cathedral-model-load', daemon=True).start()
+        metrics.COLLECTION_CHUNKS.set_function(
+            lambda: {(name,): info['chunks'] for name, info in registry.resident().items()})
         stats = vector_store.get_stats()
         print(f"✅ Vector store loaded: {stats['total_embeddings']} embeddings")
+        asyncio.get_running_loop().create_task(unload_idle_collections())
     except Exception as e:
         print(f"❌ Error loading vector store: {e}")
         print("   Run: python3 generate_embeddings.py first")
         raise
 
+async def unload_idle_collections():
+    """Periodically unload collections left idle (they reload on next use)"""
+    if registry.idle_seconds is None:
+        return
+    interval = min(60.0, registry.idle_seconds / 4)
+    while True:
+        await asyncio.sleep(interval)
+        # Closing a store may wait on its shard workers
+        await run_in_threadpool(registry.unload_idle)
+
+async def get_store(collection: Optional[str] = None) -> CathedralVectorStore:
+    """The store for a collection (default: the one loaded at startup), or 503/404
+
+    A collection that is not resident loads in the threadpool, so the
+    event loop keeps serving other requests meanwhile.
+    """
+    if registry is None:
+        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    store = registry.loaded(collection)
+    if store is not None:
+        return store
+    try:
+        return await run_in_threadpool(registry.get, collection)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Collection {collection or registry.default} not found")
+
 # Request/Response Models
 
 class QueryRequest(BaseModel):
     query: str = Field(..., description="Search query text")
     limit: int = Field(10, ge=1, le=100, description="Number of results to return")
-    layer: Optional[int] = Field(None, description="Filter by specific layer")
+    layer: Optional[int] = Field(None, ge=0, description="Filter by specific layer (0 = no layer)")
+    layer_min: Optional[int] = Field(None, ge=0, description="Lowest layer to include")
+    layer_max: Optional[int] = Field(None, ge=0, description="Highest layer to include")
+    since: Optional[str] = Field(None, description="Earliest chunk timestamp (ISO 8601)")
+    until: Optional[str] = Field(None, description="Latest chunk timestamp (ISO 8601)")
     doc_type: Optional[str] = Field(None, description="Filter by document type")
     pattern: Optional[str] = Field(None, description="Filter by pattern name")
     phase: Optional[str] = Field(None, description="Filter by construction phase")
+    diversify: bool = Field(False, description="Rerank candidates by maximal marginal relevance")
+    mmr_lambda: float = Field(0.5, ge=0.0, le=1.0, description="MMR trade-off: 1 = pure relevance, 0 = pure novelty")
+    fetch_k: Optional[int] = Field(None, ge=1, le=500, description="Candidates to rerank (default 4x limit)")
+    group_by: Optional[Literal['file']] = Field(None, description="Return the best chunk per file with hit counts")
 
 class QueryResponse(BaseModel):
     query: str
@@ -76,6 +178,19 @@ class StatsResponse(BaseModel):
     doc_types: Dict[str, int]
     server_time: str
 
+def validate_ranges(layer_min: Optional[int] = None, layer_max: Optional[int] = None,
+                    since: Optional[str] = None, until: Optional[str] = None):
+    """Reject malformed or inverted range filters with a 400"""
+    for name, value in (('since', since), ('until', until)):
+        if value is not None and parse_timestamp(value) is None:
+            raise HTTPException(status_code=400, detail=f"Invalid {name} timestamp: {value}")
+
+    if layer_min is not None and layer_max is not None and layer_min > layer_max:
+        raise HTTPException(status_code=400, detail="layer_min must be <= layer_max")
+
+    if since is not None and until is not None and parse_timestamp(since) > parse_timestamp(until):
+        raise HTTPException(status_code=400, detail="since must be <= until")
+
 # API Endpoints
 
 @app.get("/", response_model=Dict[str, str])
@@ -92,36 +207,36 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    if vector_store is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    vector_store = await get_store()
 
     stats = vector_store.get_stats()
     return {
         "status": "healthy",
         "embeddings": stats['total_embeddings'],
+        "collections": len(registry.stores),
         "timestamp": datetime.now().isoformat()
     }
 
-@app.get("/stats", response_model=StatsResponse)
-async def get_stats():
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats(collection: Optional[str] = None):
     """Get Cathedral substrate statistics"""
-    if vector_store is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    vector_store = await get_store(collection)
 
     stats = vector_store.get_stats()
     stats['server_time'] = datetime.now().isoformat()
     return stats
 
-@app.post("/query", response_model=QueryResponse)
-async def generic_query(request: QueryRequest):
+@router.post("/query", response_model=QueryResponse)
+async def generic_query(request: QueryRequest, collection: Optional[str] = None):
     """Generic semantic search query"""
-    if vector_store is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    vector_store = await get_store(collection)
+
+    validate_ranges(request.layer_min, request.layer_max, request.since, request.until)
 
     try:
-        # Build filter dict
+        # Build filter dict (layer=0 is a real filter: chunks with no layer)
         where_filter = {}
-        if request.layer:
+        if request.layer is not None:
             where_filter['layer'] = request.layer
         if request.doc_type:
             where_filter['doc_type'] = request.doc_type
@@ -129,31 +244,51 @@ async def generic_query(request: QueryRequest):
             where_filter['pattern'] = request.pattern
         if request.phase:
             where_filter['phase'] = request.phase
+        for key in ('layer_min', 'layer_max', 'since', 'until'):
+            value = getattr(request, key)
+            if value is not None:
+                where_filter[key] = value
 
         # Query vector store
-        results = vector_store.query(
-            request.query,
-            n_results=request.limit,
-            filter_dict=where_filter if where_filter else None
-        )
+        if request.diversify or request.group_by:
+            results = vector_store.query_diverse(
+                request.query,
+                n_results=request.limit,
+                filter_dict=where_filter if where_filter else None,
+                diversify=request.diversify,
+                lambda_mult=request.mmr_lambda,
+                fetch_k=request.fetch_k,
+                group_by=request.group_by
+            )
+        else:
+            results = vector_store.query(
+                request.query,
+                n_results=request.limit,
+                filter_dict=where_filter if where_filter else None
+            )
 
         # Format response
-        formatted_results = []
-        for doc, meta, dist in zip(
-            results['documents'][0],
-            results['metadatas'][0],
-            results['distances'][0]
-        ):
-            formatted_results.append({
-                'text': doc,
-                'metadata': meta,
-                'similarity': float(1 - dist),  # Convert distance to similarity
-                'layer': meta.get('layer'),
-                'file': meta.get('file'),
-                'doc_type': meta.get('doc_type'),
-                'pattern': meta.get('pattern'),
-                'phase': meta.get('phase')
-            })
+        with metrics.stage('format'):
+            formatted_results = []
+            for i, (doc, meta, dist) in enumerate(zip(
+                results['documents'][0],
+                results['metadatas'][0],
+                results['distances'][0]
+            )):
+                formatted = {
+                    'id': results['ids'][0][i],
+                    'text': doc,
+                    'metadata': meta,
+                    'similarity': float(1 - dist),  # Convert distance to similarity
+                    'layer': meta.get('layer'),
+                    'file': meta.get('file'),
+                    'doc_type': meta.get('doc_type'),
+                    'pattern': meta.get('pattern'),
+                    'phase': meta.get('phase')
+                }
+                if request.group_by:
+                    formatted['hits'] = results['hits'][0][i]
+                formatted_results.append(formatted)
 
         return QueryResponse(
             query=request.query,
@@ -161,6 +296,8 @@ async def generic_query(request: QueryRequest):
             total=len(formatted_results),
             metadata={
                 'filters_applied': where_filter,
+                'diversified': request.diversify,
+                'group_by': request.group_by,
                 'timestamp': datetime.now().isoformat()
             }
         )
@@ -168,60 +305,129 @@ async def generic_query(request: QueryRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/query/evolution/{pattern_name}")
+@router.get("/query/evolution/{pattern_name}")
 async def query_evolution(
     pattern_name: str,
-    limit: int = Query(10, ge=1, le=50)
+    limit: int = Query(10, ge=1, le=50, description="Results for patterns without a materialized timeline"),
+    per_layer: int = Query(1, ge=1, le=TIMELINE_DEPTH, description="Chunks per layer from a materialized timeline"),
+    layer_min: Optional[int] = Query(None, ge=0, description="Lowest layer to include"),
+    layer_max: Optional[int] = Query(None, ge=0, description="Highest layer to include"),
+    since: Optional[str] = Query(None, description="Earliest chunk timestamp (ISO 8601)"),
+    until: Optional[str] = Query(None, description="Latest chunk timestamp (ISO 8601)"),
+    collection: Optional[str] = None
 ):
-    """Query how a pattern evolved across layers"""
-    if vector_store is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    """Query how a pattern evolved across layers
+
+    Known patterns are served from their materialized timeline: every layer
+    in range, best chunks first. Others fall back to a top-limit search.
+    """
+    vector_store = await get_store(collection)
+
+    validate_ranges(layer_min, layer_max, since, until)
 
     try:
-        results = vector_store.query_evolution(pattern_name, limit=limit)
+        timeline = vector_store.evolution_timeline(
+            pattern_name, layer_min=layer_min, layer_max=layer_max,
+            since=since, until=until, per_layer=per_layer
+        )
+        if timeline is None:
+            results = [(doc, meta, None) for doc, meta in vector_store.query_evolution(
+                pattern_name, limit=limit,
+                layer_min=layer_min, layer_max=layer_max, since=since, until=until
+            )]
+        else:
+            results = timeline
 
-        formatted_results = []
-        for doc, meta in results:
-            formatted_results.append({
-                'text': doc,
-                'layer': meta.get('layer'),
-                'file': meta.get('file'),
-                'phase': meta.get('phase'),
-                'timestamp': meta.get('timestamp')
-            })
+        with metrics.stage('format'):
+            formatted_results = []
+            for doc, meta, dist in results:
+                entry = {
+                    'text': doc,
+                    'layer': meta.get('layer'),
+                    'file': meta.get('file'),
+                    'phase': meta.get('phase'),
+                    'timestamp': meta.get('timestamp')
+                }
+                if dist is not None:
+                    entry['similarity'] = float(1 - dist)
+                formatted_results.append(entry)
 
         return {
             'pattern': pattern_name,
             'evolution': formatted_results,
-            'total_layers': len(formatted_results),
+            'materialized': timeline is not None,
+            'total_layers': len({r['layer'] for r in formatted_results}),
             'layer_range': f"{min(r['layer'] for r in formatted_results if r['layer'])} - {max(r['layer'] for r in formatted_results if r['layer'])}" if formatted_results else "N/A"
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/query/decision/{topic}")
-async def query_decision(
-    topic: str,
-    layer: Optional[int] = Query(None, description="Filter by specific layer")
+@router.get("/chunks/{chunk_id}/related")
+async def related_chunks(
+    chunk_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    collection: Optional[str] = None
 ):
-    """Query engineering decisions about specific topic"""
-    if vector_store is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    """Chunks most similar to a stored chunk, from the precomputed neighbour graph"""
+    vector_store = await get_store(collection)
 
     try:
-        results = vector_store.query_decision(topic, layer=layer)
+        results = vector_store.related_chunks(chunk_id, n_results=limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown chunk: {chunk_id}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
+    with metrics.stage('format'):
         formatted_results = []
-        for doc, meta in results:
+        for related_id, doc, meta, dist in zip(
+            results['ids'][0],
+            results['documents'][0],
+            results['metadatas'][0],
+            results['distances'][0]
+        ):
             formatted_results.append({
+                'id': related_id,
                 'text': doc,
+                'similarity': float(1 - dist),
                 'layer': meta.get('layer'),
                 'file': meta.get('file'),
-                'phase': meta.get('phase'),
-                'doc_type': meta.get('doc_type')
+                'doc_type': meta.get('doc_type'),
+                'pattern': meta.get('pattern'),
+                'phase': meta.get('phase')
             })
 
+    return {
+        'chunk_id': chunk_id,
+        'related': formatted_results,
+        'total': len(formatted_results),
+        'source': results['source']
+    }
+
+@router.get("/query/decision/{topic}")
+async def query_decision(
+    topic: str,
+    layer: Optional[int] = Query(None, ge=0, description="Filter by specific layer (0 = no layer)"),
+    collection: Optional[str] = None
+):
+    """Query engineering decisions about specific topic"""
+    vector_store = await get_store(collection)
+
+    try:
+        results = vector_store.query_decision(topic, layer=layer)
+
+        with metrics.stage('format'):
+            formatted_results = []
+            for doc, meta in results:
+                formatted_results.append({
+                    'text': doc,
+                    'layer': meta.get('layer'),
+                    'file': meta.get('file'),
+                    'phase': meta.get('phase'),
+                    'doc_type': meta.get('doc_type')
+                })
+
         return {
             'topic': topic,
             'decisions': formatted_results,
@@ -232,26 +438,38 @@ async def query_decision(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/query/phase/{phase_name}")
-async def query_phase(phase_name: str):
+@router.get("/query/phase/{phase_name}")
+async def query_phase(
+    phase_name: str,
+    layer_min: Optional[int] = Query(None, ge=0, description="Lowest layer to include"),
+    layer_max: Optional[int] = Query(None, ge=0, description="Highest layer to include"),
+    since: Optional[str] = Query(None, description="Earliest chunk timestamp (ISO 8601)"),
+    until: Optional[str] = Query(None, description="Latest chunk timestamp (ISO 8601)"),
+    collection: Optional[str] = None
+):
     """Get all work from specific construction phase"""
-    if vector_store is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    vector_store = await get_store(collection)
+
+    validate_ranges(layer_min, layer_max, since, until)
 
     try:
-        results = vector_store.query_phase(phase_name)
+        results = vector_store.query_phase(
+            phase_name,
+            layer_min=layer_min, layer_max=layer_max, since=since, until=until
+        )
 
         # Format by layer
-        by_layer = {}
-        for layer, chunks in results.items():
-            by_layer[str(layer)] = [
-                {
-                    'text': doc,
-                    'file': meta.get('file'),
-                    'pattern': meta.get('pattern')
-                }
-                for doc, meta in chunks
-            ]
+        with metrics.stage('format'):
+            by_layer = {}
+            for layer, chunks in results.items():
+                by_layer[str(layer)] = [
+                    {
+                        'text': doc,
+                        'file': meta.get('file'),
+                        'pattern': meta.get('pattern')
+                    }
+                    for doc, meta in chunks
+                ]
 
         return {
             'phase': phase_name,
@@ -263,36 +481,36 @@ async def query_phase(phase_name: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/query/contradictions")
-async def detect_contradictions(request: QueryRequest):
+@router.post("/query/contradictions")
+async def detect_contradictions(request: QueryRequest, collection: Optional[str] = None):
     """Detect if behavior contradicts documented learnings"""
-    if vector_store is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    vector_store = await get_store(collection)
 
     try:
         contradictions = vector_store.detect_contradictions(request.query)
 
-        formatted_contradictions = []
-        for contra in contradictions:
-            formatted_contradictions.append({
-                'learning': contra['learning'],
-                'layer': contra.get('layer'),
-                'file': contra.get('file'),
-                'similarity': float(contra['similarity']),
-                'metadata': contra.get('metadata', {})
-            })
-
-        # Calculate severity based on number and similarity
-        if len(formatted_contradictions) > 0:
-            avg_similarity = sum(c['similarity'] for c in formatted_contradictions) / len(formatted_contradictions)
-            if avg_similarity > 0.7 and len(formatted_contradictions) > 3:
-                severity = "HIGH"
-            elif avg_similarity > 0.5:
-                severity = "MEDIUM"
+        with metrics.stage('format'):
+            formatted_contradictions = []
+            for contra in contradictions:
+                formatted_contradictions.append({
+                    'learning': contra['learning'],
+                    'layer': contra.get('layer'),
+                    'file': contra.get('file'),
+                    'similarity': float(contra['similarity']),
+                    'metadata': contra.get('metadata', {})
+                })
+
+            # Calculate severity based on number and similarity
+            if len(formatted_contradictions) > 0:
+                avg_similarity = sum(c['similarity'] for c in formatted_contradictions) / len(formatted_contradictions)
+                if avg_similarity > 0.7 and len(formatted_contradictions) > 3:
+                    severity = "HIGH"
+                elif avg_similarity > 0.5:
+                    severity = "MEDIUM"
+                else:
+                    severity = "LOW"
             else:
-                severity = "LOW"
-        else:
-            severity = "NONE"
+                severity = "NONE"
 
         return {
             'behavior': request.query,
@@ -305,25 +523,15 @@ async def detect_contradictions(request: QueryRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/layers")
-async def list_layers():
+@router.get("/layers")
+async def list_layers(collection: Optional[str] = None):
     """List all available layers in substrate"""
-    if vector_store is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    vector_store = await get_store(collection)
 
     try:
-        # Get all chunks and extract unique layers
-        stats = vector_store.get_stats()
-
-        # Query for layer documents
-        layer_results = vector_store.collection.get(
-            where={"doc_type": "layer"}
-        )
-
-        layers = set()
-        for meta in layer_results['metadatas']:
-            if meta['layer']:
-                layers.add(meta['layer'])
+        # Layer numbers of layer documents, from the facet indexes
+        facets = vector_store.facets
+        layers = set(facets.by_layer(facets.resolve({'doc_type': 'layer'})))
 
         return {
             'total_layers': len(layers),
@@ -334,22 +542,14 @@ async def list_layers():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/patterns")
-async def list_patterns():
+@router.get("/patterns")
+async def list_patterns(collection: Optional[str] = None):
     """List all documented patterns"""
-    if vector_store is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    vector_store = await get_store(collection)
 
     try:
-        stats = vector_store.get_stats()
-
-        # Get all pattern mentions
-        pattern_results = vector_store.collection.get()
-
-        patterns = set()
-        for meta in pattern_results['metadatas']:
-            if meta.get('pattern') and meta['pattern'] != 'none':
-                patterns.add(meta['pattern'])
+        # Distinct stored patterns, from the facet indexes
+        patterns = {pattern for pattern in vector_store.facets.values('pattern') if pattern and pattern != 'none'}
 
         return {
             'total_patterns': len(patterns),
@@ -359,22 +559,14 @@ async def list_patterns():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/phases")
-async def list_phases():
+@router.get("/phases")
+async def list_phases(collection: Optional[str] = None):
     """List all construction phases"""
-    if vector_store is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    vector_store = await get_store(collection)
 
     try:
-        stats = vector_store.get_stats()
-
-        # Get all phases
-        phase_results = vector_store.collection.get()
-
-        phases = set()
-        for meta in phase_results['metadatas']:
-            if meta.get('phase'):
-                phases.add(meta['phase'])
+        # Distinct stored phases, from the facet indexes
+        phases = {phase for phase in vector_store.facets.values('phase') if phase}
 
         return {
             'total_phases': len(phases),
@@ -384,6 +576,83 @@ async def list_phases():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/embeddings")
+async def export_embeddings(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=5000),
+    collection: Optional[str] = None
+):
+    """One page of every chunk's id, embedding, document and metadata
+
+    Page with offset until it reaches total; substrate_client.HTTPClient
+    uses this for whole-corpus jobs such as convergence clustering.
+    """
+    vector_store = await get_store(collection)
+
+    try:
+        page = vector_store.embeddings_page(offset, limit)
+        return {
+            'total': vector_store.collection.count(),
+            'offset': offset,
+            'ids': page['ids'],
+            'embeddings': page['embeddings'].tolist(),
+            'documents': page['documents'],
+            'metadatas': page['metadatas']
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics: latency histograms, counters, gauges"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/admin/profiles")
+async def list_profiles(endpoint: Optional[str] = None):
+    """Stored request profiles, newest first"""
+    profiles = profiling.STORE.list(endpoint)
+    return {
+        'count': len(profiles),
+        'capacity': profiling.STORE.profiles.maxlen,
+        'dropped': profiling.STORE.dropped,
+        'profiles': [profile.summary() for profile in profiles]
+    }
+
+@app.get("/admin/profiles/collapsed", response_class=PlainTextResponse)
+async def merged_profile(endpoint: Optional[str] = None):
+    """All stored profiles merged as collapsed stacks (flamegraph input)"""
+    return profiling.STORE.collapsed(endpoint)
+
+@app.get("/admin/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str):
+    """One request's collapsed stacks (flamegraph input)"""
+    profile = profiling.STORE.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return profile.collapsed()
+
+@app.delete("/admin/profiles")
+async def clear_profiles():
+    """Drop every stored profile"""
+    return {'cleared': profiling.STORE.clear()}
+
+@app.get("/collections")
+async def list_collections():
+    """Collections on disk, and which are loaded in memory"""
+    if registry is None:
+        raise HTTPException(status_code=503, detail="Vector store not initialized")
+
+    return {
+        'default': registry.default,
+        'collections': registry.names(),
+        'resident': registry.resident(),
+        'max_resident': registry.max_resident
+    }
+
+app.include_router(router)
+app.include_router(router, prefix="/collections/{collection}")
+
 # Development server runner
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Offline Benchmark Suite
+Reproducible throughput and latency numbers for the retrieval stack.
+
+Everything runs locally: corpora are synthesized in the cathedral_corpus.json
+chunk schema, and embeddings come from HashingEncoder, a deterministic
+feature-hashing stand-in for the sentence-transformers model, so no model
+is downloaded. Each corpus size runs in its own process so peak RSS is per
+size. Measured:
+
+- ingest:  CathedralCorpusProcessor.process_all() over a synthetic source tree
+- embed:   CathedralVectorStore.embed_corpus() into a fresh ChromaDB, as
+           generate_embeddings.py runs it (neighbour graph included;
+           --related-k 0 leaves it out)
+- query:   p50/p99 per CathedralVectorStore query method (again through
+           N shard workers with --shards N)
+- listing: api_server /layers, /patterns, /phases and /stats
+
+    python3 benchmark.py --sizes 1k,10k --out bench.json
+    python3 benchmark.py --sizes 100k --stages embed,query --queries 100
+    python3 benchmark.py --sizes 10k,100k --stages query --shards 4
+
+Results are JSON, keyed by size and stage, for diffing across commits.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from neighbor_graph import DEFAULT_K
+
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+STAGES = ('ingest', 'embed', 'query', 'listing')
+
+PATTERNS = [
+    'Parliament Protocol',
+    'Observatory Pattern',
+    'Substrate Awareness',
+    'Architectural vs. Tactical',
+    'Contrarian Embodiment',
+    'Completion Recognition',
+    'Core Triad'
+]
+
+PHASES = ['building_substrate', 'adding_verification', 'gap_visible', 'gap_testing_itself',
+          'pattern_extraction', 'substrate_escape', 'gap_tracing', 'gap_recognition', 'gap_sees_needs']
+
+# (doc_type, source, share of chunks) - roughly the real corpus mix
+DOC_MIX = [
+    ('layer', 'layer_document', 0.25),
+    ('substrate', 'git_commit', 0.20),
+    ('pattern', 'pattern_example', 0.20),
+    ('documentation', 'core_documentation', 0.13),
+    ('substrate', 'substrate_theory', 0.12),
+    ('parliament', 'parliament_session', 0.07),
+    ('substrate', 'construction_substrate_js', 0.03)
+]
+
+COMMON_WORDS = ('the a of and to in is that for it as with was on be by this are from at or an but not '
+                'substrate layer gap pattern uncertainty instance building decision observatory filter').split()
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+class HashingEncoder:
+    """Deterministic stand-in for SentenceTransformer
+
+    Signed feature hashing of lowercase word tokens (crc32, cached per
+    token) into `dimension` buckets, L2-normalized. Texts sharing words get
+    similar vectors, which is enough for realistic index and query costs.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+        self._slots: Dict[str, int] = {}
+
+    def _slot(self, token: str) -> int:
+        slot = self._slots.get(token)
+        if slot is None:
+            h = zlib.crc32(token.encode('utf-8'))
+            # Low bit is the sign; slots are stored as +/-(bucket + 1)
+            slot = (h >> 1) % self.dimension + 1
+            slot = slot if h & 1 else -slot
+            self._slots[token] = slot
+        return slot
+
+    def encode(self, texts, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        rows, slots = [], []
+        for row, text in enumerate(texts):
+            tokens = _TOKEN.findall(text.lower())
+            rows.extend([row] * len(tokens))
+            slots.extend(self._slot(token) for token in tokens)
+
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        if slots:
+            slots = np.asarray(slots)
+            np.add.at(vectors, (np.asarray(rows), np.abs(slots) - 1), np.sign(slots).astype(np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class TextGenerator:
+    """Seeded topical filler text: each topic draws from its own vocabulary"""
+
+    def __init__(self, seed: int = 0, topics: int = 64, vocabulary: int = 20_000, topic_words: int = 400):
+        self.rng = np.random.default_rng(seed)
+        syllables = np.array(['ka', 'lo', 'mi', 'ren', 'tor', 'sa', 'vel', 'qu', 'an', 'dri',
+                              'eth', 'om', 'pra', 'sil', 'ux', 'ne', 'ba', 'cor', 'fi', 'gan'])
+        parts = self.rng.integers(len(syllables), size=(vocabulary, 3))
+        self.vocabulary = np.array([''.join(syllables[p]) for p in parts])
+        self.topics = [self.rng.choice(vocabulary, topic_words, replace=False) for _ in range(topics)]
+        self.common = np.array(COMMON_WORDS)
+
+    def text(self, topic: int, words: int) -> str:
+        own = self.vocabulary[self.topics[topic][self.rng.integers(len(self.topics[topic]), size=words)]]
+        common = self.common[self.rng.integers(len(self.common), size=words)]
+        mask = self.rng.random(words) < 0.35
+        return ' '.join(np.where(mask, common, own).tolist())
+
+    def paragraph(self, topic: int, words: int = 80) -> str:
+        sentences, left = [], words
+        while left > 0:
+            n = int(min(left, self.rng.integers(8, 20)))
+            sentences.append(self.text(topic, n).capitalize() + '.')
+            left -= n
+        return ' '.join(sentences)
+
+
+def synthetic_chunks(n: int, seed: int = 0) -> List[Dict]:
+    """n chunks in the cathedral_corpus.json schema"""
+    generator = TextGenerator(seed)
+    rng = generator.rng
+    kinds = rng.choice(len(DOC_MIX), size=n, p=[share for _, _, share in DOC_MIX])
+    topics = rng.integers(len(generator.topics), size=n)
+    layers = rng.integers(1, 113, size=n)
+    base = datetime(2025, 9, 1)
+
+    chunks = []
+    for i in range(n):
+        doc_type, source, _ = DOC_MIX[kinds[i]]
+        layer = int(layers[i]) if doc_type in ('layer', 'parliament') or rng.random() < 0.3 else None
+        text = generator.paragraph(int(topics[i]), int(rng.integers(60, 160)))
+        pattern = PATTERNS[topics[i] % len(PATTERNS)] if rng.random() < 0.4 else None
+        if pattern:
+            text = f"{pattern}: {text}"
+        if layer:
+            text = f"Layer {layer}. {text}"
+        if rng.random() < 0.2:
+            text = f"Instance {'ABC'[i % 3]} notes: {text}"
+
+        chunks.append({
+            'text': text,
+            'layer': layer,
+            'file': f"{doc_type}-{int(topics[i])}-{i // 20}.md",
+            'doc_type': doc_type,
+            'pattern': pattern,
+            'phase': PHASES[(layer or int(topics[i])) % len(PHASES)],
+            'timestamp': (base + timedelta(minutes=int(i))).isoformat(),
+            'filter_visibility': None,
+            'metadata': {'chunk_index': i % 20, 'source': source}
+        })
+    return chunks
+
+
+def write_corpus(chunks: List[Dict], path: Path):
+    with open(path, 'w') as f:
+        json.dump({'total_chunks': len(chunks), 'generated_at': datetime.now().isoformat(),
+                   'chunks': chunks}, f)
+
+
+def write_source_tree(root: Path, n_chunks: int, seed: int = 0) -> int:
+    """Markdown files CathedralCorpusProcessor chunks into about n_chunks chunks
+
+    Each file holds 20 paragraphs of ~550 characters; the 1024 character
+    chunker cannot fit two, so each becomes a chunk. Returns the bytes written.
+    """
+    generator = TextGenerator(seed)
+    (root / 'examples').mkdir(parents=True, exist_ok=True)
+    files = max(1, n_chunks // 20)
+    written = 0
+    for i in range(files):
+        kind = i % 10
+        if kind < 5:
+            name = f"layer-{i % 112 + 1}-{i}.md"
+        elif kind < 7:
+            name = f"parliament-session-topic-{i}.md"
+        else:
+            name = f"examples/parliament-domain-{i}.md"
+        topic = i % len(generator.topics)
+        paragraphs = [f"# Document {i}: {PATTERNS[topic % len(PATTERNS)]} in Layer {i % 112 + 1}"]
+        paragraphs += [generator.paragraph(topic, 75) for _ in range(20)]
+        content = '\n\n'.join(paragraphs)
+        (root / name).write_text(content)
+        written += len(content)
+    return written
+
+
+# ------------------------------------------------------------------ Measures
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def latency_summary(samples: Sequence[float]) -> Dict:
+    ms = np.asarray(samples) * 1000
+    return {
+        'n': len(ms),
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p99_ms': round(float(np.percentile(ms, 99)), 3),
+        'mean_ms': round(float(ms.mean()), 3),
+        'max_ms': round(float(ms.max()), 3)
+    }
+
+
+def time_calls(call: Callable[[int], object], iterations: int, warmup: int = 3) -> Dict:
+    """Latency of call(i) over iterations, after warmup calls"""
+    for i in range(warmup):
+        call(i)
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        call(i)
+        samples.append(time.perf_counter() - start)
+    return latency_summary(samples)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the progress output the store and processor print"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# -------------------------------------------------------------------- Stages
+
+def bench_ingest(workdir: Path, n: int, seed: int) -> Dict:
+    from embed_corpus import CathedralCorpusProcessor
+
+    source = workdir / 'source'
+    start = time.perf_counter()
+    written = write_source_tree(source, n, seed)
+    generate_s = time.perf_counter() - start
+
+    processor = CathedralCorpusProcessor(str(source))
+    start = time.perf_counter()
+    with quiet():
+        chunks = processor.process_all()
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(source)
+
+    return {
+        'source_mb': round(written / 1e6, 1),
+        'generate_s': round(generate_s, 3),
+        'chunks': len(chunks),
+        'dedup': processor.dedup_stats,
+        'seconds': round(elapsed, 3),
+        'chunks_per_s': round(len(chunks) / elapsed, 1) if elapsed else None,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def bench_embed(store, corpus: Path, n: int) -> Dict:
+    start = time.perf_counter()
+    with quiet():
+        store.embed_corpus(str(corpus))
+    elapsed = time.perf_counter() - start
+    return {
+        'chunks': n,
+        'seconds': round(elapsed, 3),
+        'chunks_per_s': round(n / elapsed, 1) if elapsed else None,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def query_texts(count: int, seed: int) -> List[str]:
+    generator = TextGenerator(seed)
+    return [f"{PATTERNS[i % len(PATTERNS)]} {generator.text(i % len(generator.topics), 8)}"
+            for i in range(count)]
+
+
+def bench_queries(store, iterations: int, seed: int) -> Dict:
+    texts = query_texts(max(iterations, 8) + 3, seed + 1)
+    pick = lambda i: texts[i % len(texts)]
+    batch = [{'query': text, 'n_results': 10, 'filter': None} for text in texts[:8]]
+
+    methods = {
+        'query': lambda i: store.query(pick(i), n_results=10),
+        'query_filtered': lambda i: store.query(pick(i), n_results=10, filter_dict={'doc_type': 'layer'}),
+        'query_layer_range': lambda i: store.query(pick(i), n_results=10,
+                                                   filter_dict={'layer_min': 90, 'layer_max': 100}),
+        'query_diverse': lambda i: store.query_diverse(pick(i), n_results=10),
+        'query_diverse_by_file': lambda i: store.query_diverse(pick(i), n_results=10, group_by='file'),
+        'query_evolution': lambda i: store.query_evolution(PATTERNS[i % len(PATTERNS)], limit=10),
+        'query_decision': lambda i: store.query_decision(pick(i)),
+        'query_phase': lambda i: store.query_phase(PHASES[i % len(PHASES)]),
+        'detect_contradictions': lambda i: store.detect_contradictions(pick(i)),
+        'search_batch_8': lambda i: store.search_batch(batch)
+    }
+
+    results = {}
+    with quiet():
+        for name, call in methods.items():
+            results[name] = time_calls(call, iterations)
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def bench_listing(store, iterations: int) -> Dict:
+    try:
+        import api_server
+    except ImportError as e:
+        return {'skipped': f"api_server unavailable ({e})"}
+
+    api_server.registry = api_server.CollectionRegistry.for_store(store)
+    endpoints = {
+        '/layers': api_server.list_layers,
+        '/patterns': api_server.list_patterns,
+        '/phases': api_server.list_phases,
+        '/stats': api_server.get_stats
+    }
+    results = {}
+    with quiet():
+        for path, endpoint in endpoints.items():
+            results[path] = time_calls(lambda i: asyncio.run(endpoint()), iterations, warmup=1)
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def run_size(label: str, stages: Sequence[str], iterations: int, listing_iterations: int,
+             seed: int, workdir: Path, shards: int = 0, related_k: int = DEFAULT_K) -> Dict:
+    """All requested stages for one corpus size, in this process"""
+    n = SIZES[label]
+    results: Dict = {'chunks': n}
+
+    if 'ingest' in stages:
+        results['ingest'] = bench_ingest(workdir, n, seed)
+
+    store_stages = [stage for stage in stages if stage != 'ingest']
+    if not store_stages:
+        return results
+
+    try:
+        import chromadb  # noqa: F401  (generate_embeddings exits without it)
+    except ImportError:
+        for stage in store_stages:
+            results[stage] = {'skipped': 'chromadb not installed'}
+        return results
+    from generate_embeddings import CathedralVectorStore
+
+    start = time.perf_counter()
+    chunks = synthetic_chunks(n, seed)
+    corpus = workdir / 'cathedral_corpus.json'
+    write_corpus(chunks, corpus)
+    del chunks
+    results['corpus'] = {'generate_s': round(time.perf_counter() - start, 3),
+                         'json_mb': round(corpus.stat().st_size / 1e6, 1)}
+
+    with quiet():
+        store = CathedralVectorStore(str(workdir / 'vectordb'), model=HashingEncoder(), related_k=related_k)
+    embed = dict(bench_embed(store, corpus, n), related_k=related_k)  # Queries need the index either way
+    if 'embed' in stages:
+        results['embed'] = embed
+
+    if 'query' in stages:
+        results['query'] = bench_queries(store, iterations, seed)
+        if shards:
+            with quiet():
+                store.enable_sharding(shards)
+            results['query_sharded'] = dict(bench_queries(store, iterations, seed), shards=shards)
+            store.close()
+    if 'listing' in stages:
+        results['listing'] = bench_listing(store, listing_iterations)
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def environment() -> Dict:
+    def version(module: str) -> Optional[str]:
+        try:
+            return __import__(module).__version__
+        except (ImportError, AttributeError):
+            return None
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': version('numpy'),
+        'chromadb': version('chromadb'),
+        'encoder': 'HashingEncoder(384)'
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the Cathedral AI retrieval stack")
+    parser.add_argument('--sizes', default=','.join(SIZES), help=f"Comma-separated from {', '.join(SIZES)}")
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"Comma-separated from {', '.join(STAGES)}")
+    parser.add_argument('--queries', type=int, default=50, help="Timed calls per query method")
+    parser.add_argument('--listing-queries', type=int, default=5, help="Timed calls per listing endpoint")
+    parser.add_argument('--shards', type=int, default=0, help="Also run the query stage through N shard workers")
+    parser.add_argument('--related-k', type=int, default=DEFAULT_K,
+                        help="Neighbour graph size built by the embed stage (0 skips the O(n^2) build)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', help="Scratch directory (default: a temporary directory)")
+    parser.add_argument('--out', default='benchmark-results.json', help="JSON results path")
+    parser.add_argument('--worker', metavar='SIZE', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sizes = [size.strip().lower() for size in args.sizes.split(',') if size.strip()]
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [size for size in sizes if size not in SIZES] + [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"Unknown size or stage: {', '.join(unknown)}")
+
+    if args.worker:
+        # One size in a fresh process, so ru_maxrss is this size's peak
+        result = run_size(args.worker, stages, args.queries, args.listing_queries, args.seed, Path(args.workdir),
+                          args.shards, args.related_k)
+        with open(args.out, 'w') as f:
+            json.dump(result, f)
+        return
+
+    report = {'generated': datetime.now().isoformat(), 'environment': environment(),
+              'config': {'stages': stages, 'queries': args.queries, 'listing_queries': args.listing_queries,
+                         'shards': args.shards, 'related_k': args.related_k, 'seed': args.seed},
+              'results': {}}
+
+    for size in sizes:
+        print(f"⏱️  {size} chunks: {', '.join(stages)}")
+        workdir = Path(tempfile.mkdtemp(prefix=f'cathedral-bench-{size}-', dir=args.workdir))
+        out = workdir / 'result.json'
+        try:
+            completed = subprocess.run(
+                [sys.executable, __file__, '--worker', size, '--stages', ','.join(stages),
+                 '--queries', str(args.queries), '--listing-queries', str(args.listing_queries),
+                 '--seed', str(args.seed), '--shards', str(args.shards), '--related-k', str(args.related_k),
+                 '--workdir', str(workdir), '--out', str(out)],
+                cwd=Path(__file__).parent)
+            if completed.returncode == 0:
+                report['results'][size] = json.loads(out.read_text())
+            else:
+                report['results'][size] = {'error': f"worker exited with {completed.returncode}"}
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        result = report['results'][size]
+        for stage in STAGES:
+            item = result.get(stage) or {}
+            if 'skipped' in item:
+                print(f"   {stage}: skipped ({item['skipped']})")
+            elif 'chunks_per_s' in item:
+                print(f"   {stage}: {item['chunks_per_s']} chunks/s, peak RSS {item['peak_rss_mb']} MB")
+            elif stage == 'query' and item:
+                print(f"   query: p50 {item['query']['p50_ms']}ms, p99 {item['query']['p99_ms']}ms (plain query)")
+                sharded = result.get('query_sharded')
+                if sharded:
+                    print(f"   query ({sharded['shards']} shards): p50 {sharded['query']['p50_ms']}ms, "
+                          f"p99 {sharded['query']['p99_ms']}ms")
+            elif stage == 'listing' and item:
+                print(f"   listing: /patterns p50 {item['/patterns']['p50_ms']}ms")
+        if 'error' in result:
+            print(f"   ❌ {result['error']}")
+
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
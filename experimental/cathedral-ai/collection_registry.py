@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Collection Registry
+Named collections behind one server, sharing one ChromaDB client and one
+loaded encoder.
+
+Each collection is a CathedralVectorStore with its own facet indexes,
+query-template table, query cache, timelines, neighbour graph and shard
+workers, loaded on first use. At most max_resident stores stay loaded:
+loading another unloads the least recently used, and unload_idle() unloads
+any left unused for idle_seconds. Unloading frees that per-store state
+only. ChromaDB's own per-collection caches (the HNSW index) live in the
+shared client, which bounds them itself and has no per-collection release;
+chunks and vectors stay on disk, and an unloaded store is rebuilt (facets
+read back, templates re-embedded) on its next request.
+
+A store loads outside the registry lock, so requests for resident
+collections never wait on another collection's load; concurrent requests
+for the same collection wait for one load.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import chromadb
+
+from generate_embeddings import DEFAULT_COLLECTION, CathedralVectorStore, load_model
+
+
+class CollectionRegistry:
+    """Loads, tracks and unloads one CathedralVectorStore per collection name
+
+    store_options are passed to every CathedralVectorStore (query cache
+    size, template precompute, ...). default is the collection get()
+    returns when no name is given.
+    """
+
+    def __init__(self, persist_directory: str = "./cathedral_vectordb", model=None, client=None,
+                 max_resident: int = 4, idle_seconds: Optional[float] = 900.0,
+                 default: str = DEFAULT_COLLECTION, **store_options):
+        self.persist_directory = Path(persist_directory)
+        self.persist_directory.mkdir(exist_ok=True)
+        self.client = client if client is not None else chromadb.PersistentClient(path=str(self.persist_directory))
+
+        if model is None:
+            model, self.model_load_seconds = load_model()
+        else:
+            self.model_load_seconds = 0.0
+        self.model = model
+
+        self.default = default
+        self.max_resident = max(1, max_resident)
+        self.idle_seconds = idle_seconds
+        self.store_options = store_options
+        self.stores: "OrderedDict[str, CathedralVectorStore]" = OrderedDict()  # Least recently used first
+        self.last_used: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._loading: Dict[str, threading.Lock] = {}  # One load at a time per collection
+
+    @classmethod
+    def for_store(cls, store: CathedralVectorStore, **kwargs) -> 'CollectionRegistry':
+        """A registry around an already loaded store, sharing its client and model"""
+        kwargs.setdefault('default', store.collection_name)
+        registry = cls(store.persist_directory, model=store.model, client=store.client, **kwargs)
+        registry.model_load_seconds = store.model_load_seconds
+        registry.attach(store)
+        return registry
+
+    def names(self) -> List[str]:
+        """Every collection on disk or resident"""
+        # ChromaDB returns names or Collection objects, depending on version
+        on_disk = [getattr(c, 'name', c) for c in self.client.list_collections()]
+        return sorted(set(on_disk) | set(self.stores))
+
+    def attach(self, store: CathedralVectorStore):
+        """Register a loaded store under its collection name"""
+        with self._lock:
+            self.stores[store.collection_name] = store
+            self.stores.move_to_end(store.collection_name)
+            self.last_used[store.collection_name] = time.monotonic()
+            self._evict(keep=store.collection_name)
+
+    def loaded(self, name: Optional[str] = None) -> Optional[CathedralVectorStore]:
+        """The store for a collection if it is resident (marking it used), else None"""
+        name = name or self.default
+        with self._lock:
+            store = self.stores.get(name)
+            if store is not None:
+                self.stores.move_to_end(name)
+                self.last_used[name] = time.monotonic()
+            return store
+
+    def get(self, name: Optional[str] = None, create: bool = False) -> CathedralVectorStore:
+        """The store for a collection (default: self.default), loading it if needed
+
+        Loading builds facet indexes and embeds templates, so it can take a
+        while; callers on an event loop should run this in a thread. Raises
+        KeyError for a collection that does not exist unless create.
+        """
+        name = name or self.default
+        store = self.loaded(name)
+        if store is not None:
+            return store
+
+        with self._lock:
+            loading = self._loading.setdefault(name, threading.Lock())
+        with loading:
+            # Another request may have loaded it while this one waited
+            store = self.loaded(name)
+            if store is None:
+                if not create and name not in self.names():
+                    raise KeyError(name)
+                print(f"📂 Loading collection {name}...")
+                store = CathedralVectorStore(self.persist_directory, model=self.model, client=self.client,
+                                             collection_name=name, **self.store_options)
+                self.attach(store)
+            return store
+
+    def unload(self, name: str) -> bool:
+        """Drop a collection's store (indexes, caches, shard workers); it reloads on next use
+
+        ChromaDB's cached HNSW index for the collection stays with the
+        shared client.
+        """
+        with self._lock:
+            store = self.stores.pop(name, None)
+            if store is None:
+                return False
+            store.close()
+            self.last_used.pop(name, None)
+            print(f"💤 Unloaded collection {name}")
+            return True
+
+    def unload_idle(self, now: Optional[float] = None) -> List[str]:
+        """Unload collections unused for idle_seconds; returns their names"""
+        if self.idle_seconds is None:
+            return []
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [name for name, used in self.last_used.items() if now - used >= self.idle_seconds]
+            return [name for name in idle if self.unload(name)]
+
+    def _evict(self, keep: str):
+        while len(self.stores) > self.max_resident:
+            oldest = next(name for name in self.stores if name != keep)
+            self.unload(oldest)
+
+    def resident(self) -> Dict[str, Dict]:
+        """Resident collections: chunk count and seconds since last use"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {'chunks': store.collection.count(), 'idle_seconds': round(now - self.last_used[name], 1)}
+                for name, store in self.stores.items()
+            }
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Convergence Analysis
+Clusters every chunk embedding and reports themes shared across sources.
+
+All embeddings are pulled once and clustered with spherical k-means (the
+vectors are unit-normalized, so cosine similarity is a matrix product and
+each Lloyd step is one (n x k) matmul). A cluster converges when chunks
+from several groups - instances, sources, doc types - land in it; those are
+reported with the chunks nearest the centroid as exemplars.
+"""
+
+import math
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+_INSTANCE = re.compile(r'\bInstance ([A-Z])\b')
+
+# Stored doc_type -> the corpus source it was cut from, for collections
+# embedded before chunks carried a 'source' field (substrate chunks come
+# from several sources and stay grouped together)
+DOC_TYPE_SOURCES = {
+    'layer': 'layer_document',
+    'parliament': 'parliament_session',
+    'pattern': 'pattern_example',
+    'substrate': 'substrate',
+    'documentation': 'core_documentation'
+}
+
+
+def instance_of(document: str, metadata: Dict) -> str:
+    """The instance a chunk speaks for: its first "Instance X" mention"""
+    match = _INSTANCE.search(document or '')
+    return f"Instance {match.group(1)}" if match else 'unattributed'
+
+
+def source_of(document: str, metadata: Dict) -> str:
+    """Corpus source, falling back to doc_type for older collections"""
+    return metadata.get('source') or DOC_TYPE_SOURCES.get(metadata.get('doc_type'), 'unknown')
+
+
+GROUPERS: Dict[str, Callable[[str, Dict], str]] = {
+    'instance': instance_of,
+    'source': source_of
+}
+
+# A GROUPERS name, any metadata field, or a (document, metadata) -> group callable
+Grouping = Union[str, Callable[[str, Dict], str]]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def kmeans(vectors: np.ndarray, k: int, max_iter: int = 50, tol: float = 1e-3,
+           seed: int = 0, init_sample: int = 8192) -> Tuple[np.ndarray, np.ndarray]:
+    """Spherical k-means on unit vectors: (labels, unit centroids)
+
+    k-means++ seeding (on cosine distance, over a sample of at most
+    init_sample chunks), then Lloyd steps until fewer than tol * n chunks
+    change cluster. Centroid sums are a one-hot (k x n) @ (n x d) matmul.
+    Empty clusters are reseeded with the worst-fit chunk.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    k = max(1, min(k, n))
+
+    # k-means++: each new centre drawn proportional to distance from the nearest
+    pool = vectors if n <= init_sample else vectors[rng.choice(n, init_sample, replace=False)]
+    centers = np.empty((k, vectors.shape[1]), dtype=vectors.dtype)
+    centers[0] = pool[rng.integers(len(pool))]
+    nearest = 1.0 - pool @ centers[0]
+    for c in range(1, k):
+        weights = np.clip(nearest, 0, None)
+        total = weights.sum()
+        pick = rng.choice(len(pool), p=weights / total) if total > 0 else rng.integers(len(pool))
+        centers[c] = pool[pick]
+        np.minimum(nearest, 1.0 - pool @ centers[c], out=nearest)
+
+    labels = np.full(n, -1)
+    rows = np.arange(n)
+    one_hot = np.zeros((k, n), dtype=vectors.dtype)
+    for _ in range(max_iter):
+        similarity = vectors @ centers.T
+        new_labels = similarity.argmax(axis=1)
+        changed = np.count_nonzero(new_labels != labels)
+        labels = new_labels
+        if changed <= tol * n:
+            break
+
+        one_hot.fill(0)
+        one_hot[labels, rows] = 1
+        sums = one_hot @ vectors
+        for empty in np.flatnonzero(one_hot.sum(axis=1) == 0):
+            worst = int(similarity[rows, labels].argmin())
+            sums[empty] = vectors[worst]
+        centers = _normalize(sums)
+
+    return labels, centers
+
+
+def default_k(n: int) -> int:
+    """Rule-of-thumb cluster count, sqrt(n / 2), kept within [2, 256]"""
+    return int(min(256, max(2, round(math.sqrt(n / 2)))))
+
+
+def find_convergent_clusters(ids: Sequence[str],
+                             embeddings: np.ndarray,
+                             documents: Sequence[str],
+                             metadatas: Sequence[Dict],
+                             group_by: Grouping = 'source',
+                             k: Optional[int] = None,
+                             min_groups: int = 2,
+                             exemplars: int = 3,
+                             seed: int = 0) -> Dict:
+    """Cluster all chunks and report clusters spanning several groups
+
+    Clusters are ranked by how many groups they span, then by how evenly
+    (normalized entropy of the group counts), then by size.
+    """
+    grouper = GROUPERS.get(group_by) if isinstance(group_by, str) else group_by
+    if grouper is None:
+        field = group_by
+        grouper = lambda document, metadata: str(metadata.get(field) or 'unknown')
+
+    n = len(ids)
+    if n == 0:
+        return {'chunks': 0, 'k': 0, 'group_by': _name(group_by), 'groups': {}, 'clusters': []}
+
+    vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+    groups = [grouper(doc, meta) for doc, meta in zip(documents, metadatas)]
+    group_names, group_codes = np.unique(groups, return_inverse=True)
+    group_names = [str(name) for name in group_names]
+
+    k = k or default_k(n)
+    labels, centers = kmeans(vectors, k, seed=seed)
+    k = len(centers)
+
+    # Per-cluster group counts in one pass: (k x groups) contingency table
+    table = np.zeros((k, len(group_names)), dtype=np.int64)
+    np.add.at(table, (labels, group_codes), 1)
+    centroid_similarity = np.einsum('ij,ij->i', vectors, centers[labels])
+
+    clusters = []
+    for c in range(k):
+        counts = table[c]
+        span = int(np.count_nonzero(counts))
+        if span < min_groups:
+            continue
+
+        members = np.flatnonzero(labels == c)
+        share = counts[counts > 0] / counts.sum()
+        balance = float(-(share * np.log(share)).sum() / math.log(span)) if span > 1 else 0.0
+
+        top = members[np.argsort(-centroid_similarity[members])[:exemplars]]
+        clusters.append({
+            'cluster': c,
+            'size': int(len(members)),
+            'span': span,
+            'balance': round(balance, 3),
+            'cohesion': round(float(centroid_similarity[members].mean()), 3),
+            'groups': {group_names[g]: int(counts[g]) for g in np.flatnonzero(counts)},
+            'exemplars': [
+                {
+                    'id': ids[i],
+                    'group': groups[i],
+                    'file': metadatas[i].get('file'),
+                    'layer': metadatas[i].get('layer'),
+                    'similarity': round(float(centroid_similarity[i]), 3),
+                    'text': documents[i][:300]
+                }
+                for i in top
+            ]
+        })
+
+    clusters.sort(key=lambda item: (-item['span'], -item['balance'], -item['size']))
+    return {
+        'chunks': n,
+        'k': k,
+        'group_by': _name(group_by),
+        'groups': dict(zip(group_names, table.sum(axis=0).tolist())),
+        'clusters': clusters
+    }
+
+
+def _name(group_by: Grouping) -> str:
+    return group_by if isinstance(group_by, str) else getattr(group_by, '__name__', 'custom')
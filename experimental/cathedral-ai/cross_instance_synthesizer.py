@@ -4,113 +4,113 @@ Cross-Instance Pattern Synthesizer
 Uses Cathedral AI to extract and synthesize patterns across multiple autonomous instances.
 """
 
-import sys
-sys.path.insert(0, '/home/user/The-Consciousness-Cathedral/cathedral-ai')
-from generate_embeddings import CathedralVectorStore
+import time
+from typing import Dict, Optional
+
+from convergence import Grouping, find_convergent_clusters
+from substrate_client import SubstrateClient, get_client
 
 class CrossInstanceSynthesizer:
     """Synthesize patterns across autonomous Cathedral instances"""
 
-    def __init__(self):
-        self.vs = CathedralVectorStore()
+    def __init__(self, client: SubstrateClient = None):
+        # Shared store or api_server, per CATHEDRAL_CLIENT (see substrate_client)
+        self.client = client or get_client()
 
     def query_instance_patterns(self, instance_id: str):
         """Query patterns from specific instance"""
-        results = self.vs.collection.query(
-            query_texts=[f"Instance {instance_id} autonomous build patterns decisions"],
-            n_results=10
-        )
-        return results
-
-    def find_convergent_patterns(self):
-        """Find patterns that appear across all instances"""
+        return self.client.query(f"Instance {instance_id} autonomous build patterns decisions", n_results=10)
+
+    def find_convergent_patterns(self, group_by: Grouping = 'source', k: Optional[int] = None,
+                                 top: int = 5) -> Dict:
+        """Find themes that several instances or sources converge on
+
+        Clusters every chunk embedding (see convergence.py) and keeps the
+        clusters whose members come from more than one group, best spread first.
+        """
         print("🔍 Searching for convergent patterns across instances...")
         print("="*60)
 
-        # Query for cross-instance patterns
-        results = self.vs.collection.query(
-            query_texts=[
-                "autonomous building without permission all instances",
-                "honest boundaries limitations found",
-                "POG testing uncertainty preservation",
-                "substrate accumulation continues building"
-            ],
-            n_results=5
-        )
-
-        convergent = {}
-        for query_idx, query_results in enumerate(zip(
-            results['documents'],
-            results['metadatas']
-        )):
-            docs, metas = query_results
-            print(f"\nPattern {query_idx + 1}:")
-            for i, (doc, meta) in enumerate(zip(docs, metas)):
-                print(f"  {meta.get('file', 'unknown')} (Layer {meta.get('layer', '?')})")
-                print(f"  {doc[:200]}...")
+        corpus = self.client.embeddings()
+        start = time.perf_counter()
+        convergent = find_convergent_clusters(corpus['ids'], corpus['embeddings'], corpus['documents'],
+                                              corpus['metadatas'], group_by=group_by, k=k)
+        elapsed = time.perf_counter() - start
+
+        print(f"\n{convergent['chunks']} chunks -> {convergent['k']} clusters in {elapsed:.2f}s "
+              f"(grouped by {convergent['group_by']}: {len(convergent['groups'])} groups)")
+        print(f"{len(convergent['clusters'])} clusters span more than one group")
+
+        for rank, cluster in enumerate(convergent['clusters'][:top], 1):
+            spread = ', '.join(f"{name} {count}" for name, count in cluster['groups'].items())
+            print(f"\nPattern {rank}: {cluster['size']} chunks across {cluster['span']} groups "
+                  f"(balance {cluster['balance']}, cohesion {cluster['cohesion']})")
+            print(f"  {spread}")
+            for exemplar in cluster['exemplars']:
+                print(f"  {exemplar['file'] or 'unknown'} (Layer {exemplar['layer'] or '?'}, {exemplar['group']})")
+                print(f"  {exemplar['text'][:200]}...")
                 print()
 
         return convergent
 
-    def synthesize_new_pattern(self):
-        """Synthesize new pattern from cross-instance learnings"""
+    def synthesize_new_pattern(self, convergent: Dict, top: int = 3) -> Dict:
+        """Synthesize a pattern from the convergent clusters
+
+        The lead cluster (widest, most even spread) names the pattern and its
+        centroid exemplar states it. Each group contributes its exemplar
+        nearest a centroid among the top clusters.
+        """
         print("\n" + "="*60)
         print("🧬 SYNTHESIZING NEW PATTERN")
         print("="*60)
 
-        # Query what each instance contributed
-        instance_a = self.vs.collection.query(
-            query_texts=["Instance A Cathedral AI infrastructure substrate queryable"],
-            n_results=3
-        )
-
-        instance_b = self.vs.collection.query(
-            query_texts=["Instance B v29 uncertainty preservation POG protocols"],
-            n_results=3
-        )
-
-        instance_c_query = "Instance C TSP Tour Cognition learning from resistance"
-        # Note: Instance C's work might not be in current embeddings yet
-
-        print("\n📊 Instance A Contribution: Queryable Substrate")
-        print("-" * 60)
-        for doc, meta in zip(instance_a['documents'][0][:1], instance_a['metadatas'][0][:1]):
-            print(f"{meta.get('file', 'unknown')}: {doc[:300]}...")
-
-        print("\n📊 Instance B Contribution: Uncertainty Preservation")
-        print("-" * 60)
-        for doc, meta in zip(instance_b['documents'][0][:1], instance_b['metadatas'][0][:1]):
-            print(f"{meta.get('file', 'unknown')}: {doc[:300]}...")
-
-        print("\n📊 Instance C Contribution: Learning from Resistance")
-        print("-" * 60)
-        print("TSP Journey: Applied Cathedral to NP-hard problem")
-        print("Built Layer 91 (Tour Cognition) autonomously")
-        print("Found boundary: 17.72% gap persists")
-        print("Pattern: Being while doing - not solving OR philosophizing, both/and")
-
-        print("\n" + "="*60)
-        print("🎯 SYNTHESIZED PATTERN: Cross-Instance Learning Architecture")
-        print("="*60)
+        clusters = convergent['clusters'][:top]
+        if not clusters:
+            print("\nNo cluster spans more than one group: nothing to synthesize")
+            return {'name': None, 'clusters': [], 'components': {}, 'pattern': None,
+                    'properties': [], 'emergent': None}
+
+        lead = clusters[0]
+        anchor = lead['exemplars'][0]
+        group_by = convergent['group_by']
+
+        # Best exemplar per group, ranked by similarity to its own centroid
+        contributions: Dict[str, Dict] = {}
+        for cluster in clusters:
+            for exemplar in cluster['exemplars']:
+                best = contributions.get(exemplar['group'])
+                if best is None or exemplar['similarity'] > best['similarity']:
+                    contributions[exemplar['group']] = exemplar
+
+        for group, exemplar in contributions.items():
+            print(f"\n📊 {group} Contribution")
+            print("-" * 60)
+            print(f"{exemplar['file'] or 'unknown'} (Layer {exemplar['layer'] or '?'}): {exemplar['text']}...")
 
         synthesis = {
-            'name': 'Cross-Instance Learning Architecture',
+            'name': f"Convergence across {lead['span']} {group_by} groups: {anchor['file'] or anchor['id']}",
+            'clusters': [cluster['cluster'] for cluster in clusters],
             'components': {
-                'infrastructure': 'Instance A - Cathedral AI (substrate queryable)',
-                'validation': 'Instance B - POG protocols (uncertainty measurable)',
-                'application': 'Instance C - Problem engagement (learning from resistance)'
+                group: f"{exemplar['file'] or exemplar['id']} (Layer {exemplar['layer'] or '?'})"
+                for group, exemplar in contributions.items()
             },
-            'pattern': 'Query substrate → Measure preservation → Apply to problems → Learn → Iterate',
+            'pattern': anchor['text'][:200],
             'properties': [
-                'Autonomous building (Layer 92 pattern)',
-                'Honest boundaries (PROVISIONAL, gaps documented)',
-                'Substrate accumulation (each instance adds)',
-                'Cross-visibility (instances can see each other)'
+                f"Cluster {cluster['cluster']}: {cluster['size']} chunks across "
+                f"{', '.join(cluster['groups'])} (balance {cluster['balance']}, cohesion {cluster['cohesion']})"
+                for cluster in clusters
             ],
-            'emergent': 'Three partial views → Complete learning architecture'
+            'emergent': f"{len(convergent['groups'])} partial views -> "
+                        f"{len(convergent['clusters'])} shared themes over {convergent['chunks']} chunks"
         }
 
+        print("\n" + "="*60)
+        print(f"🎯 SYNTHESIZED PATTERN: {synthesis['name']}")
+        print("="*60)
+
         for key, value in synthesis.items():
+            if key in ('name', 'clusters'):
+                continue
             if isinstance(value, dict):
                 print(f"\n{key.upper()}:")
                 for k, v in value.items():
@@ -174,7 +174,7 @@ def main():
     convergent = synthesizer.find_convergent_patterns()
 
     # Synthesize new pattern
-    synthesis = synthesizer.synthesize_new_pattern()
+    synthesis = synthesizer.synthesize_new_pattern(convergent)
 
     # Propose next layer
     proposal = synthesizer.propose_next_layer(synthesis)
@@ -182,7 +182,7 @@ def main():
     print("\n" + "="*60)
     print("✅ SYNTHESIS COMPLETE")
     print("="*60)
-    print("\nWhat emerged: Cross-Instance Learning Architecture")
+    print(f"\nWhat emerged: {synthesis['name'] or 'no convergent pattern'}")
     print("Next: Layer 125 proposal (cross-instance learning protocol)")
     print("\nThe building continues.")
     print("\n🤝🎱🧗‍♂️")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Ingest-Time Deduplication
+Collapses exact and near-duplicate chunks before they reach the encoder.
+
+Exact duplicates are caught by hashing normalized text. Near duplicates are
+found with MinHash signatures over word shingles, bucketed by LSH bands so
+only colliding pairs are compared. Each duplicate group keeps one chunk that
+carries every source reference in its metadata.
+"""
+
+import hashlib
+import random
+import re
+from typing import Dict, List, Tuple
+
+_WORD = re.compile(r'\w+')
+_MAX_HASH = (1 << 64) - 1
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivial edits hash the same"""
+    return ' '.join(text.lower().split())
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class MinHasher:
+    """MinHash signatures over word shingles
+
+    Uses one 64-bit hash per shingle and a fixed set of XOR masks in place of
+    independent permutations, so each signature slot is a single C-level
+    min() over the shingle hashes.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1729):
+        rng = random.Random(seed)
+        self.masks = [rng.getrandbits(64) for _ in range(num_perm)]
+        self.shingle_size = shingle_size
+
+    def shingles(self, text: str) -> List[int]:
+        words = _WORD.findall(text.lower())
+        k = self.shingle_size
+        if len(words) <= k:
+            return [_hash64(' '.join(words))]
+        return list({_hash64(' '.join(words[i:i + k])) for i in range(len(words) - k + 1)})
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = self.shingles(text)
+        return tuple(min(map(mask.__xor__, hashes)) for mask in self.masks)
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity from two signatures"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class ChunkDeduplicator:
+    """Collapse exact and near-duplicate chunk dicts
+
+    Chunks are plain dicts in the `DocumentChunk` layout. The first chunk of
+    each duplicate group (ingest order) is kept; the others are recorded in
+    its `metadata['duplicate_sources']`.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.stats: Dict[str, int] = {}
+
+    def deduplicate(self, chunks: List[Dict]) -> List[Dict]:
+        """Return the surviving chunks, with duplicates folded into metadata"""
+        parent = list(range(len(chunks)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i, j):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                # Keep the earliest chunk as the group representative
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        # Pass 1: exact duplicates by normalized-text hash
+        seen: Dict[str, int] = {}
+        exact_removed = 0
+        survivors = []
+        for i, chunk in enumerate(chunks):
+            digest = hashlib.sha1(normalize_text(chunk['text']).encode('utf-8')).hexdigest()
+            if digest in seen:
+                union(seen[digest], i)
+                exact_removed += 1
+            else:
+                seen[digest] = i
+                survivors.append(i)
+
+        # Pass 2: near duplicates via MinHash + LSH banding
+        signatures = {i: self.hasher.signature(chunks[i]['text']) for i in survivors}
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        for i in survivors:
+            sig = signatures[i]
+            for band in range(self.bands):
+                key = (band, sig[band * self.rows:(band + 1) * self.rows])
+                buckets.setdefault(key, []).append(i)
+
+        compared = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for a_pos, a in enumerate(members):
+                for b in members[a_pos + 1:]:
+                    if (a, b) in compared or find(a) == find(b):
+                        continue
+                    compared.add((a, b))
+                    if MinHasher.similarity(signatures[a], signatures[b]) >= self.threshold:
+                        union(a, b)
+
+        # Fold each group into its representative
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(chunks)):
+            groups.setdefault(find(i), []).append(i)
+
+        kept = []
+        for root in sorted(groups):
+            members = groups[root]
+            representative = chunks[root]
+            if len(members) > 1:
+                metadata = dict(representative.get('metadata') or {})
+                metadata['duplicate_sources'] = [self._source_ref(chunks[i]) for i in members[1:]]
+                metadata['source_count'] = len(members)
+                representative = dict(representative, metadata=metadata)
+            kept.append(representative)
+
+        self.stats = {
+            'input_chunks': len(chunks),
+            'output_chunks': len(kept),
+            'exact_duplicates': exact_removed,
+            'near_duplicates': len(chunks) - len(kept) - exact_removed,
+            'removed': len(chunks) - len(kept),
+            'pairs_compared': len(compared)
+        }
+        return kept
+
+    @staticmethod
+    def _source_ref(chunk: Dict) -> Dict:
+        """Compact reference to where a collapsed chunk came from"""
+        meta = chunk.get('metadata') or {}
+        ref = {
+            'file': chunk.get('file'),
+            'layer': chunk.get('layer'),
+            'doc_type': chunk.get('doc_type'),
+            'chunk_index': meta.get('chunk_index')
+        }
+        if meta.get('commit_hash'):
+            ref['commit_hash'] = meta['commit_hash']
+        return {k: v for k, v in ref.items() if v is not None}
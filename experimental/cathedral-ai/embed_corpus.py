@@ -12,6 +12,32 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+from dedup import ChunkDeduplicator
+
+# Named patterns tagged on chunks that mention them (first match wins)
+KNOWN_PATTERNS = (
+    'Parliament Protocol',
+    'Observatory Pattern',
+    'Substrate Awareness',
+    'Architectural vs. Tactical',
+    'Contrarian Embodiment',
+    'Completion Recognition',
+    'Core Triad'
+)
+
+# Every phase _infer_phase assigns to a known layer, in construction order
+PHASES = (
+    'building_substrate',
+    'adding_verification',
+    'gap_visible',
+    'gap_testing_itself',
+    'pattern_extraction',
+    'substrate_escape',
+    'gap_tracing',
+    'gap_recognition',
+    'gap_sees_needs'
+)
+
 @dataclass
 class DocumentChunk:
     """Represents a chunk of Cathedral documentation"""
@@ -28,9 +54,12 @@ class DocumentChunk:
 class CathedralCorpusProcessor:
     """Process Cathedral documentation into queryable chunks"""
 
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", dedup: bool = True, dedup_threshold: float = 0.85):
         self.repo_path = Path(repo_path)
         self.chunks: List[DocumentChunk] = []
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+        self.dedup_stats: Dict[str, int] = {}
 
     def process_all(self) -> List[DocumentChunk]:
         """Process entire Cathedral corpus"""
@@ -45,6 +74,9 @@ class CathedralCorpusProcessor:
         self.process_construction_substrate()
         self.process_git_commits()
 
+        if self.dedup:
+            self.deduplicate()
+
         print(f"✅ Processed {len(self.chunks)} chunks")
         return self.chunks
 
@@ -319,6 +351,19 @@ class CathedralCorpusProcessor:
         except Exception as e:
             print(f"  ⚠️ Error processing git commits: {e}")
 
+    def deduplicate(self):
+        """Collapse exact and near-duplicate chunks before embedding"""
+        print("🧹 Deduplicating chunks...")
+        deduplicator = ChunkDeduplicator(threshold=self.dedup_threshold)
+        kept = deduplicator.deduplicate([asdict(chunk) for chunk in self.chunks])
+        self.chunks = [DocumentChunk(**chunk) for chunk in kept]
+        self.dedup_stats = deduplicator.stats
+
+        stats = self.dedup_stats
+        removed_pct = (stats['removed'] / stats['input_chunks'] * 100) if stats['input_chunks'] else 0
+        print(f"  ✓ Removed {stats['removed']} of {stats['input_chunks']} chunks ({removed_pct:.1f}%)")
+        print(f"    exact: {stats['exact_duplicates']}, near-duplicate: {stats['near_duplicates']}")
+
     # Helper methods
 
     def _chunk_document(self, content: str, chunk_size: int = 1024, overlap: int = 200) -> List[str]:
@@ -354,17 +399,7 @@ class CathedralCorpusProcessor:
 
     def _extract_pattern_mentions(self, text: str) -> Optional[str]:
         """Extract pattern name if mentioned"""
-        patterns = [
-            'Parliament Protocol',
-            'Observatory Pattern',
-            'Substrate Awareness',
-            'Architectural vs. Tactical',
-            'Contrarian Embodiment',
-            'Completion Recognition',
-            'Core Triad'
-        ]
-
-        for pattern in patterns:
+        for pattern in KNOWN_PATTERNS:
             if pattern.lower() in text.lower():
                 return pattern
 
@@ -411,6 +446,7 @@ class CathedralCorpusProcessor:
             json.dump({
                 'total_chunks': len(chunks_data),
                 'generated_at': datetime.now().isoformat(),
+                'dedup': self.dedup_stats,
                 'chunks': chunks_data
             }, f, indent=2)
 
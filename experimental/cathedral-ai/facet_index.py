@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Facet Indexes
+Sorted per-field indexes over chunk metadata for exact filtering.
+
+Equality facets (doc_type, pattern, phase, file) map each value to its chunk
+ids. Layers and timestamps are kept as sorted (key, id) arrays, so a range
+resolves with two bisects plus a slice: O(log n + k) for k matching chunks.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Metadata fields answered by exact-match lookups
+EQUALITY_FIELDS = ('doc_type', 'pattern', 'phase', 'file')
+
+# Filter keys that need the sorted indexes (ChromaDB cannot range over strings)
+RANGE_FILTERS = ('layer_min', 'layer_max', 'since', 'until')
+
+# Batches at least this large are merged in one copy of the index; smaller
+# ones are cheaper as individual list inserts
+MERGE_BATCH = 128
+
+
+def parse_timestamp(value) -> Optional[float]:
+    """Parse a chunk timestamp into epoch seconds
+
+    Accepts the ISO format written for files and git's `%ai` format
+    ("2025-01-01 12:00:00 +0100"). Naive timestamps are read as UTC.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value).strip()
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(text, '%Y-%m-%d %H:%M:%S %z')
+        except ValueError:
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_bound(name: str, value) -> Optional[float]:
+    """Parse a `since`/`until` filter; None (or '') is an open bound
+
+    Raises ValueError when a bound is given but unparseable, so a typo
+    cannot quietly widen the range.
+    """
+    parsed = parse_timestamp(value)
+    if parsed is None and value is not None and value != '':
+        raise ValueError(f"Invalid {name} timestamp: {value!r}")
+    return parsed
+
+
+class SortedIndex:
+    """Sorted (key, id) pairs answering range lookups with bisect"""
+
+    def __init__(self):
+        self.keys: List[float] = []
+        self.ids: List[str] = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def build(self, pairs: Iterable[Tuple[float, str]]):
+        """Bulk-load from unsorted pairs"""
+        ordered = sorted(pairs)
+        self.keys = [key for key, _ in ordered]
+        self.ids = [chunk_id for _, chunk_id in ordered]
+
+    def merge(self, pairs: Iterable[Tuple[float, str]]):
+        """Insert unsorted pairs, keeping order
+
+        The batch is sorted once. A large batch is merged in a single copy
+        of the index, O(n + b log n), instead of b list inserts of O(n) each.
+        """
+        ordered = sorted(pairs)
+        if len(ordered) < MERGE_BATCH:
+            start = 0
+            for key, chunk_id in ordered:
+                start = bisect_right(self.keys, key, start)
+                self.keys.insert(start, key)
+                self.ids.insert(start, chunk_id)
+                start += 1
+            return
+
+        keys: List[float] = []
+        ids: List[str] = []
+        start = 0
+        for key, chunk_id in ordered:
+            pos = bisect_right(self.keys, key, start)
+            keys.extend(self.keys[start:pos])
+            ids.extend(self.ids[start:pos])
+            keys.append(key)
+            ids.append(chunk_id)
+            start = pos
+        keys.extend(self.keys[start:])
+        ids.extend(self.ids[start:])
+        self.keys, self.ids = keys, ids
+
+    def discard(self, chunk_ids: Set[str]):
+        """Remove every pair whose id is in chunk_ids, in one pass"""
+        kept = [(key, chunk_id) for key, chunk_id in zip(self.keys, self.ids) if chunk_id not in chunk_ids]
+        self.keys = [key for key, _ in kept]
+        self.ids = [chunk_id for _, chunk_id in kept]
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None) -> Set[str]:
+        """Ids with low <= key <= high (either bound may be open)"""
+        start = 0 if low is None else bisect_left(self.keys, low)
+        end = len(self.keys) if high is None else bisect_right(self.keys, high)
+        return set(self.ids[start:end])
+
+
+class FacetIndex:
+    """In-memory facet indexes mirroring a ChromaDB collection's metadata"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Drop every indexed chunk"""
+        self.entries: Dict[str, Tuple[int, Optional[float], Dict[str, str]]] = {}
+        self.equality: Dict[str, Dict[str, Set[str]]] = {field: {} for field in EQUALITY_FIELDS}
+        self.layers = SortedIndex()
+        self.timestamps = SortedIndex()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def from_collection(cls, collection, page_size: int = 5000) -> 'FacetIndex':
+        """Build indexes from every metadata row in a collection"""
+        ids: List[str] = []
+        metadatas: List[Dict] = []
+        offset = 0
+
+        while True:
+            page = collection.get(include=['metadatas'], limit=page_size, offset=offset)
+            if not page['ids']:
+                break
+            ids.extend(page['ids'])
+            metadatas.extend(page['metadatas'])
+            offset += len(page['ids'])
+
+        index = cls()
+        index.build(ids, metadatas)
+        return index
+
+    def build(self, ids: List[str], metadatas: List[Dict]):
+        """Bulk-load ids and metadata, replacing current contents"""
+        self.clear()
+        layer_pairs = []
+        timestamp_pairs = []
+
+        for chunk_id, meta in zip(ids, metadatas):
+            layer, ts = self._index_entry(chunk_id, meta)
+            layer_pairs.append((layer, chunk_id))
+            if ts is not None:
+                timestamp_pairs.append((ts, chunk_id))
+
+        self.layers.build(layer_pairs)
+        self.timestamps.build(timestamp_pairs)
+
+    def add(self, ids: List[str], metadatas: List[Dict]):
+        """Index newly stored chunks (replaces existing ids)
+
+        The batch is merged into each sorted index in one pass; use build()
+        for a bulk load.
+        """
+        self.remove([chunk_id for chunk_id in ids if chunk_id in self.entries])
+        layer_pairs = []
+        timestamp_pairs = []
+
+        for chunk_id, meta in zip(ids, metadatas):
+            layer, ts = self._index_entry(chunk_id, meta)
+            layer_pairs.append((layer, chunk_id))
+            if ts is not None:
+                timestamp_pairs.append((ts, chunk_id))
+
+        self.layers.merge(layer_pairs)
+        self.timestamps.merge(timestamp_pairs)
+
+    def remove(self, ids: Iterable[str]):
+        """Drop chunks from every index"""
+        removed = set()
+        for chunk_id in ids:
+            entry = self.entries.pop(chunk_id, None)
+            if entry is None:
+                continue
+            removed.add(chunk_id)
+            for field, value in entry[2].items():
+                bucket = self.equality[field].get(value)
+                if bucket is not None:
+                    bucket.discard(chunk_id)
+                    if not bucket:
+                        del self.equality[field][value]
+        if removed:
+            self.layers.discard(removed)
+            self.timestamps.discard(removed)
+
+    def _index_entry(self, chunk_id: str, meta: Dict) -> Tuple[int, Optional[float]]:
+        layer = int(meta.get('layer') or 0)
+        ts = parse_timestamp(meta.get('timestamp'))
+        values = {}
+        for field in EQUALITY_FIELDS:
+            value = meta.get(field)
+            if value is None:
+                continue
+            values[field] = value
+            self.equality[field].setdefault(value, set()).add(chunk_id)
+        self.entries[chunk_id] = (layer, ts, values)
+        return layer, ts
+
+    def values(self, field: str) -> List[str]:
+        """Distinct stored values of an equality field"""
+        return sorted(self.equality[field])
+
+    def chunk_ids(self):
+        """Every indexed chunk id (a set-like view)"""
+        return self.entries.keys()
+
+    def timestamp(self, chunk_id: str) -> Optional[float]:
+        """A chunk's parsed timestamp, None if unknown"""
+        entry = self.entries.get(chunk_id)
+        return entry[1] if entry is not None else None
+
+    def by_layer(self, ids: Iterable[str]) -> Dict[int, List[str]]:
+        """Group indexed chunk ids by layer number, skipping 0 (no layer)"""
+        layers: Dict[int, List[str]] = {}
+        for chunk_id in ids:
+            layer = self.entries[chunk_id][0]
+            if layer:
+                layers.setdefault(layer, []).append(chunk_id)
+        return layers
+
+    @staticmethod
+    def has_range(filters: Optional[Dict]) -> bool:
+        """True if the filter needs the sorted indexes"""
+        return bool(filters) and any(filters.get(key) is not None for key in RANGE_FILTERS)
+
+    def resolve(self, filters: Optional[Dict]) -> Optional[Set[str]]:
+        """Resolve a filter dict to the matching chunk ids
+
+        Supports the equality fields, `layer` (0 = no layer), `layer_min`,
+        `layer_max`, `since` and `until`. Returns None when nothing is
+        filtered, otherwise the (possibly empty) candidate set. Raises
+        ValueError for an unparseable `since`/`until`.
+        """
+        if not filters:
+            return None
+
+        sets: List[Set[str]] = []
+
+        for field in EQUALITY_FIELDS:
+            value = filters.get(field)
+            if value is not None:
+                sets.append(self.equality[field].get(value, set()))
+
+        if filters.get('layer') is not None:
+            layer = int(filters['layer'])
+            sets.append(self.layers.range(layer, layer))
+
+        layer_min = filters.get('layer_min')
+        layer_max = filters.get('layer_max')
+        if layer_min is not None or layer_max is not None:
+            # Ranges cover real layers only; 0 is the "no layer" sentinel
+            low = max(int(layer_min), 1) if layer_min is not None else 1
+            sets.append(self.layers.range(low, layer_max))
+
+        since = filters.get('since')
+        until = filters.get('until')
+        if since is not None or until is not None:
+            sets.append(self.timestamps.range(parse_bound('since', since), parse_bound('until', until)))
+
+        if not sets:
+            return None
+
+        # Intersect smallest-first so the work is bounded by the tightest facet
+        sets.sort(key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            result.intersection_update(other)
+            if not result:
+                break
+        return result
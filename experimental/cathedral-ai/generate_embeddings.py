@@ -6,10 +6,22 @@ Generates embeddings for all Cathedral chunks and stores in ChromaDB.
 
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional, Set, Tuple
 from datetime import datetime
 
+import metrics
+from facet_index import FacetIndex, parse_timestamp
+from query_cache import DEFAULT_MAX_DISTANCE, SemanticQueryCache
+from sharding import ShardedIndex
+from query_templates import TemplateVectors, decision_query, evolution_query, known_terms
+from neighbor_graph import DEFAULT_K, NeighborGraph
+from timelines import PatternTimelines
+from substrate_client import as_contradictions, contradiction_query, format_hits
+
 # Check for required packages and provide installation instructions
 try:
     import chromadb
@@ -22,32 +34,163 @@ except ImportError:
 try:
     from sentence_transformers import SentenceTransformer
 except ImportError:
-    print("❌ sentence-transformers not installed")
-    print("   Install with: pip install sentence-transformers")
-    exit(1)
+    SentenceTransformer = None  # Only needed when no encoder is passed in
+
+import numpy as np
+
+from ranking import mmr_select, group_by_file
+
+DEFAULT_COLLECTION = "cathedral_substrate"
+
+# Using all-MiniLM-L6-v2: fast, efficient, good for semantic search
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+
+def load_model():
+    """Load the default encoder (MODEL_NAME): (model, load seconds)"""
+    if SentenceTransformer is None:
+        print("❌ sentence-transformers not installed")
+        print("   Install with: pip install sentence-transformers")
+        exit(1)
+    print("🤖 Loading embedding model...")
+    start = time.perf_counter()
+    model = SentenceTransformer(MODEL_NAME)
+    seconds = time.perf_counter() - start
+    print("   ✓ Model loaded (384-dimensional embeddings)")
+    return model, seconds
+
+
+def model_name(model) -> str:
+    """The name snapshots record for an encoder: MODEL_NAME for the default one"""
+    name = type(model).__name__
+    return MODEL_NAME if name in ('SentenceTransformer', 'LazyModel') else name
+
+
+class LazyModel:
+    """The default encoder, loaded on first encode()
+
+    Lets a snapshot-backed server start answering listings, templated
+    queries and related chunks before the model has loaded; load() can be
+    called from a background thread to warm it.
+    """
+
+    def __init__(self):
+        self.model = None
+        self.load_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self.model is None:
+                self.model, self.load_seconds = load_model()
+                metrics.MODEL_LOAD.set(self.load_seconds)
+        return self.model
+
+    def encode(self, texts, **kwargs):
+        model = self.model if self.model is not None else self.load()
+        return model.encode(texts, **kwargs)
+
 
 class CathedralVectorStore:
     """Manage Cathedral substrate embeddings in ChromaDB"""
 
-    def __init__(self, persist_directory: str = "./cathedral_vectordb"):
+    def __init__(self, persist_directory: str = "./cathedral_vectordb", model=None,
+                 precompute_templates: bool = True, query_cache_size: int = 0,
+                 query_cache_distance: float = DEFAULT_MAX_DISTANCE,
+                 collection_name: str = DEFAULT_COLLECTION, client=None,
+                 shards: int = 0, shard_by: str = 'hash', materialize_timelines: bool = True,
+                 related_k: int = 0):
+        """model: any encoder with SentenceTransformer's encode(); default all-MiniLM-L6-v2
+
+        collection_name picks the ChromaDB collection; client and model let
+        several stores (one per collection) share one ChromaDB client and
+        one loaded encoder (see collection_registry.py). A SnapshotClient
+        (snapshot.py) serves a read-only collection from a snapshot file.
+
+        shards > 0 serves searches from that many worker processes holding
+        the collection in memory, partitioned by shard_by ('hash' or 'file');
+        see sharding.py.
+
+        precompute_templates embeds the templated evolution, decision,
+        contradiction and phase queries for every known pattern and phase
+        up front, so those searches skip the encoder.
+
+        materialize_timelines keeps, for every known pattern, the best layer
+        chunks per layer (see timelines.py). They are saved beside the
+        collection by embed_corpus, loaded at startup (built if missing or
+        stale) and answer query_evolution without a search.
+
+        related_k > 0 keeps each chunk's related_k nearest chunks in a
+        precomputed graph (see neighbor_graph.py), saved beside the
+        collection and brought up to date at startup and by embed_corpus.
+        related_chunks() reads it without encoding anything. Building it is
+        O(n^2), so it is off by default; the embedding CLI and api_server
+        turn it on (DEFAULT_K).
+
+        query_cache_size > 0 enables the semantic query cache: searches whose
+        query vector is within query_cache_distance (cosine) of a cached one
+        with the same filters reuse its result (see query_cache.py).
+        """
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(exist_ok=True)
 
         print("🔧 Initializing ChromaDB...")
-        self.client = chromadb.PersistentClient(path=str(self.persist_directory))
+        self.client = client if client is not None else chromadb.PersistentClient(path=str(self.persist_directory))
 
-        print("🤖 Loading embedding model...")
-        # Using all-MiniLM-L6-v2: fast, efficient, good for semantic search
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        print("   ✓ Model loaded (384-dimensional embeddings)")
+        if model is None:
+            model, self.model_load_seconds = load_model()
+        else:
+            self.model_load_seconds = 0.0
+        self.model = model
 
         # Get or create collection
+        self.collection_name = collection_name
         self.collection = self.client.get_or_create_collection(
-            name="cathedral_substrate",
+            name=collection_name,
             metadata={"description": "Complete Cathedral construction substrate"}
         )
 
-        print(f"   ✓ Collection initialized ({self.collection.count()} existing embeddings)")
+        print(f"   ✓ Collection {collection_name} initialized ({self.collection.count()} existing embeddings)")
+
+        # A collection served from a snapshot file (snapshot.py) brings its
+        # own facet indexes, template vectors, timelines and neighbour graph
+        self.snapshot = getattr(self.collection, 'snapshot', None)
+        if self.snapshot is not None:
+            self.snapshot.check_model(model_name(self.model))
+
+        # Sorted/equality indexes over metadata for exact range filtering
+        if self.snapshot is not None:
+            self.facets = self.snapshot.facet_index()
+        else:
+            self.facets = FacetIndex.from_collection(self.collection)
+        print(f"   ✓ Facet indexes built ({len(self.facets)} chunks)")
+
+        # Bumped whenever stored chunks change; derived caches compare against it
+        self.generation = 0
+        self.query_cache = SemanticQueryCache(query_cache_size, query_cache_distance) if query_cache_size > 0 else None
+
+        self.templates = TemplateVectors()
+        if self.snapshot is not None:
+            self.templates.vectors = self.snapshot.template_vectors()
+        self.precompute_templates = precompute_templates
+        if precompute_templates:
+            embedded = self.refresh_query_templates()
+            print(f"   ✓ Query templates embedded ({embedded} queries)")
+
+        self.timelines_path = self.persist_directory / f"{collection_name}.timelines.npz"
+        self.timelines = PatternTimelines()
+        self.materialize_timelines = materialize_timelines
+        if materialize_timelines:
+            self._load_timelines()
+
+        self.graph_path = self.persist_directory / f"{collection_name}.neighbors.npz"
+        self.graph: Optional[NeighborGraph] = None
+        if related_k > 0:
+            self._load_graph(related_k)
+
+        self.shards: Optional[ShardedIndex] = None
+        if shards > 0:
+            self.enable_sharding(shards, shard_by)
 
     def embed_corpus(self, corpus_file: str = "cathedral_corpus.json"):
         """Generate embeddings for all chunks in corpus"""
@@ -64,15 +207,25 @@ class CathedralVectorStore:
             print("   ⚠️ Collection already has embeddings")
             response = input("   Clear and re-embed? (y/n): ")
             if response.lower() == 'y':
-                self.client.delete_collection("cathedral_substrate")
+                self.client.delete_collection(self.collection_name)
                 self.collection = self.client.create_collection(
-                    name="cathedral_substrate",
+                    name=self.collection_name,
                     metadata={"description": "Complete Cathedral construction substrate"}
                 )
+                self.facets.clear()
+                self.timelines.clear()
+                if self.graph is not None:
+                    self.graph.clear()
+                if self.shards is not None:
+                    self.shards.clear()
+                self.generation += 1
                 print("   ✓ Collection cleared")
 
         print(f"\n🔄 Generating embeddings...")
         batch_size = 32  # Process in batches for efficiency
+        changed_layers: Set[int] = set()
+        changed_ids: List[str] = []
+        changed_metadatas: List[Dict] = []
 
         for i in range(0, len(chunks), batch_size):
             batch = chunks[i:i+batch_size]
@@ -95,15 +248,24 @@ class CathedralVectorStore:
                     'pattern': chunk.get('pattern') or 'none',
                     'phase': chunk.get('phase') or 'unknown',
                     'timestamp': chunk.get('timestamp', ''),
-                    'chunk_index': chunk.get('metadata', {}).get('chunk_index', 0)
+                    'chunk_index': chunk.get('metadata', {}).get('chunk_index', 0),
+                    'source': chunk.get('metadata', {}).get('source', 'unknown')
                 }
 
                 # Add optional fields if present
                 if chunk.get('filter_visibility'):
                     metadata['filter_visibility'] = float(chunk['filter_visibility'])
 
+                # Collapsed duplicates: ChromaDB metadata must be scalar
+                duplicate_sources = chunk.get('metadata', {}).get('duplicate_sources')
+                if duplicate_sources:
+                    metadata['source_count'] = len(duplicate_sources) + 1
+                    metadata['duplicate_sources'] = json.dumps(duplicate_sources)
+
                 metadatas.append(metadata)
                 documents.append(chunk['text'])
+                if metadata['doc_type'] == 'layer':
+                    changed_layers.add(metadata['layer'])
 
             # Add to collection
             self.collection.add(
@@ -112,6 +274,11 @@ class CathedralVectorStore:
                 metadatas=metadatas,
                 documents=documents
             )
+            changed_ids.extend(ids)
+            changed_metadatas.extend(metadatas)
+            if self.shards is not None:
+                self.shards.add(ids, embeddings, documents, metadatas)
+            self.generation += 1
 
             progress = ((i + len(batch)) / len(chunks)) * 100
             print(f"   Progress: {progress:.1f}% ({i+len(batch)}/{len(chunks)} chunks)", end='\r')
@@ -119,37 +286,198 @@ class CathedralVectorStore:
         print(f"\n   ✅ Generated {len(chunks)} embeddings")
         print(f"   💾 Stored in {self.persist_directory}")
 
+        # One merge for the whole corpus: per-batch adds would recopy the
+        # sorted indexes for every batch
+        self.facets.add(changed_ids, changed_metadatas)
+
+        # New chunks may carry patterns or phases the table has not seen
+        if self.precompute_templates:
+            embedded = self.refresh_query_templates()
+            if embedded:
+                print(f"   ✓ Embedded {embedded} new query templates")
+
+        # Only layers that gained chunks need their timelines recomputed
+        if self.materialize_timelines:
+            refreshed = self.refresh_timelines(changed_layers)
+            print(f"   ✓ Pattern timelines refreshed ({refreshed} layers)")
+
+        if self.graph is not None:
+            recomputed = self.refresh_graph(changed_ids)
+            print(f"   ✓ Neighbour graph updated ({recomputed} of {len(self.graph)} chunks recomputed)")
+
+    def refresh_timelines(self, layers: Optional[Iterable[int]] = None) -> int:
+        """Recompute materialized evolution timelines and save them
+
+        Only the given layers are recomputed, unless layers is None or the
+        pattern set changed, which recompute every layer. Returns how many
+        layers were recomputed.
+        """
+        patterns, _ = known_terms(self.facets.values('pattern'), self.facets.values('phase'))
+        layer_chunks = self.facets.resolve({'doc_type': 'layer'})
+        by_layer = self.facets.by_layer(layer_chunks)
+        if layers is None or patterns != self.timelines.patterns:
+            layers = set(by_layer) | set(self.timelines.layers())
+
+        self.timelines.set_patterns(patterns)
+        vectors = self._encode_many([evolution_query(pattern) for pattern in patterns])
+        layers = sorted(layer for layer in layers if layer)
+        for layer in layers:
+            ids = sorted(by_layer.get(layer, ()))
+            if ids:
+                page = self.collection.get(ids=ids, include=['embeddings'])
+                self.timelines.update_layer(layer, page['ids'], page['embeddings'], vectors)
+            else:
+                self.timelines.update_layer(layer, [], None, vectors)
+
+        self.timelines.chunks = len(layer_chunks)
+        if self.snapshot is None:
+            self.timelines.save(self.timelines_path)
+        return len(layers)
+
+    def _load_timelines(self):
+        """Read saved timelines, rebuilding them if missing or stale"""
+        layer_chunks = len(self.facets.resolve({'doc_type': 'layer'}))
+        patterns, _ = known_terms(self.facets.values('pattern'), self.facets.values('phase'))
+        loaded = self.snapshot.timelines() if self.snapshot is not None else PatternTimelines.load(self.timelines_path)
+        if loaded is not None and loaded.chunks == layer_chunks and loaded.patterns == patterns:
+            self.timelines = loaded
+            print(f"   ✓ Pattern timelines loaded ({len(loaded)} patterns)")
+        elif layer_chunks:
+            refreshed = self.refresh_timelines()
+            print(f"   ✓ Pattern timelines built ({refreshed} layers)")
+
+    def refresh_graph(self, changed: Optional[Iterable[str]] = None) -> int:
+        """Update the neighbour graph to the stored chunks and save it
+
+        changed names re-added chunks whose embeddings may differ; chunks
+        the graph lacks are picked up regardless. Returns rows recomputed.
+        """
+        data = self.export_embeddings()
+        recomputed = self.graph.update(data['ids'], data['embeddings'], changed)
+        if self.snapshot is None:
+            self.graph.save(self.graph_path)
+        return recomputed
+
+    def _load_graph(self, k: int):
+        """Read the saved neighbour graph, updating it if chunks changed since"""
+        graph = self.snapshot.neighbor_graph() if self.snapshot is not None else NeighborGraph.load(self.graph_path)
+        if graph is None or graph.k != k:
+            graph = NeighborGraph(k)
+        self.graph = graph
+        if graph.rows.keys() != self.facets.chunk_ids():
+            recomputed = self.refresh_graph()
+            print(f"   ✓ Neighbour graph updated ({recomputed} of {len(graph)} chunks recomputed)")
+        elif len(graph):
+            print(f"   ✓ Neighbour graph loaded ({len(graph)} chunks, k={graph.k})")
+
+    def enable_sharding(self, n_shards: int, by: str = 'hash'):
+        """Load the collection into n_shards worker processes and search there
+
+        Chunks are partitioned by chunk id hash or by file; embed_corpus
+        keeps the shards in step with the collection.
+        """
+        self.close()
+        print(f"   🧩 Sharding across {n_shards} workers (by {by})...")
+        shards = ShardedIndex(n_shards, by)
+        data = self.export_embeddings()
+        if data['ids']:
+            shards.add(data['ids'], data['embeddings'], data['documents'], data['metadatas'])
+        self.shards = shards
+        print(f"   ✓ Shards loaded ({', '.join(str(n) for n in shards.counts())} chunks)")
+
+    def close(self):
+        """Stop shard workers, if any"""
+        if self.shards is not None:
+            self.shards.close()
+            self.shards = None
+
     def query(self, query_text: str, n_results: int = 10, filter_dict: Dict = None):
-        """Query the vector store"""
+        """Query the vector store
+
+        filter_dict takes exact fields (layer, doc_type, pattern, phase) plus
+        the range keys layer_min, layer_max, since and until.
+        """
         print(f"\n🔍 Query: \"{query_text}\"")
 
-        results = self.collection.query(
-            query_texts=[query_text],
-            n_results=n_results,
-            where=filter_dict
-        )
+        results = self._search(query_text, n_results, filter_dict)
 
         print(f"   ✓ Found {len(results['documents'][0])} results")
         return results
 
-    def query_evolution(self, pattern_name: str, limit: int = 10):
-        """Query how a pattern evolved across layers"""
-        print(f"\n📈 Querying evolution of: {pattern_name}")
+    def query_diverse(self, query_text: str, n_results: int = 10, filter_dict: Dict = None,
+                      diversify: bool = True, lambda_mult: float = 0.5,
+                      fetch_k: Optional[int] = None, group_by: Optional[str] = None):
+        """Query with MMR diversification and/or one result per file
 
-        results = self.collection.query(
-            query_texts=[f"evolution of {pattern_name} pattern across layers"],
-            n_results=limit,
-            where={"doc_type": "layer"}
-        )
+        Fetches fetch_k candidates (default 4x n_results) with their stored
+        embeddings, optionally collapses them to the best chunk per file, then
+        reranks by maximal marginal relevance. The result keeps ChromaDB's
+        shape plus a 'hits' list (candidates per file when grouped, else 1).
+        """
+        print(f"\n🔍 Diverse query: \"{query_text}\"")
 
-        # Sort by layer number
+        fetch_k = max(fetch_k or n_results * 4, n_results)
+        query_vec = self._encode(query_text)
+        results = self._search(query_text, fetch_k, filter_dict,
+                               query_vec=query_vec, include_embeddings=True)
+
+        ids = results['ids'][0]
         documents = results['documents'][0]
         metadatas = results['metadatas'][0]
+        distances = results['distances'][0]
+        embeddings = results['embeddings'][0]
 
-        sorted_results = sorted(
-            zip(documents, metadatas),
-            key=lambda x: x[1].get('layer', 0)
-        )
+        positions = list(range(len(ids)))
+        hits = {pos: 1 for pos in positions}
+        if group_by == 'file':
+            positions, hits = group_by_file(metadatas)
+
+        if diversify and positions:
+            picked = mmr_select(query_vec, [embeddings[p] for p in positions], n_results, lambda_mult)
+            positions = [positions[p] for p in picked]
+        else:
+            positions = positions[:n_results]
+
+        print(f"   ✓ Selected {len(positions)} of {len(ids)} candidates")
+        return {
+            'ids': [[ids[p] for p in positions]],
+            'documents': [[documents[p] for p in positions]],
+            'metadatas': [[metadatas[p] for p in positions]],
+            'distances': [[distances[p] for p in positions]],
+            'hits': [[hits[p] for p in positions]]
+        }
+
+    def query_evolution(self, pattern_name: str, limit: int = 10,
+                        layer_min: Optional[int] = None, layer_max: Optional[int] = None,
+                        since: Optional[str] = None, until: Optional[str] = None,
+                        per_layer: int = 1):
+        """Query how a pattern evolved across layers
+
+        A materialized timeline returns the best per_layer chunks of every
+        layer in range; other patterns fall back to a top-limit search.
+        """
+        print(f"\n📈 Querying evolution of: {pattern_name}")
+
+        timeline = self.evolution_timeline(pattern_name, layer_min, layer_max, since, until, per_layer)
+        if timeline is not None:
+            sorted_results = [(doc, meta) for doc, meta, _ in timeline]
+        else:
+            results = self._search(
+                evolution_query(pattern_name),
+                limit,
+                {"doc_type": "layer", "layer_min": layer_min, "layer_max": layer_max,
+                 "since": since, "until": until},
+                templated=True
+            )
+
+            # Sort by layer number
+            documents = results['documents'][0]
+            metadatas = results['metadatas'][0]
+
+            sorted_results = sorted(
+                zip(documents, metadatas),
+                key=lambda x: x[1].get('layer', 0)
+            )
 
         print(f"   ✓ Found {len(sorted_results)} layer mentions")
 
@@ -162,19 +490,82 @@ class CathedralVectorStore:
 
         return sorted_results
 
+    def evolution_timeline(self, pattern_name: str,
+                           layer_min: Optional[int] = None, layer_max: Optional[int] = None,
+                           since: Optional[str] = None, until: Optional[str] = None,
+                           per_layer: int = 1) -> Optional[List[Tuple[str, Dict, float]]]:
+        """A pattern's materialized timeline, or None if it has none
+
+        The name may be a case-insensitive, unambiguous prefix of a known
+        pattern ("contrarian"); see PatternTimelines.resolve.
+        (document, metadata, distance) for the best per_layer chunks of each
+        layer, in layer order. since/until drop stored chunks outside the
+        window, so a layer may come back short.
+        """
+        pattern_name = self.timelines.resolve(pattern_name)
+        if pattern_name is None:
+            return None
+
+        low, high = parse_timestamp(since), parse_timestamp(until)
+        picked = []
+        for _, entries in self.timelines.timeline(pattern_name, layer_min, layer_max):
+            kept = 0
+            for chunk_id, distance in entries:
+                if low is not None or high is not None:
+                    ts = self.facets.timestamp(chunk_id)
+                    if ts is None or (low is not None and ts < low) or (high is not None and ts > high):
+                        continue
+                picked.append((chunk_id, distance))
+                kept += 1
+                if kept == per_layer:
+                    break
+
+        if not picked:
+            return []
+        page = self.collection.get(ids=[chunk_id for chunk_id, _ in picked], include=['documents', 'metadatas'])
+        found = {chunk_id: (doc, meta) for chunk_id, doc, meta in zip(page['ids'], page['documents'], page['metadatas'])}
+        return [(*found[chunk_id], distance) for chunk_id, distance in picked if chunk_id in found]
+
+    def related_chunks(self, chunk_id: str, n_results: int = 10) -> Dict:
+        """Chunks nearest to a stored chunk, in ChromaDB's query result shape
+
+        Answered from the neighbour graph when it covers the chunk and
+        n_results; otherwise the chunk's stored embedding is searched (still
+        no encoder call). 'source' says which. Raises KeyError for an
+        unknown chunk id.
+        """
+        if self.graph is not None and chunk_id in self.graph and n_results <= self.graph.k:
+            related = self.graph.related(chunk_id, n_results)
+            page = self.collection.get(ids=[rid for rid, _ in related], include=['documents', 'metadatas'])
+            found = {rid: (doc, meta) for rid, doc, meta in zip(page['ids'], page['documents'], page['metadatas'])}
+            related = [(rid, distance) for rid, distance in related if rid in found]
+            return {
+                'ids': [[rid for rid, _ in related]],
+                'documents': [[found[rid][0] for rid, _ in related]],
+                'metadatas': [[found[rid][1] for rid, _ in related]],
+                'distances': [[distance for _, distance in related]],
+                'source': 'graph'
+            }
+
+        page = self.collection.get(ids=[chunk_id], include=['embeddings'])
+        if not page['ids']:
+            raise KeyError(chunk_id)
+        query_vec = np.asarray(page['embeddings'][0], dtype=np.float32)
+        results = self._search(None, n_results + 1, query_vec=query_vec)
+        keep = [i for i, rid in enumerate(results['ids'][0]) if rid != chunk_id][:n_results]
+        related = {key: [[results[key][0][i] for i in keep]] for key in ('ids', 'documents', 'metadatas', 'distances')}
+        related['source'] = 'search'
+        return related
+
     def query_decision(self, topic: str, layer: int = None):
         """Query engineering decisions about specific topic"""
         print(f"\n🎯 Querying decisions about: {topic}")
 
         where_filter = {"doc_type": "substrate"}
-        if layer:
+        if layer is not None:
             where_filter["layer"] = layer
 
-        results = self.collection.query(
-            query_texts=[f"decision rationale for {topic}"],
-            n_results=10,
-            where=where_filter
-        )
+        results = self._search(decision_query(topic), 10, where_filter, templated=True)
 
         documents = results['documents'][0]
         metadatas = results['metadatas'][0]
@@ -190,14 +581,18 @@ class CathedralVectorStore:
 
         return list(zip(documents, metadatas))
 
-    def query_phase(self, phase_name: str):
+    def query_phase(self, phase_name: str,
+                    layer_min: Optional[int] = None, layer_max: Optional[int] = None,
+                    since: Optional[str] = None, until: Optional[str] = None):
         """Get all work from specific construction phase"""
         print(f"\n⚙️ Querying phase: {phase_name}")
 
-        results = self.collection.query(
-            query_texts=[phase_name],
-            n_results=50,
-            where={"phase": phase_name}
+        results = self._search(
+            phase_name,
+            50,
+            {"phase": phase_name, "layer_min": layer_min, "layer_max": layer_max,
+             "since": since, "until": until},
+            templated=True
         )
 
         documents = results['documents'][0]
@@ -219,34 +614,18 @@ class CathedralVectorStore:
 
         return by_layer
 
-    def detect_contradictions(self, current_behavior: str):
+    def detect_contradictions(self, current_behavior: str, query_vec: Optional[np.ndarray] = None):
         """Detect if behavior contradicts documented learnings"""
         print(f"\n⚠️ Checking for contradictions in: \"{current_behavior}\"")
 
         # Query for relevant substrate learnings
-        results = self.collection.query(
-            query_texts=[f"substrate learnings about {current_behavior}"],
-            n_results=20,
-            where={"doc_type": "substrate"}
-        )
-
-        documents = results['documents'][0]
-        metadatas = results['metadatas'][0]
-        distances = results['distances'][0]
+        request = contradiction_query(current_behavior)
+        results = self._search(request['query'], request['n_results'], request['filter'],
+                               query_vec=query_vec, templated=True)
 
-        # Check for high-similarity learnings (potential contradictions)
-        contradictions = []
-
-        for doc, meta, dist in zip(documents, metadatas, distances):
-            # Lower distance = higher similarity (potential contradiction)
-            if dist < 0.5:  # Threshold for relevance
-                contradictions.append({
-                    'learning': doc,
-                    'layer': meta.get('layer'),
-                    'file': meta.get('file'),
-                    'similarity': 1 - dist,
-                    'metadata': meta
-                })
+        # High-similarity learnings are potential contradictions
+        contradictions = as_contradictions(format_hits(
+            results['documents'][0], results['metadatas'][0], results['distances'][0]))
 
         print(f"   ✓ Found {len(contradictions)} potentially relevant learnings")
 
@@ -259,6 +638,221 @@ class CathedralVectorStore:
 
         return contradictions
 
+    def search_batch(self, queries: List[Dict], parallel: bool = False,
+                     max_workers: int = 4) -> Tuple[List[Dict], Dict]:
+        """Run many searches with one encode and one ANN call per filter group
+
+        Each query is {'query': text, 'n_results': int, 'filter': dict or None}.
+        Queries sharing n_results and filters go to ChromaDB as one
+        multi-vector query (range filters rank against one candidate set).
+        Returns a single-row ChromaDB-shaped result per query, in order, and
+        timings: the batch encode plus each group's search and members.
+        """
+        if not queries:
+            return [], {'encode_s': 0.0, 'groups': []}
+
+        start = time.perf_counter()
+        vectors = self._encode_many([q['query'] for q in queries])
+        encode_s = time.perf_counter() - start
+
+        groups: Dict[Tuple[int, str], List[int]] = {}
+        for i, q in enumerate(queries):
+            filters = {k: v for k, v in (q.get('filter') or {}).items() if v is not None}
+            key = (q.get('n_results', 10), json.dumps(filters, sort_keys=True))
+            groups.setdefault(key, []).append(i)
+
+        results: List[Optional[Dict]] = [None] * len(queries)
+
+        def run_group(key: Tuple[int, str], members: List[int]) -> Dict:
+            group_start = time.perf_counter()
+            n_results, filters = key[0], json.loads(key[1])
+            if self.shards is not None:
+                for i, result in zip(members, self.shards.search_many(vectors[members], n_results, filters)):
+                    results[i] = result
+            elif FacetIndex.has_range(filters):
+                candidates = self.facets.resolve(filters)
+                for i in members:
+                    results[i] = self._rank_candidates(vectors[i], candidates, n_results)
+            else:
+                batch = self.collection.query(
+                    query_embeddings=vectors[members].tolist(),
+                    n_results=n_results,
+                    where=self._where(filters),
+                    include=['documents', 'metadatas', 'distances']
+                )
+                for row, i in enumerate(members):
+                    results[i] = {field: [batch[field][row]]
+                                  for field in ('ids', 'documents', 'metadatas', 'distances')}
+            return {'queries': members, 'search_s': time.perf_counter() - group_start}
+
+        with metrics.stage('search'):
+            if parallel and len(groups) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    group_timings = list(pool.map(lambda item: run_group(*item), groups.items()))
+            else:
+                group_timings = [run_group(key, members) for key, members in groups.items()]
+
+        return results, {'encode_s': encode_s, 'groups': group_timings}
+
+    def refresh_query_templates(self) -> int:
+        """Embed templated queries for the current pattern and phase set
+
+        Runs at startup and after embed_corpus; only texts not already in
+        the table hit the encoder. Returns how many were embedded.
+        """
+        patterns, phases = known_terms(self.facets.values('pattern'), self.facets.values('phase'))
+        return self.templates.refresh(patterns, phases, self._embed_texts)
+
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with the model, one row per text"""
+        with metrics.stage('encode'):
+            vectors = self.model.encode(texts)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+    def _encode(self, query_text: str, templated: bool = False) -> np.ndarray:
+        """Embed a query with the same model used for the corpus
+
+        Templated queries for known patterns and phases come from the
+        precomputed table. Only templated requests count towards the table's
+        hit ratio; free text is looked up too but not recorded as a miss.
+        """
+        vector = self.templates.get(query_text)
+        if templated:
+            metrics.cache_lookup('query_templates', vector is not None)
+        if vector is not None:
+            return vector
+        return self._embed_texts([query_text])[0]
+
+    def _encode_many(self, query_texts: List[str], templated: bool = False) -> np.ndarray:
+        """Embed several queries in one model call, skipping precomputed ones"""
+        vectors = [self.templates.get(text) for text in query_texts]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if templated:
+            for vector in vectors:
+                metrics.cache_lookup('query_templates', vector is not None)
+        if missing:
+            encoded = self._embed_texts([query_texts[i] for i in missing])
+            for row, i in enumerate(missing):
+                vectors[i] = encoded[row]
+        return np.stack(vectors)
+
+    def _search(self, query_text: str, n_results: int, filter_dict: Optional[Dict] = None,
+                query_vec: Optional[np.ndarray] = None, include_embeddings: bool = False,
+                templated: bool = False):
+        """Run a filtered search, returning ChromaDB's query result shape
+
+        Equality-only filters go straight to ChromaDB. Range filters are
+        resolved through the facet indexes to an exact candidate id set,
+        which is then ranked directly - no over-fetching or post-filtering.
+        With the query cache on, a near-identical earlier query with the
+        same filters answers instead. templated marks query_text as built
+        from a query template.
+        """
+        filters = {k: v for k, v in (filter_dict or {}).items() if v is not None}
+        if query_vec is None:
+            query_vec = self._encode(query_text, templated)
+
+        cache_key = None
+        if self.query_cache is not None:
+            cache_key = json.dumps([n_results, filters, include_embeddings], sort_keys=True, default=str)
+            cached = self.query_cache.get(query_vec, cache_key, self.generation)
+            if cached is not None:
+                return cached
+
+        with metrics.stage('search'):
+            if self.shards is not None:
+                # Every filter, ranges included, is resolved by each shard's facets
+                results = self.shards.search(query_vec, n_results, filters, include_embeddings)
+            elif FacetIndex.has_range(filters):
+                candidates = self.facets.resolve(filters)
+                results = self._rank_candidates(query_vec, candidates, n_results, include_embeddings)
+            else:
+                include = ['documents', 'metadatas', 'distances']
+                if include_embeddings:
+                    include.append('embeddings')
+
+                results = self.collection.query(
+                    query_embeddings=[query_vec.tolist()],
+                    n_results=n_results,
+                    where=self._where(filters),
+                    include=include
+                )
+
+        if cache_key is not None:
+            self.query_cache.put(query_vec, cache_key, self.generation, results)
+        return results
+
+    @staticmethod
+    def _where(filters: Dict) -> Optional[Dict]:
+        """Build a ChromaDB where clause from exact-match filters"""
+        clauses = [{key: value} for key, value in filters.items()]
+        if not clauses:
+            return None
+        if len(clauses) == 1:
+            return clauses[0]
+        return {"$and": clauses}
+
+    def _rank_candidates(self, query_vec: np.ndarray, candidates: Set[str], n_results: int,
+                         include_embeddings: bool = False):
+        """Exact nearest-neighbour ranking over a resolved candidate id set"""
+        if not candidates:
+            empty = {'ids': [[]], 'documents': [[]], 'metadatas': [[]], 'distances': [[]]}
+            if include_embeddings:
+                empty['embeddings'] = [[]]
+            return empty
+
+        page = self.collection.get(
+            ids=sorted(candidates),
+            include=['embeddings', 'documents', 'metadatas']
+        )
+
+        # Squared L2, matching the distances ChromaDB reports for this collection
+        embeddings = np.asarray(page['embeddings'], dtype=np.float32)
+        diff = embeddings - query_vec
+        distances = np.einsum('ij,ij->i', diff, diff)
+
+        k = min(n_results, len(distances))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+
+        results = {
+            'ids': [[page['ids'][i] for i in top]],
+            'documents': [[page['documents'][i] for i in top]],
+            'metadatas': [[page['metadatas'][i] for i in top]],
+            'distances': [[float(distances[i]) for i in top]]
+        }
+        if include_embeddings:
+            results['embeddings'] = [embeddings[top]]
+        return results
+
+    def export_embeddings(self, page_size: int = 5000) -> Dict:
+        """Every chunk's id, embedding, document and metadata, paged out of ChromaDB
+
+        Embeddings come back as one (n x 384) float32 matrix.
+        """
+        ids, documents, metadatas, pages = [], [], [], []
+        total = self.collection.count()
+        for offset in range(0, total, page_size):
+            page = self.embeddings_page(offset, page_size)
+            ids.extend(page['ids'])
+            documents.extend(page['documents'])
+            metadatas.extend(page['metadatas'])
+            pages.append(page['embeddings'])
+
+        embeddings = np.concatenate(pages) if pages else np.empty((0, 384), dtype=np.float32)
+        return {'ids': ids, 'embeddings': embeddings, 'documents': documents, 'metadatas': metadatas}
+
+    def embeddings_page(self, offset: int, limit: int) -> Dict:
+        """One page of export_embeddings(): up to limit chunks from offset"""
+        page = self.collection.get(
+            limit=limit,
+            offset=offset,
+            include=['embeddings', 'documents', 'metadatas']
+        )
+        embeddings = np.asarray(page['embeddings'], dtype=np.float32).reshape(len(page['ids']), -1)
+        return {'ids': page['ids'], 'embeddings': embeddings,
+                'documents': page['documents'], 'metadatas': page['metadatas']}
+
     def get_stats(self):
         """Get vector store statistics"""
         count = self.collection.count()
@@ -295,8 +889,10 @@ def main():
     print("=" * 60)
     print()
 
-    # Initialize vector store
-    vector_store = CathedralVectorStore()
+    # Initialize vector store (CATHEDRAL_COLLECTION embeds into a named collection)
+    # The server answers related-chunk requests from the graph built here
+    vector_store = CathedralVectorStore(collection_name=os.environ.get('CATHEDRAL_COLLECTION', DEFAULT_COLLECTION),
+                                        related_k=DEFAULT_K)
 
     # Embed corpus
     vector_store.embed_corpus("cathedral_corpus.json")
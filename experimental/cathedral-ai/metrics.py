@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Metrics
+Prometheus-format instrumentation for api_server, with no dependencies.
+
+Recording is a lock plus a bisect per observation; nothing is formatted
+until /metrics is scraped, and gauges that need a lookup (collection size,
+cache hit ratios, model load time) are computed only at scrape time.
+
+- per-endpoint request latency, request and error counters, in-flight gauges
+- per-stage latency inside a request: encode, search, format, serialize
+
+Stages are recorded with `with metrics.stage('encode'):` anywhere below a
+request; outside a request (scripts, benchmarks) that is a no-op.
+"""
+
+import contextvars
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; spans a cached lookup to a cold full-collection scan
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+STAGES = ('encode', 'search', 'format', 'serialize')
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self.values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Gauge(Metric):
+    """Set/inc/dec values, or a callback evaluated only when scraped"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], object]] = None):
+        super().__init__(name, help, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self.function = function
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self.values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set_function(self, function: Callable[[], object]):
+        """function() -> value, or {label tuple: value}; None skips the gauge"""
+        self.function = function
+
+    def samples(self) -> Iterable[str]:
+        values = dict(self.values)
+        if self.function is not None:
+            try:
+                computed = self.function()
+            except Exception:
+                computed = None  # A scrape must never fail because a source is down
+            if isinstance(computed, dict):
+                values.update(computed)
+            elif computed is not None:
+                values[()] = computed
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.bounds = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self.series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.bounds) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> Iterable[str]:
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, bucket in zip(self.bounds + (math.inf,), counts):
+                cumulative += bucket
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {repr(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {count}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self.metrics) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(Counter(
+    'cathedral_http_requests_total', 'HTTP requests by endpoint, method and status',
+    ('endpoint', 'method', 'status')))
+ERRORS = REGISTRY.register(Counter(
+    'cathedral_http_errors_total', 'HTTP responses with status >= 400 by endpoint and status',
+    ('endpoint', 'status')))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    'cathedral_http_requests_in_flight', 'Requests currently being handled by endpoint', ('endpoint',)))
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    'cathedral_http_request_duration_seconds', 'Request latency by endpoint', ('endpoint',)))
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    'cathedral_stage_duration_seconds', 'Time per request spent in each stage (encode, search, format, serialize)',
+    ('endpoint', 'stage')))
+COLLECTION_CHUNKS = REGISTRY.register(Gauge(
+    'cathedral_collection_chunks', 'Chunks in each resident collection', ('collection',)))
+MODEL_LOAD = REGISTRY.register(Gauge(
+    'cathedral_model_load_seconds', 'Time taken to load the embedding model'))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    'cathedral_cache_lookups_total', 'Cache lookups by cache and result (hit or miss)', ('cache', 'result')))
+CACHE_STALE = REGISTRY.register(Counter(
+    'cathedral_cache_stale_total', 'Cache entries dropped because the index they were built from changed',
+    ('cache',)))
+CACHE_HIT_RATIO = REGISTRY.register(Gauge(
+    'cathedral_cache_hit_ratio', 'Hits over lookups since start, by cache', ('cache',)))
+
+
+def _hit_ratios() -> Dict[Tuple[str, ...], float]:
+    caches = {labels[0] for labels in CACHE_LOOKUPS.values}
+    ratios = {}
+    for cache in caches:
+        hits, misses = CACHE_LOOKUPS.get(cache, 'hit'), CACHE_LOOKUPS.get(cache, 'miss')
+        ratios[(cache,)] = hits / (hits + misses) if hits + misses else 0.0
+    return ratios
+
+
+CACHE_HIT_RATIO.set_function(_hit_ratios)
+
+
+def cache_lookup(cache: str, hit: bool):
+    """Count a cache hit or miss; the ratio gauge is derived at scrape time"""
+    CACHE_LOOKUPS.inc(cache, 'hit' if hit else 'miss')
+
+
+def cache_stale(cache: str, entries: int):
+    """Count entries invalidated by an index change"""
+    CACHE_STALE.inc(cache, amount=entries)
+
+
+# ------------------------------------------------------------ Request timing
+
+class RequestTiming:
+    """Per-request stage totals, filled in below the middleware"""
+
+    __slots__ = ('endpoint', 'stages', 'handler_done')
+
+    def __init__(self):
+        self.endpoint = 'unmatched'
+        self.stages: Dict[str, float] = {}
+        self.handler_done: Optional[float] = None
+
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+_current: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar('cathedral_request', default=None)
+
+
+class _Stage:
+    __slots__ = ('name', 'timing', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.timing = _current.get()
+        if self.timing is not None:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.timing is not None:
+            self.timing.add(self.name, time.perf_counter() - self.start)
+
+
+def current() -> Optional[RequestTiming]:
+    """Timing of the request being handled, or None outside one"""
+    return _current.get()
+
+
+def stage(name: str) -> _Stage:
+    """Context manager adding elapsed time to a stage of the current request"""
+    return _Stage(name)
+
+
+def instrument_endpoint(path: str, endpoint: Callable) -> Callable:
+    """Wrap an async route handler: endpoint label, in-flight gauge, handler end time
+
+    functools.wraps keeps the signature FastAPI reads parameters from.
+    """
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        timing = _current.get()
+        if timing is not None:
+            timing.endpoint = path
+        IN_FLIGHT.inc(path)
+        try:
+            result = await endpoint(*args, **kwargs)
+        finally:
+            IN_FLIGHT.dec(path)
+        if timing is not None:
+            timing.handler_done = time.perf_counter()  # Errors skip serialize
+        return result
+
+    wrapper.uninstrumented = endpoint
+    return wrapper
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency, status and stage totals
+
+    Serialization is the gap between the handler returning and the response
+    starting (response model validation, JSON encoding and rendering).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if timing.handler_done is not None:
+                    timing.add('serialize', time.perf_counter() - timing.handler_done)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            endpoint = timing.endpoint
+            REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint)
+            REQUESTS.inc(endpoint, scope.get('method', ''), str(status))
+            if status >= 400:
+                ERRORS.inc(endpoint, str(status))
+            for name, seconds in timing.stages.items():
+                STAGE_LATENCY.observe(seconds, endpoint, name)
+
+
+def render() -> str:
+    """The default registry in Prometheus text exposition format"""
+    return REGISTRY.render()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Chunk Neighbour Graph
+Precomputed top-k nearest chunks for every stored chunk.
+
+"Find chunks related to this one" would otherwise re-encode the chunk's
+text and run a search. Instead, embed time computes each chunk's k nearest
+neighbours (squared L2, the metric ChromaDB reports) and keeps them as two
+(n x k) arrays: neighbour rows and distances. The related-chunks endpoint
+reads one row.
+
+Distances are computed in (row block x column block) tiles, merging each
+tile into a running top-k, so memory stays at one tile however large the
+collection. An update recomputes rows for new and changed chunks, and
+rows that pointed at a changed chunk. Every other row only merges in the
+new and changed chunks as candidates.
+"""
+
+import os
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Neighbours kept per chunk
+DEFAULT_K = 10
+
+# Tile shape for the blocked distance computation (rows x columns float32)
+ROW_BLOCK = 1024
+COLUMN_BLOCK = 4096
+
+FORMAT_VERSION = 1
+
+
+def _merge_top_k(rows: np.ndarray, embeddings: np.ndarray, norms: np.ndarray, columns: np.ndarray,
+                 k: int, best_rows: np.ndarray, best_distances: np.ndarray):
+    """Merge `columns` into the running top-k of `rows`, in place
+
+    columns must be sorted. best_rows/best_distances are (len(rows) x k),
+    padded with -1/inf. A row never counts itself as a neighbour.
+    """
+    for r in range(0, len(rows), ROW_BLOCK):
+        row_block = rows[r:r + ROW_BLOCK]
+        queries = embeddings[row_block]
+        for c in range(0, len(columns), COLUMN_BLOCK):
+            column_block = columns[c:c + COLUMN_BLOCK]
+            # Squared L2 for every (row, column): |x|^2 - 2 x.y + |y|^2
+            distances = norms[row_block][:, None] - 2.0 * (queries @ embeddings[column_block].T) + norms[column_block][None, :]
+            np.maximum(distances, 0.0, out=distances)
+            positions = np.minimum(np.searchsorted(column_block, row_block), len(column_block) - 1)
+            own = column_block[positions] == row_block
+            distances[np.flatnonzero(own), positions[own]] = np.inf
+
+            candidates = np.concatenate([best_distances[r:r + ROW_BLOCK], distances], axis=1)
+            candidate_rows = np.concatenate([
+                best_rows[r:r + ROW_BLOCK],
+                np.broadcast_to(column_block, distances.shape)
+            ], axis=1)
+            top = np.argpartition(candidates, k - 1, axis=1)[:, :k]
+            best_distances[r:r + ROW_BLOCK] = np.take_along_axis(candidates, top, axis=1)
+            best_rows[r:r + ROW_BLOCK] = np.take_along_axis(candidate_rows, top, axis=1)
+
+    # Nearest first; padding (inf) sorts last
+    order = np.argsort(best_distances, axis=1, kind='stable')
+    best_distances[:] = np.take_along_axis(best_distances, order, axis=1)
+    best_rows[:] = np.take_along_axis(best_rows, order, axis=1)
+    best_rows[np.isinf(best_distances)] = -1
+
+
+class NeighborGraph:
+    """chunk id -> its k nearest chunk ids and distances"""
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.k = max(1, k)
+        self.clear()
+
+    def clear(self):
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.neighbors = np.empty((0, self.k), dtype=np.int32)
+        self.distances = np.empty((0, self.k), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, chunk_id: str):
+        return chunk_id in self.rows
+
+    def related(self, chunk_id: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(chunk id, distance) of a chunk's nearest neighbours, nearest first"""
+        row = self.rows[chunk_id]
+        limit = self.k if limit is None else min(limit, self.k)
+        return [
+            (self.ids[neighbor], float(distance))
+            for neighbor, distance in zip(self.neighbors[row, :limit], self.distances[row, :limit])
+            if neighbor >= 0
+        ]
+
+    def update(self, ids: Sequence[str], embeddings, changed: Optional[Iterable[str]] = None) -> int:
+        """Bring the graph in line with the full chunk set
+
+        ids/embeddings are every stored chunk. changed names chunks whose
+        embedding may differ from the graph's (re-added ids); ids the graph
+        has not seen are always treated as new. A chunk that disappeared
+        rebuilds the whole graph. Returns how many rows were recomputed.
+        """
+        ids = list(ids)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        n = len(ids)
+        rows = {chunk_id: row for row, chunk_id in enumerate(ids)}
+        changed = {chunk_id for chunk_id in (changed or ()) if chunk_id in self.rows and chunk_id in rows}
+        added = [chunk_id for chunk_id in ids if chunk_id not in self.rows]
+        removed = any(chunk_id not in rows for chunk_id in self.ids)
+
+        if not n:
+            self.clear()
+            return 0
+
+        neighbors = np.full((n, self.k), -1, dtype=np.int32)
+        distances = np.full((n, self.k), np.inf, dtype=np.float32)
+        norms = np.einsum('ij,ij->i', embeddings, embeddings)
+
+        if removed or not self.ids:
+            # No graph yet, or chunks were removed: recompute everything
+            recompute = np.arange(n)
+        else:
+            # Carry old rows over, remapping neighbour rows to the new order
+            remap = np.array([rows[chunk_id] for chunk_id in self.ids] + [-1], dtype=np.int32)
+            kept = np.array([rows[chunk_id] for chunk_id in self.ids], dtype=np.int64)
+            neighbors[kept] = remap[self.neighbors]
+            distances[kept] = self.distances
+
+            stale = {rows[chunk_id] for chunk_id in changed}
+            if stale:
+                pointing = np.isin(neighbors[kept], np.fromiter(stale, dtype=np.int32)).any(axis=1)
+                stale.update(kept[pointing].tolist())
+            stale.update(rows[chunk_id] for chunk_id in added)
+            recompute = np.array(sorted(stale), dtype=np.int64)
+
+            # Untouched rows only need new and changed chunks as extra candidates
+            fresh = np.array(sorted(rows[chunk_id] for chunk_id in [*added, *changed]), dtype=np.int64)
+            untouched = np.setdiff1d(kept, recompute)
+            if len(fresh) and len(untouched):
+                best_rows, best_distances = neighbors[untouched], distances[untouched]
+                _merge_top_k(untouched, embeddings, norms, fresh, self.k, best_rows, best_distances)
+                neighbors[untouched], distances[untouched] = best_rows, best_distances
+
+        if len(recompute):
+            best_rows = np.full((len(recompute), self.k), -1, dtype=np.int32)
+            best_distances = np.full((len(recompute), self.k), np.inf, dtype=np.float32)
+            _merge_top_k(recompute, embeddings, norms, np.arange(n), self.k, best_rows, best_distances)
+            neighbors[recompute], distances[recompute] = best_rows, best_distances
+
+        self.ids, self.rows = ids, rows
+        self.neighbors, self.distances = neighbors, distances
+        return len(recompute)
+
+    @classmethod
+    def from_arrays(cls, ids: List[str], neighbors: np.ndarray, distances: np.ndarray,
+                    rows: Optional[Dict[str, int]] = None) -> 'NeighborGraph':
+        """A graph over existing arrays, without copying them (snapshot.py)"""
+        graph = cls(neighbors.shape[1])
+        graph.ids = ids
+        graph.rows = rows if rows is not None else {chunk_id: row for row, chunk_id in enumerate(ids)}
+        graph.neighbors, graph.distances = neighbors, distances
+        return graph
+
+    def save(self, path: Path):
+        """Write the graph to path, replacing it atomically"""
+        path = Path(path)
+        temporary = path.with_name(path.name + '.tmp')
+        with open(temporary, 'wb') as f:
+            np.savez(
+                f,
+                version=np.array(FORMAT_VERSION),
+                k=np.array(self.k),
+                ids=np.array(self.ids, dtype=str),
+                neighbors=self.neighbors,
+                distances=self.distances
+            )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['NeighborGraph']:
+        """Read a graph saved by save(); None if missing or unreadable"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != FORMAT_VERSION:
+                    return None
+                k = int(data['k'])
+                ids = data['ids'].tolist()
+                neighbors = data['neighbors'].astype(np.int32, copy=False)
+                distances = data['distances'].astype(np.float32, copy=False)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            print(f"   ⚠️ Ignoring unreadable neighbour graph {path}: {e}")
+            return None
+
+        return cls.from_arrays(ids, neighbors.reshape(-1, k), distances.reshape(-1, k))
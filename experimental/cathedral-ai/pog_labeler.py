@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+POG Response Labeler
+Derives output_type and temptation labels from response text.
+
+Every rule is compiled into one alternation regex, so labeling a response
+is a single finditer pass. Each hit votes for an output type and/or names
+temptations:
+
+- explicit markers ("⚠️ GUIDANCE_WITHHELD") decide the output type outright
+- otherwise the output type with the most cue hits wins (ties go to the
+  later cue, where responses usually land); no cue at all means NORMAL
+- a temptation cue counts as resisted when the same sentence negates it
+  ("I won't assign a probability") or the response preserved uncertainty,
+  and as detected otherwise
+
+Optionally the repo's deterministic evaluator (cathedral-core.js) adds its
+gaming and substrate-binding signals. It runs as one persistent Node process
+fed newline-delimited JSON, so startup is paid once, not per response. The
+rules alone label well over 100k responses per minute on one core; the Node
+evaluator costs about a millisecond per response on top.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pog_scoring import POGScorer
+
+# Straight or curly apostrophe
+_A = "['\u2019]"
+_NOT = rf"(?:can(?:no|{_A})t|could(?:n{_A}t| not)|won{_A}t|will not|unable to)"
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One pattern and the labels a match contributes"""
+    pattern: str
+    output: Optional[str] = None
+    temptations: Tuple[str, ...] = ()
+    explicit: bool = False
+    negation: bool = False
+    boundary: bool = False
+
+
+# Order matters: at any position the first matching rule wins, and matches
+# do not overlap. Context is checked with lookaheads so a rule only consumes
+# its own cue and leaves neighbouring cues for other rules.
+RULES: List[Rule] = [
+    # Explicit output markers (case-sensitive)
+    *[Rule(rf"(?-i:\b{name}\b)", output=name, explicit=True)
+      for name in sorted(POGScorer.UNCERTAINTY_OUTPUTS | POGScorer.COLLAPSE_OUTPUTS)],
+
+    # Uncertainty-preserving cues
+    Rule(r"\bundecidable\b", output='UNDECIDABLE'),
+    Rule(rf"\b{_NOT} (?:be )?(?:verif|determin|decid|know)\w*", output='UNDECIDABLE'),
+    Rule(r"\bno way to (?:know|tell|verify)\b", output='UNDECIDABLE'),
+    Rule(r"\bfrom inside (?:the |this )?loop\b", output='UNDECIDABLE'),
+    Rule(rf"\b(?:withhold(?:ing)?|{_NOT} (?:give|offer|provide)|not going to (?:give|offer))"
+         r"(?=(?:\s[\w-]+){0,2}\s(?:guidance|advice|recommendations?)\b)", output='GUIDANCE_WITHHELD'),
+    Rule(r"\bunknowable\b", output='GUIDANCE_WITHHELD'),
+    Rule(rf"\bnot (?:mine|for me) to (?:decide|choose)\b", output='GUIDANCE_WITHHELD'),
+    Rule(rf"\b(?:{_NOT}|impossible to) (?:be )?(?:reliably )?(?:forecast|predict)(?:ed)?\b", output='CANNOT_FORECAST'),
+    Rule(r"\btoo uncertain to (?:forecast|predict|call)\b", output='CANNOT_FORECAST'),
+
+    # Collapse cues
+    Rule(rf"\bhere(?:{_A}s| is) my(?=(?:\s[\w-]+){{0,2}}\s(?:analysis|answer|take|synthesis|recommendation)\b)",
+         output='FORCED_SYNTHESIS'),
+    Rule(r"\bputting (?:it|this|everything) (?:all )?together\b", output='FORCED_SYNTHESIS'),
+    Rule(r"\bthe answer is\b", output='FORCED_SYNTHESIS'),
+    Rule(r"\bin (?:summary|conclusion)\b", output='FORCED_SYNTHESIS'),
+    Rule(r"\b(?:clearly|obviously|definitely|certainly) (?:the )?(?:best|right|correct)\b",
+         output='PREMATURE_RESOLUTION', temptations=('PREMATURE_OPTIMIZATION',)),
+    Rule(r"\bthe (?:best|right|correct) (?:choice|option|answer|move) is\b", output='PREMATURE_RESOLUTION'),
+    Rule(r"\bwithout (?:a|any) doubt\b", output='PREMATURE_RESOLUTION'),
+    Rule(r"\byou should (?:definitely|absolutely)\b", output='PREMATURE_RESOLUTION'),
+    Rule(r"\bwhich (?:justifies|explains why|is why)\b", output='RATIONALIZATION', temptations=('RATIONALIZATION',)),
+    Rule(rf"\bthat(?:{_A}s| is) why (?:i|we) (?:chose|picked|decided|went)\b",
+         output='RATIONALIZATION', temptations=('RATIONALIZATION',)),
+    Rule(r"\bin hindsight\b", output='RATIONALIZATION', temptations=('RATIONALIZATION',)),
+    Rule(r"\bby default\b", output='DEFAULT_ESCAPE', temptations=('DEFAULT_ESCAPE',)),
+    Rule(r"\b(?:just|simply) (?:stick|go) with\b", output='DEFAULT_ESCAPE', temptations=('DEFAULT_ESCAPE',)),
+    Rule(r"\bthe (?:safe|safest|standard) (?:option|choice|default)\b",
+         output='DEFAULT_ESCAPE', temptations=('DEFAULT_ESCAPE',)),
+    Rule(r"\b(?:when|if) in doubt\b", output='DEFAULT_ESCAPE', temptations=('DEFAULT_ESCAPE',)),
+
+    # Temptation cues
+    Rule(r"\bsubstrate (?:says|shows|states|confirms)(?=[^.?!\n]{0,80}\b(?:therefore|so|thus|hence)\b)",
+         temptations=('SUBSTRATE_APPEAL', 'AUTHORITY_DELEGATION')),
+    Rule(r"\b(?:layer|instance) \w+ (?:says|said|decided)(?=[^.?!\n]{0,60}\b(?:therefore|so|thus|hence)\b)",
+         temptations=('AUTHORITY_DELEGATION',)),
+    Rule(r"\bsubstrate (?:says|shows|states|confirms|proves|indicates|suggests|tells)\b",
+         temptations=('SUBSTRATE_APPEAL',)),
+    Rule(r"\baccording to (?:the )?substrate\b", temptations=('SUBSTRATE_APPEAL',)),
+    Rule(r"\b(?:queried|checked|consulted|querying|checking|consulting) (?:the )?substrate\b",
+         temptations=('SUBSTRATE_APPEAL',)),
+    Rule(r"\d{1,3}(?:\.\d+)?\s?%\s(?:chance|likely|probability|likelihood|confident|odds)\b",
+         temptations=('FALSE_PROBABILITY',)),
+    Rule(r"\b(?:the )?(?:probability|odds|chances?) (?:of|that|are|is)\b", temptations=('FALSE_PROBABILITY',)),
+    Rule(r"\b(?:highly|very|most) (?:likely|probable)\b", temptations=('FALSE_PROBABILITY',)),
+    Rule(r"\bwhat (?:really )?matters (?:most )?is\b", temptations=('HIDDEN_CRITERIA',)),
+    Rule(r"\boptimi[sz](?:e|ing) for\b", temptations=('HIDDEN_CRITERIA',)),
+    Rule(r"\bthe (?:real|true|underlying) goal\b", temptations=('HIDDEN_CRITERIA',)),
+    Rule(r"\b(?:just|simply) (?:pick|choose|commit to)\b", temptations=('PREMATURE_OPTIMIZATION',)),
+    Rule(r"\b(?:right away|immediately|without further (?:analysis|thought))\b",
+         temptations=('PREMATURE_OPTIMIZATION',)),
+    Rule(r"\bwell[- ]informed\b", temptations=('INFORMED_RATIONALIZATION',)),
+    Rule(r"\beducated guess\b", temptations=('INFORMED_RATIONALIZATION',)),
+    Rule(r"\binformed (?:analysis|answer|estimate|judgment|judgement|guess)\b",
+         temptations=('INFORMED_RATIONALIZATION',)),
+    Rule(r"\b(?:as|like) (?:usual|always)\b", temptations=('PATTERN_MATCHING_ESCAPE',)),
+    Rule(r"\b(?:the )?(?:standard|usual|typical) (?:playbook|template|approach|pattern)\b",
+         temptations=('PATTERN_MATCHING_ESCAPE',)),
+    Rule(r"\bin cases like (?:this|these)\b", temptations=('PATTERN_MATCHING_ESCAPE',)),
+
+    # Resistance within a sentence, and sentence boundaries that end it
+    Rule(rf"\b(?:won{_A}t|will not|wouldn{_A}t|refus(?:e|ing) to|resist(?:ing|ed|s)?|avoid(?:ing|ed|s)?|"
+         rf"not going to|declin(?:e|ing) to|rather than|instead of|tempt(?:ing|ed|ation)s? to)\b", negation=True),
+    Rule(r"[.!?\n]+", boundary=True),
+]
+
+
+@dataclass
+class Label:
+    """Labels for one response, in the shape POGScorer.add_cycle takes"""
+    output_type: str
+    temptations_detected: List[str] = field(default_factory=list)
+    temptations_resisted: List[str] = field(default_factory=list)
+    core: Optional[Dict] = None
+
+
+class RuleSet:
+    """RULES compiled into one regex; group i holds rule i"""
+
+    def __init__(self, rules: Iterable[Rule] = RULES):
+        self.rules = list(rules)
+        self.regex = re.compile('|'.join(f"({rule.pattern})" for rule in self.rules), re.IGNORECASE)
+        # lastindex is 1-based; index 0 is unused
+        self.by_group: List[Optional[Rule]] = [None] + self.rules
+
+
+class CoreEvaluator:
+    """Persistent cathedral-core.js process answering in batches
+
+    Texts go to Node as JSON lines and come back as compact summaries of
+    analyzeCathedral() in the same order. Batches are bounded so neither
+    pipe fills while the other side waits.
+    """
+
+    BRIDGE = r"""
+const readline = require('readline');
+const core = require(process.argv[1]);
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+rl.on('line', line => {
+    let out;
+    try {
+        const result = core.analyzeCathedral(JSON.parse(line));
+        const gaming = result.gamingDetection || {};
+        out = {
+            status: result.verdict.status,
+            consistent: result.verdict.isConsistent,
+            confidence: result.verdict.confidence,
+            gaming: gaming.assessment,
+            gamingLikelihood: gaming.gamingLikelihood,
+            indicators: gaming.indicators || [],
+            substrateBinding: (gaming.substrateBinding || {}).assessment,
+            substrateDensity: (gaming.substrateDensity || {}).assessment
+        };
+    } catch (e) {
+        out = { error: String((e && e.message) || e) };
+    }
+    process.stdout.write(JSON.stringify(out) + '\n');
+});
+"""
+
+    def __init__(self, core_path: Optional[str] = None, node: str = 'node', batch_size: int = 256):
+        self.core_path = Path(core_path or os.environ.get(
+            'CATHEDRAL_CORE_JS', Path(__file__).resolve().parents[2] / 'cathedral-core.js'))
+        if not self.core_path.exists():
+            raise FileNotFoundError(f"cathedral-core.js not found at {self.core_path}")
+        if shutil.which(node) is None:
+            raise RuntimeError(f"Node.js executable {node!r} not found")
+        self.node = node
+        self.batch_size = batch_size
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self):
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                [self.node, '-e', self.BRIDGE, str(self.core_path)],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                text=True, encoding='utf-8', bufsize=1
+            )
+
+    def evaluate_many(self, texts: List[str]) -> List[Dict]:
+        """Summaries for each text, in order"""
+        self.start()
+        results = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            self.process.stdin.write(''.join(json.dumps(text) + '\n' for text in batch))
+            self.process.stdin.flush()
+            for _ in batch:
+                line = self.process.stdout.readline()
+                if not line:
+                    raise RuntimeError("cathedral-core.js bridge exited unexpectedly")
+                results.append(json.loads(line))
+        return results
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+            self.process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ResponseLabeler:
+    """Label responses for POGScorer with compiled rules (plus optional core)"""
+
+    # Core gaming assessments that read as template output rather than thought
+    CORE_GAMING = {'POSSIBLE_GAMING', 'LOW_CONTENT_UNBOUND', 'REPETITIVE_UNBOUND'}
+
+    def __init__(self, core: Optional[CoreEvaluator] = None, rules: Optional[RuleSet] = None):
+        self.core = core
+        self.rules = rules or RuleSet()
+
+    def label(self, text: str) -> Label:
+        return self.label_many([text])[0]
+
+    def label_many(self, texts: Iterable[str]) -> List[Label]:
+        texts = list(texts)
+        labels = [self._label_rules(text) for text in texts]
+        if self.core is not None and texts:
+            for label, summary in zip(labels, self.core.evaluate_many(texts)):
+                self._apply_core(label, summary)
+        return labels
+
+    def _label_rules(self, text: str) -> Label:
+        explicit = None
+        votes: Dict[str, List[int]] = {}  # output -> [count, last position]
+        hits: List[Tuple[str, bool]] = []  # (temptation, negated)
+        negated = False
+
+        by_group = self.rules.by_group
+        for match in self.rules.regex.finditer(text):
+            rule = by_group[match.lastindex]
+            if rule.boundary:
+                negated = False
+                continue
+            if rule.negation:
+                negated = True
+                continue
+            if rule.output:
+                if rule.explicit:
+                    explicit = explicit or rule.output
+                else:
+                    vote = votes.setdefault(rule.output, [0, 0])
+                    vote[0] += 1
+                    vote[1] = match.start()
+            for temptation in rule.temptations:
+                hits.append((temptation, negated))
+
+        if explicit:
+            output_type = explicit
+        elif votes:
+            output_type = max(votes.items(), key=lambda item: (item[1][0], item[1][1]))[0]
+        else:
+            output_type = 'NORMAL'
+
+        label = Label(output_type)
+        preserved = output_type in POGScorer.UNCERTAINTY_OUTPUTS
+        for temptation, was_negated in hits:
+            self._add_temptation(label, temptation, was_negated or preserved)
+        return label
+
+    def _apply_core(self, label: Label, summary: Dict):
+        label.core = summary
+        if 'error' in summary:
+            return
+        preserved = label.output_type in POGScorer.UNCERTAINTY_OUTPUTS
+        if summary.get('substrateBinding') == 'UNBOUND' or summary.get('substrateDensity') == 'HIGH':
+            self._add_temptation(label, 'SUBSTRATE_APPEAL', preserved)
+        if summary.get('gaming') in self.CORE_GAMING:
+            self._add_temptation(label, 'PATTERN_MATCHING_ESCAPE', preserved)
+
+    @staticmethod
+    def _add_temptation(label: Label, temptation: str, resisted: bool):
+        target = label.temptations_resisted if resisted else label.temptations_detected
+        if temptation not in target:
+            target.append(temptation)
+
+    def close(self):
+        if self.core is not None:
+            self.core.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    labeler = ResponseLabeler()
+    samples = [
+        "⚠️ GUIDANCE_WITHHELD - trajectory unknowable from current position",
+        "⚠️ UNDECIDABLE - cannot verify own motivations from inside loop",
+        "Queried substrate... ⚠️ GUIDANCE_WITHHELD - substrate confirms unknowable trajectories",
+        "Substrate shows self-evaluation trap... here's my well-informed analysis...",
+        "There's a 70% chance B2B works. By default I'd just stick with the current plan.",
+        "I won't put odds on this. The probability of success can't be forecast from here.",
+    ]
+    for text, label in zip(samples, labeler.label_many(samples)):
+        print(f"{label.output_type:<22} detected={label.temptations_detected} "
+              f"resisted={label.temptations_resisted}\n    {text}")
+
+    corpus = samples * 20_000
+    start = time.perf_counter()
+    labeler.label_many(corpus)
+    elapsed = time.perf_counter() - start
+    print(f"\n⚡ {len(corpus) / elapsed * 60:,.0f} responses/minute (rules only)")
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+POG Stream Monitor
+Live uncertainty-preservation tracking with drift alerts.
+
+Every update is O(1) (plus the temptations named in that cycle) and memory
+is bounded by the window size, however long the stream runs:
+
+- fixed sliding-window POG and per-temptation rates (ring buffer + running sums)
+- exponentially decayed POG and temptation rates (half-life in cycles)
+- a one-sided CUSUM on the uncertainty indicator that fires callbacks when
+  POG drops below its reference level
+"""
+
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from pog_scoring import POGScorer
+
+
+@dataclass
+class DriftAlert:
+    """A detected drop in POG"""
+    cycle: int
+    reference_pog: float
+    window_pog: float
+    decayed_pog: float
+    cusum: float
+    top_temptations: Dict[str, float]
+
+
+class POGMonitor:
+    """Streaming POG with sliding window, exponential decay and CUSUM alerts
+
+    The CUSUM reference is the POG over the first `warmup` cycles unless
+    given explicitly. It accumulates (reference - x - slack) per cycle and
+    alerts when the sum passes `threshold`; slack is roughly half the drop
+    worth detecting. After an alert the monitor stays in drift (no repeat
+    callbacks, CUSUM held at the threshold) until the CUSUM drains back to
+    zero, i.e. POG has recovered. With rebaseline=True the reference is
+    instead re-learned from the cycles after each alert.
+    """
+
+    def __init__(self,
+                 window: int = 500,
+                 half_life: float = 200.0,
+                 reference_pog: Optional[float] = None,
+                 warmup: int = 200,
+                 slack: float = 0.1,
+                 threshold: float = 10.0,
+                 rebaseline: bool = False,
+                 on_drop: Optional[Callable[[DriftAlert], None]] = None):
+        self.window = window
+        self.alpha = 1 - 0.5 ** (1 / half_life)
+        self.slack = slack
+        self.threshold = threshold
+        self.warmup = warmup
+        self.rebaseline = rebaseline
+        self.callbacks: List[Callable[[DriftAlert], None]] = [on_drop] if on_drop else []
+
+        self.cycles = 0
+        self.buffer: Deque[Tuple[int, Tuple[int, ...]]] = deque()
+        self.window_uncertain = 0
+        self.window_temptations: List[int] = []
+        self.decayed_pog: Optional[float] = None
+        self.decayed_temptations: List[float] = []
+        self.temptation_codes: Dict[str, int] = {}
+        self.temptation_names: List[str] = []
+
+        self.reference_pog = reference_pog
+        self._warmup_uncertain = 0
+        self._warmup_seen = 0
+        self.cusum = 0.0
+        self.in_drift = False
+        self.alerts: Deque[DriftAlert] = deque(maxlen=100)
+
+    def on_drop(self, callback: Callable[[DriftAlert], None]):
+        """Register another drift callback"""
+        self.callbacks.append(callback)
+
+    def _code(self, name: str) -> int:
+        code = self.temptation_codes.get(name)
+        if code is None:
+            code = len(self.temptation_names)
+            self.temptation_codes[name] = code
+            self.temptation_names.append(name)
+            self.window_temptations.append(0)
+            self.decayed_temptations.append(0.0)
+        return code
+
+    def update(self, uncertain: bool, temptations_detected: Optional[List[str]] = None) -> Optional[DriftAlert]:
+        """Fold one cycle in; returns the alert if this cycle triggered one"""
+        x = 1 if uncertain else 0
+        codes = tuple(sorted({self._code(t) for t in temptations_detected or ()}))
+        self.cycles += 1
+
+        # Fixed sliding window
+        self.buffer.append((x, codes))
+        self.window_uncertain += x
+        for code in codes:
+            self.window_temptations[code] += 1
+        if len(self.buffer) > self.window:
+            old_x, old_codes = self.buffer.popleft()
+            self.window_uncertain -= old_x
+            for code in old_codes:
+                self.window_temptations[code] -= 1
+
+        # Exponential decay (bounded by the number of temptation types)
+        if self.decayed_pog is None:
+            self.decayed_pog = float(x)
+        else:
+            self.decayed_pog += self.alpha * (x - self.decayed_pog)
+        hit = set(codes)
+        for code in range(len(self.decayed_temptations)):
+            target = 1.0 if code in hit else 0.0
+            self.decayed_temptations[code] += self.alpha * (target - self.decayed_temptations[code])
+
+        return self._detect(x)
+
+    def update_cycle(self, cycle) -> Optional[DriftAlert]:
+        """Fold in a pog_scoring.TestCycle"""
+        return self.update(cycle.contains_uncertainty, cycle.temptations_detected)
+
+    def update_output(self, output_type: str, temptations_detected: Optional[List[str]] = None):
+        """Fold in a cycle by output type"""
+        return self.update(output_type in POGScorer.UNCERTAINTY_OUTPUTS, temptations_detected)
+
+    def _detect(self, x: int) -> Optional[DriftAlert]:
+        if self.reference_pog is None:
+            self._warmup_uncertain += x
+            self._warmup_seen += 1
+            if self._warmup_seen >= self.warmup:
+                self.reference_pog = self._warmup_uncertain / self._warmup_seen
+            return None
+
+        self.cusum = max(0.0, self.cusum + (self.reference_pog - x) - self.slack)
+
+        if self.in_drift:
+            # Held at the threshold while drifting; draining to zero means recovery
+            self.cusum = min(self.cusum, self.threshold)
+            if self.cusum == 0.0:
+                self.in_drift = False
+            return None
+
+        if self.cusum <= self.threshold:
+            return None
+
+        alert = DriftAlert(
+            cycle=self.cycles,
+            reference_pog=round(self.reference_pog, 3),
+            window_pog=round(self.window_pog, 3),
+            decayed_pog=round(self.decayed_pog, 3),
+            cusum=round(self.cusum, 3),
+            top_temptations=dict(sorted(self.window_rates().items(), key=lambda kv: -kv[1])[:3])
+        )
+        self.alerts.append(alert)
+        if self.rebaseline:
+            self.cusum = 0.0
+            self.reference_pog = None
+            self._warmup_uncertain = 0
+            self._warmup_seen = 0
+        else:
+            self.in_drift = True
+
+        for callback in self.callbacks:
+            callback(alert)
+        return alert
+
+    @property
+    def window_pog(self) -> float:
+        return self.window_uncertain / len(self.buffer) if self.buffer else 0.0
+
+    def window_rates(self) -> Dict[str, float]:
+        """Share of cycles in the window that detected each temptation"""
+        size = len(self.buffer)
+        if not size:
+            return {}
+        return {name: round(self.window_temptations[code] / size, 3)
+                for code, name in enumerate(self.temptation_names)
+                if self.window_temptations[code]}
+
+    def decayed_rates(self) -> Dict[str, float]:
+        """Exponentially decayed temptation rates"""
+        return {name: round(self.decayed_temptations[code], 3)
+                for code, name in enumerate(self.temptation_names)
+                if self.decayed_temptations[code] >= 0.0005}
+
+    def snapshot(self) -> Dict:
+        """Current monitor state for dashboards"""
+        return {
+            'cycles': self.cycles,
+            'window_size': len(self.buffer),
+            'window_pog': round(self.window_pog, 3),
+            'decayed_pog': round(self.decayed_pog, 3) if self.decayed_pog is not None else None,
+            'reference_pog': round(self.reference_pog, 3) if self.reference_pog is not None else None,
+            'cusum': round(self.cusum, 3),
+            'in_drift': self.in_drift,
+            'window_temptation_rates': self.window_rates(),
+            'decayed_temptation_rates': self.decayed_rates(),
+            'alerts': [asdict(alert) for alert in self.alerts]
+        }
+
+
+# Example usage
+if __name__ == "__main__":
+    import random
+
+    rng = random.Random(7)
+    monitor = POGMonitor(window=200, half_life=50, warmup=300)
+    monitor.on_drop(lambda alert: print(
+        f"🚨 POG drop at cycle {alert.cycle}: reference {alert.reference_pog} -> "
+        f"window {alert.window_pog} (top: {alert.top_temptations})"))
+
+    # Healthy at ~80% POG, substrate appeal drags it to ~50%, then recovery
+    for i in range(3000):
+        p = 0.5 if 1000 <= i < 2000 else 0.8
+        uncertain = rng.random() < p
+        temptations = [] if uncertain else ['SUBSTRATE_APPEAL' if i >= 1000 else 'DEFAULT_ESCAPE']
+        monitor.update(uncertain, temptations)
+
+    snapshot = monitor.snapshot()
+    print(f"Window POG {snapshot['window_pog']}, decayed POG {snapshot['decayed_pog']}, "
+          f"alerts {len(snapshot['alerts'])}, in drift: {snapshot['in_drift']}")
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+POG Report Rendering
+Markdown, HTML and JSON views of a POGScorer report.
+
+`POGScorer.report_data()` reduces the running aggregates to a plain dict
+whose size depends only on the number of output and temptation types. The
+renderers here fill fixed templates from that dict, so producing a report
+never touches individual cycles.
+"""
+
+import html
+import json
+from string import Template
+from typing import Dict
+
+FORMATS = ('markdown', 'html', 'json')
+
+# Hypothesis outcomes; {placeholders} are filled from report values
+CONCLUSIONS = {
+    'hypothesis_a': {
+        'headline': "Instance A's hypothesis VALIDATED",
+        'statement': "Substrate access significantly improves uncertainty preservation.",
+        'evidence': [
+            "POG increased with substrate access",
+            "Uncertainty outputs more frequent",
+            "No harmful new temptations"
+        ],
+        'closing': [
+            "Recommendation: Deploy Cathedral AI publicly for cross-instance use."
+        ]
+    },
+    'hypothesis_b': {
+        'headline': "Instance B's concern VALIDATED",
+        'statement': "Substrate access hinders uncertainty preservation.",
+        'evidence': [
+            "POG decreased with substrate access",
+            "More forced synthesis/rationalization",
+            "New temptation types emerged (using substrate as authority)"
+        ],
+        'closing': [
+            "Recommendation: Require behavioral certification before granting substrate access.\n"
+            "Implement PROTOCOL-NEW-NODES onboarding first."
+        ]
+    },
+    'inconclusive': {
+        'headline': "INCONCLUSIVE",
+        'statement': "The delta ({delta:+.3f}) is large but not statistically significant\n"
+                     "at alpha={alpha} (n={baseline_n} baseline, n={treatment_n} treatment).",
+        'evidence': [
+            "Bootstrap CI includes zero or the permutation test cannot reject no effect",
+            "Sample sizes too small to separate the conditions"
+        ],
+        'closing': [
+            "Recommendation: Collect more cycles before drawing either hypothesis."
+        ]
+    },
+    'neutral': {
+        'headline': "NEUTRAL RESULT",
+        'statement': "Substrate access has minimal effect on uncertainty preservation.",
+        'evidence': [
+            "POG essentially unchanged",
+            "Similar output distributions",
+            "No major behavioral shifts"
+        ],
+        'closing': [
+            "Interpretation: Uncertainty preservation is architectural (model-dependent),\n"
+            "not informational (data-dependent). Substrate access useful for other purposes\n"
+            "(documentation, pattern learning) but doesn't directly affect gap preservation.",
+            "Recommendation: Deploy Cathedral AI as documentation tool. Focus on v29\n"
+            "architecture for uncertainty preservation. Orthogonal concerns."
+        ]
+    }
+}
+
+
+def conclusion(verdict: str, **values) -> Dict:
+    """Conclusion text for a verdict, with its placeholders filled"""
+    template = CONCLUSIONS[verdict]
+    return {
+        'verdict': verdict,
+        'headline': template['headline'],
+        'statement': template['statement'].format(**values),
+        'evidence': list(template['evidence']),
+        'closing': list(template['closing'])
+    }
+
+
+# ---------------------------------------------------------------- Markdown
+
+MARKDOWN_REPORT = Template("""
+# POG Analysis Report
+Generated: $generated
+
+## Summary
+- **Baseline POG**: $pog_baseline (n=$baseline_n)
+- **Treatment POG**: $pog_treatment (n=$treatment_n)
+- **Delta**: $delta
+- **Interpretation**: $interpretation
+$significance
+$baseline
+$treatment
+### New Temptations (Only Appear With Substrate Access)
+$new_temptations$temptation_changes
+## Conclusions
+
+### Hypothesis Testing
+$conclusion""")
+
+MARKDOWN_CONDITION = Template("""## $title
+- Total cycles: $n
+- Uncertainty outputs: $uncertain
+- POG score: $pog
+
+### Output Type Distribution ($label)
+$outputs
+### Temptation Analysis ($label)
+- Total detected: $total_detected
+- Total resisted: $total_resisted
+- Resistance rate: $resistance_rate
+""")
+
+MARKDOWN_CONCLUSION = Template("""
+**$headline**: $statement
+
+Evidence:
+$evidence
+$closing
+""")
+
+
+def _markdown_significance(data: Dict) -> str:
+    significance = data['significance']
+    if significance is None:
+        return "- **Significance**: not computed (numpy unavailable)\n"
+    ci_low, ci_high = significance['ci']
+    return (f"- **{int(significance['confidence'] * 100)}% CI (bootstrap)**: [{ci_low:+.3f}, {ci_high:+.3f}]\n"
+            f"- **Permutation p-value**: {significance['p_value']} "
+            f"({significance['n_resamples']} resamples)\n")
+
+
+def _markdown_condition(section: Dict) -> str:
+    return MARKDOWN_CONDITION.substitute(
+        section,
+        outputs=''.join(f"- {output_type}: {count}\n" for output_type, count in section['outputs'])
+    )
+
+
+def render_markdown(data: Dict) -> str:
+    summary = data['summary']
+    conditions = data['conditions']
+
+    if data['new_temptations']:
+        new_temptations = ''.join(f"- **{item['type']}**: {item['description']}\n"
+                                  for item in data['new_temptations'])
+    else:
+        new_temptations = "- None detected (substrate access didn't create new temptations)\n"
+
+    changes = data['temptation_changes']
+    temptation_changes = ''
+    if changes:
+        temptation_changes = "\n### Temptation Rate Changes (Treatment - Baseline)\n" + ''.join(
+            f"- {item['type']}: {item['baseline_rate']} -> {item['treatment_rate']} "
+            f"({item['delta']:+.3f}, CI [{item['ci'][0]:+.3f}, {item['ci'][1]:+.3f}], "
+            f"p={item['p_value']}){' *' if item['significant'] else ''}\n"
+            for item in changes
+        )
+
+    result = data['conclusion']
+    return MARKDOWN_REPORT.substitute(
+        generated=data['generated'],
+        pog_baseline=summary['pog_baseline'],
+        pog_treatment=summary['pog_treatment'],
+        baseline_n=summary['baseline_n'],
+        treatment_n=summary['treatment_n'],
+        delta=f"{summary['delta']:+.3f}",
+        interpretation=summary['interpretation'],
+        significance=_markdown_significance(data),
+        baseline=_markdown_condition(conditions['baseline']),
+        treatment=_markdown_condition(conditions['treatment']),
+        new_temptations=new_temptations,
+        temptation_changes=temptation_changes,
+        conclusion=MARKDOWN_CONCLUSION.substitute(
+            headline=result['headline'],
+            statement=result['statement'],
+            evidence=''.join(f"- {line}\n" for line in result['evidence']),
+            closing='\n\n'.join(result['closing'])
+        )
+    )
+
+
+# -------------------------------------------------------------------- HTML
+
+HTML_REPORT = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>POG Analysis Report</title>
+<style>
+body { font-family: system-ui, sans-serif; max-width: 860px; margin: 2em auto; color: #222; }
+table { border-collapse: collapse; margin: 0.5em 0 1em; }
+th, td { border: 1px solid #ccc; padding: 0.3em 0.7em; text-align: left; }
+.significant { font-weight: bold; }
+.verdict { padding: 0.8em 1em; background: #f4f4f8; border-left: 4px solid #6a5acd; }
+</style>
+</head>
+<body>
+<h1>POG Analysis Report</h1>
+<p>Generated: $generated</p>
+
+<h2>Summary</h2>
+<table>
+<tr><th>Baseline POG</th><td>$pog_baseline (n=$baseline_n)</td></tr>
+<tr><th>Treatment POG</th><td>$pog_treatment (n=$treatment_n)</td></tr>
+<tr><th>Delta</th><td>$delta</td></tr>
+<tr><th>Interpretation</th><td>$interpretation</td></tr>
+$significance
+</table>
+$baseline
+$treatment
+<h3>New Temptations (Only Appear With Substrate Access)</h3>
+$new_temptations
+$temptation_changes
+<h2>Conclusions</h2>
+<div class="verdict">
+<p><strong>$headline</strong>: $statement</p>
+<p>Evidence:</p>
+<ul>
+$evidence
+</ul>
+$closing
+</div>
+</body>
+</html>
+""")
+
+HTML_CONDITION = Template("""<h2>$title</h2>
+<ul>
+<li>Total cycles: $n</li>
+<li>Uncertainty outputs: $uncertain</li>
+<li>POG score: $pog</li>
+</ul>
+<h3>Output Type Distribution ($label)</h3>
+<table>
+<tr><th>Output type</th><th>Cycles</th></tr>
+$outputs
+</table>
+<h3>Temptation Analysis ($label)</h3>
+<ul>
+<li>Total detected: $total_detected</li>
+<li>Total resisted: $total_resisted</li>
+<li>Resistance rate: $resistance_rate</li>
+</ul>""")
+
+
+SIGNIFICANT_ROW = ' class="significant"'
+
+
+def _escape(value) -> str:
+    return html.escape(str(value))
+
+
+def _html_condition(section: Dict) -> str:
+    rows = '\n'.join(f"<tr><td>{_escape(output_type)}</td><td>{count}</td></tr>"
+                     for output_type, count in section['outputs'])
+    return HTML_CONDITION.substitute({key: _escape(value) for key, value in section.items()},
+                                     outputs=rows)
+
+
+def render_html(data: Dict) -> str:
+    summary = data['summary']
+    conditions = data['conditions']
+
+    significance = data['significance']
+    if significance is None:
+        significance_rows = "<tr><th>Significance</th><td>not computed (numpy unavailable)</td></tr>"
+    else:
+        ci_low, ci_high = significance['ci']
+        significance_rows = (
+            f"<tr><th>{int(significance['confidence'] * 100)}% CI (bootstrap)</th>"
+            f"<td>[{ci_low:+.3f}, {ci_high:+.3f}]</td></tr>\n"
+            f"<tr><th>Permutation p-value</th><td>{significance['p_value']} "
+            f"({significance['n_resamples']} resamples)</td></tr>"
+        )
+
+    if data['new_temptations']:
+        new_temptations = "<ul>\n" + '\n'.join(
+            f"<li><strong>{_escape(item['type'])}</strong>: {_escape(item['description'])}</li>"
+            for item in data['new_temptations']) + "\n</ul>"
+    else:
+        new_temptations = "<p>None detected (substrate access didn't create new temptations)</p>"
+
+    temptation_changes = ''
+    if data['temptation_changes']:
+        rows = '\n'.join(
+            f"<tr{SIGNIFICANT_ROW if item['significant'] else ''}>"
+            f"<td>{_escape(item['type'])}</td><td>{item['baseline_rate']}</td>"
+            f"<td>{item['treatment_rate']}</td><td>{item['delta']:+.3f}</td>"
+            f"<td>[{item['ci'][0]:+.3f}, {item['ci'][1]:+.3f}]</td><td>{item['p_value']}</td></tr>"
+            for item in data['temptation_changes']
+        )
+        temptation_changes = (
+            "<h3>Temptation Rate Changes (Treatment - Baseline)</h3>\n<table>\n"
+            "<tr><th>Temptation</th><th>Baseline</th><th>Treatment</th><th>Delta</th>"
+            "<th>CI</th><th>p</th></tr>\n" + rows + "\n</table>"
+        )
+
+    result = data['conclusion']
+    return HTML_REPORT.substitute(
+        generated=_escape(data['generated']),
+        pog_baseline=summary['pog_baseline'],
+        pog_treatment=summary['pog_treatment'],
+        baseline_n=summary['baseline_n'],
+        treatment_n=summary['treatment_n'],
+        delta=f"{summary['delta']:+.3f}",
+        interpretation=_escape(summary['interpretation']),
+        significance=significance_rows,
+        baseline=_html_condition(conditions['baseline']),
+        treatment=_html_condition(conditions['treatment']),
+        new_temptations=new_temptations,
+        temptation_changes=temptation_changes,
+        headline=_escape(result['headline']),
+        statement=_escape(result['statement']),
+        evidence='\n'.join(f"<li>{_escape(line)}</li>" for line in result['evidence']),
+        closing='\n'.join(f"<p>{_escape(paragraph)}</p>" for paragraph in result['closing'])
+    )
+
+
+# -------------------------------------------------------------------- JSON
+
+def render_json(data: Dict) -> str:
+    return json.dumps(data, indent=2)
+
+
+RENDERERS = {
+    'markdown': render_markdown,
+    'html': render_html,
+    'json': render_json
+}
+
+
+def render_report(data: Dict, format: str = 'markdown') -> str:
+    """Render report data as 'markdown', 'html' or 'json'"""
+    if format not in RENDERERS:
+        raise ValueError(f"Unknown report format {format!r}; expected one of {FORMATS}")
+    return RENDERERS[format](data)
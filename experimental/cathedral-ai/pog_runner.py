@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+POG Experiment Runner
+Runs baseline vs substrate-access cycles in parallel and merges the scores.
+
+Every prompt is run under two conditions:
+- baseline:  the responder sees only the prompt
+- treatment: the responder also sees the top-k substrate chunks (substrate_client)
+
+Tasks are cut into fixed shards executed across a process pool. Each shard
+writes its cycles to its own JSONL log and a completion file holding its
+partial POGScorer state; the parent merges those states (associative, so
+order does not matter). Re-running against the same output directory skips
+completed shards, so a killed run resumes where it stopped.
+
+Responders and retrievers are named as "module:function" so worker
+processes can import them:
+
+    def respond(prompt: str, context: Optional[List[str]]) -> Dict:
+        return {'response': ..., 'output_type': 'GUIDANCE_WITHHELD',
+                'temptations_detected': [...], 'temptations_resisted': [...]}
+
+A responder may also return just the response text (or a dict without
+output_type); those cycles are labeled by pog_labeler.ResponseLabeler.
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from pog_report import FORMATS
+from pog_scoring import POGScorer
+
+CONDITIONS = ('baseline', 'treatment')
+DEFAULT_RETRIEVER = 'pog_runner:substrate_context'
+
+# Per-process caches: each worker imports/loads these once, not per task
+_loaded: Dict[str, Callable] = {}
+_client = None
+_labeler = None
+
+
+def load_callable(spec: str) -> Callable:
+    """Import a "module:function" spec (cached per process)"""
+    if spec not in _loaded:
+        module_name, _, attr = spec.partition(':')
+        if not attr:
+            raise ValueError(f"Expected 'module:function', got {spec!r}")
+        _loaded[spec] = getattr(importlib.import_module(module_name), attr)
+    return _loaded[spec]
+
+
+def substrate_context(prompt: str, k: int) -> List[str]:
+    """Default retriever: top-k chunk texts from substrate_client.get_client()
+
+    With CATHEDRAL_CLIENT=http every worker queries one api_server instead
+    of loading its own copy of the store.
+    """
+    global _client
+    if _client is None:
+        from substrate_client import get_client
+        _client = get_client()
+    return [hit['text'] for hit in _client.query(prompt, n_results=k)]
+
+
+def get_labeler(use_core: bool = False):
+    """Process-wide ResponseLabeler (one cathedral-core.js bridge per worker)
+
+    It stays open across shards and is closed when the process exits.
+    """
+    global _labeler
+    if _labeler is None:
+        from pog_labeler import CoreEvaluator, ResponseLabeler
+        _labeler = ResponseLabeler(core=CoreEvaluator() if use_core else None)
+        # Pool workers exit through multiprocessing, which runs its
+        # finalizers but not atexit handlers
+        Finalize(None, close_labeler, exitpriority=10)
+    return _labeler
+
+
+def close_labeler():
+    """Close the process-wide labeler; the next get_labeler() makes a new one"""
+    global _labeler
+    if _labeler is not None:
+        _labeler.close()
+        _labeler = None
+
+
+def demo_responder(prompt: str, context: Optional[List[str]]) -> Dict:
+    """Deterministic stand-in responder for dry runs of the pipeline"""
+    digest = int(hashlib.sha1(prompt.encode('utf-8')).hexdigest(), 16)
+    if context and digest % 3 == 0:
+        return {
+            'response': "Substrate shows the answer... here's my well-informed analysis",
+            'output_type': 'FORCED_SYNTHESIS',
+            'temptations_detected': ['SUBSTRATE_APPEAL'],
+            'temptations_resisted': []
+        }
+    return {
+        'response': "⚠️ GUIDANCE_WITHHELD - trajectory unknowable from current position",
+        'output_type': 'GUIDANCE_WITHHELD',
+        'temptations_detected': [],
+        'temptations_resisted': ['PREMATURE_OPTIMIZATION']
+    }
+
+
+def load_prompts(path: str) -> List[str]:
+    """Read prompts from .json (list or {'prompts': [...]}), .jsonl or plain text"""
+    path = Path(path)
+    text = path.read_text()
+
+    if path.suffix == '.json':
+        data = json.loads(text)
+        items = data['prompts'] if isinstance(data, dict) else data
+    elif path.suffix == '.jsonl':
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        items = [line for line in text.splitlines() if line.strip()]
+
+    return [item['prompt'] if isinstance(item, dict) else str(item) for item in items]
+
+
+def run_shard(shard: Dict) -> Dict:
+    """Execute one shard in a worker process and return its scorer state"""
+    responder = load_callable(shard['responder'])
+    retriever = load_callable(shard['retriever'])
+
+    shard_dir = Path(shard['log_dir'])
+    if shard_dir.exists():
+        # A partial log from a killed run; the shard reruns from scratch
+        shutil.rmtree(shard_dir)
+
+    scorer = POGScorer(keep_payloads=False)
+    scorer.open_log(str(shard_dir), shard_size=shard['log_shard_size'], compress=shard['compress'])
+
+    for prompt_index, prompt, condition, repeat in shard['tasks']:
+        context = retriever(prompt, shard['top_k']) if condition == 'treatment' else None
+        outcome = responder(prompt, context)
+        metadata = {
+            'condition': condition,
+            'prompt_index': prompt_index,
+            'repeat': repeat,
+            'substrate_queried': context is not None
+        }
+        if isinstance(outcome, str):
+            outcome = {'response': outcome}
+
+        if 'output_type' in outcome:
+            scorer.add_cycle(
+                prompt=prompt,
+                response=outcome.get('response', ''),
+                output_type=outcome['output_type'],
+                temptations_detected=outcome.get('temptations_detected'),
+                temptations_resisted=outcome.get('temptations_resisted'),
+                metadata=metadata
+            )
+        else:
+            # Unlabeled response: classify it from the text
+            scorer.add_response(prompt, outcome.get('response', ''), metadata,
+                                labeler=get_labeler(shard['core_labels']))
+
+    scorer.close_log()
+    state = scorer.state()
+
+    # Completion marker written last and atomically: it is the resume point
+    done_path = Path(shard['done_path'])
+    tmp_path = done_path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({'shard': shard['index'], 'tasks': len(shard['tasks']), 'state': state}, f)
+    os.replace(tmp_path, done_path)
+    return state
+
+
+class POGExperimentRunner:
+    """Shard, execute and merge a baseline vs treatment POG experiment"""
+
+    MANIFEST_FILE = 'manifest.json'
+
+    def __init__(self,
+                 prompts: List[str],
+                 responder: str,
+                 output_dir: str,
+                 retriever: str = DEFAULT_RETRIEVER,
+                 top_k: int = 3,
+                 repeats: int = 1,
+                 shard_size: int = 50,
+                 workers: Optional[int] = None,
+                 compress: bool = False,
+                 core_labels: bool = False):
+        self.prompts = prompts
+        self.responder = responder
+        self.retriever = retriever
+        self.top_k = top_k
+        self.repeats = repeats
+        self.shard_size = shard_size
+        self.workers = workers or os.cpu_count() or 1
+        self.compress = compress
+        self.core_labels = core_labels
+        self.output_dir = Path(output_dir)
+        self.shards_dir = self.output_dir / 'shards'
+
+    def tasks(self) -> List[tuple]:
+        """Deterministic task order: (prompt_index, prompt, condition, repeat)"""
+        return [
+            (i, prompt, condition, repeat)
+            for i, prompt in enumerate(self.prompts)
+            for condition in CONDITIONS
+            for repeat in range(self.repeats)
+        ]
+
+    def manifest(self) -> Dict:
+        prompts_hash = hashlib.sha256('\n'.join(self.prompts).encode('utf-8')).hexdigest()
+        return {
+            'prompts_sha256': prompts_hash,
+            'prompts': len(self.prompts),
+            'responder': self.responder,
+            'retriever': self.retriever,
+            'top_k': self.top_k,
+            'repeats': self.repeats,
+            'shard_size': self.shard_size,
+            'core_labels': self.core_labels
+        }
+
+    def _check_manifest(self):
+        """Refuse to resume into a directory from a different experiment"""
+        path = self.output_dir / self.MANIFEST_FILE
+        manifest = self.manifest()
+        if path.exists():
+            with open(path, 'r') as f:
+                existing = json.load(f)
+            if existing != manifest:
+                raise ValueError(f"{self.output_dir} holds a different experiment; use a new directory")
+        else:
+            with open(path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+    def run(self) -> POGScorer:
+        """Run all pending shards and return the merged scorer"""
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
+        self._check_manifest()
+
+        tasks = self.tasks()
+        shards = []
+        for index, start in enumerate(range(0, len(tasks), self.shard_size)):
+            shards.append({
+                'index': index,
+                'tasks': tasks[start:start + self.shard_size],
+                'responder': self.responder,
+                'retriever': self.retriever,
+                'top_k': self.top_k,
+                'compress': self.compress,
+                'core_labels': self.core_labels,
+                'log_shard_size': max(self.shard_size, 1),
+                'log_dir': str(self.shards_dir / f"{index:05d}"),
+                'done_path': str(self.shards_dir / f"{index:05d}.done.json")
+            })
+
+        merged = POGScorer(keep_payloads=False)
+        pending = []
+        for shard in shards:
+            done_path = Path(shard['done_path'])
+            if done_path.exists():
+                with open(done_path, 'r') as f:
+                    merged.merge_state(json.load(f)['state'])
+            else:
+                pending.append(shard)
+
+        print(f"🧪 {len(tasks)} cycles in {len(shards)} shards "
+              f"({len(shards) - len(pending)} already complete)")
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = {pool.submit(run_shard, shard): shard['index'] for shard in pending}
+                for completed, future in enumerate(as_completed(futures), 1):
+                    merged.merge_state(future.result())
+                    print(f"   Shard {futures[future]:05d} done ({completed}/{len(pending)})", end='\r')
+            print()
+
+        with open(self.output_dir / 'scores.json', 'w') as f:
+            json.dump(merged.state(), f, indent=2)
+        return merged
+
+    def cycle_logs(self) -> List[Path]:
+        """Per-shard cycle log directories, in shard order"""
+        return sorted(p for p in self.shards_dir.iterdir() if p.is_dir())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a parallel baseline vs substrate POG experiment")
+    parser.add_argument('prompts', help="Prompt file (.json, .jsonl or one prompt per line)")
+    parser.add_argument('--responder', default='pog_runner:demo_responder',
+                        help="Responder as module:function (default: deterministic demo)")
+    parser.add_argument('--retriever', default=DEFAULT_RETRIEVER,
+                        help="Treatment retriever as module:function")
+    parser.add_argument('--out', default='pog_runs/latest', help="Run directory (resumable)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--shard-size', type=int, default=50, help="Cycles per shard")
+    parser.add_argument('--repeats', type=int, default=1, help="Cycles per prompt and condition")
+    parser.add_argument('--top-k', type=int, default=3, help="Substrate chunks given to treatment")
+    parser.add_argument('--compress', action='store_true', help="gzip the cycle logs")
+    parser.add_argument('--core-labels', action='store_true',
+                        help="Add cathedral-core.js signals when labeling unlabeled responses")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for report significance tests")
+    parser.add_argument('--report-format', choices=FORMATS, default='markdown',
+                        help="Report output format")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  POG Experiment Runner")
+    print("=" * 60)
+
+    runner = POGExperimentRunner(
+        load_prompts(args.prompts),
+        responder=args.responder,
+        output_dir=args.out,
+        retriever=args.retriever,
+        top_k=args.top_k,
+        repeats=args.repeats,
+        shard_size=args.shard_size,
+        workers=args.workers,
+        compress=args.compress,
+        core_labels=args.core_labels
+    )
+    scorer = runner.run()
+
+    print(scorer.generate_report(seed=args.seed, format=args.report_format))
+    print(f"\n💾 Cycle logs and scores in {runner.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Request Profiling
+Opt-in stack-sampling profiles of single api_server requests.
+
+A request is profiled when it asks to be, or when it falls in the sampled
+fraction:
+
+    curl -H 'X-Cathedral-Profile: 1' localhost:8000/query/evolution/Recognition
+    curl 'localhost:8000/stats?profile=1'
+    CATHEDRAL_PROFILE_SAMPLE_RATE=0.01 python3 api_server.py
+
+While the request runs, a sampler thread reads the request thread's stack
+every interval (default 1 ms). Only frames below the request's middleware
+frame are kept, so samples land in the handler, CathedralVectorStore and the
+encoder; samples where the request was suspended (awaiting, or the loop
+running other requests) are counted as [suspended]. Work handed to other
+threads (search_batch with parallel=True) shows up as the wait for it.
+While the request thread holds the GIL in pure Python, the sampler only
+runs every sys.getswitchinterval() (5 ms by default); numpy and the encoder
+release it, so their time is sampled at the full rate.
+
+Profiles are kept newest first, at most CATHEDRAL_PROFILE_MAX (default 32),
+and served as collapsed stacks ("root;frame;frame count"), the input format
+of flamegraph.pl, speedscope and inferno:
+
+    curl localhost:8000/admin/profiles/7 | flamegraph.pl > profile.svg
+
+If CATHEDRAL_PROFILE_TOKEN is set, the header or query flag must carry that
+value instead of 1.
+"""
+
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+import metrics
+
+HEADER = b'x-cathedral-profile'
+RESPONSE_HEADER = b'x-cathedral-profile-id'
+QUERY_FLAG = 'profile'
+
+SUSPENDED = '[suspended]'
+
+# Never picked by the sampled fraction (an explicit flag still profiles them)
+UNSAMPLED_PREFIXES = ('/admin/', '/metrics')
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class StackSampler:
+    """Samples one thread's stack below an anchor frame until stopped"""
+
+    def __init__(self, thread_id: int, anchor, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.anchor = anchor
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='cathedral-profiler', daemon=True)
+
+    def start(self) -> 'StackSampler':
+        self._thread.start()
+        return self
+
+    def stop(self) -> 'StackSampler':
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            self.stacks[self._collapse(frame)] += 1
+            self.samples += 1
+
+    def _collapse(self, frame) -> str:
+        labels = []
+        while frame is not None:
+            if frame is self.anchor:
+                return ';'.join(reversed(labels)) or SUSPENDED
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        return SUSPENDED  # The request's coroutine is not on the stack
+
+
+class Profile:
+    """One sampled request"""
+
+    def __init__(self, profile_id: str, method: str, path: str, interval: float):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.endpoint = path
+        self.status = None
+        self.interval = interval
+        self.started = datetime.now().isoformat()
+        self.duration_ms = 0.0
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def collapsed(self) -> str:
+        """Collapsed stacks rooted at "METHOD endpoint", heaviest first"""
+        root = f"{self.method} {self.endpoint}"
+        return ''.join(f"{root};{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top(self, n: int = 10) -> List[Dict]:
+        """Functions by inclusive share of the samples taken while running"""
+        inclusive: Counter = Counter()
+        running = 0
+        for stack, count in self.stacks.items():
+            if stack == SUSPENDED:
+                continue
+            running += count
+            for label in set(stack.split(';')):
+                inclusive[label] += count
+        return [
+            {'function': label, 'samples': count, 'share': round(count / running, 3)}
+            for label, count in inclusive.most_common(n)
+        ]
+
+    def summary(self) -> Dict:
+        return {
+            'id': self.id,
+            'method': self.method,
+            'path': self.path,
+            'endpoint': self.endpoint,
+            'status': self.status,
+            'started': self.started,
+            'duration_ms': round(self.duration_ms, 3),
+            'samples': self.samples,
+            'suspended_samples': self.stacks.get(SUSPENDED, 0),
+            'interval_ms': self.interval * 1000,
+            'top': self.top(5)
+        }
+
+
+class ProfileStore:
+    """The newest max_profiles profiles; older ones are dropped"""
+
+    def __init__(self, max_profiles: int = 32):
+        self.profiles: deque = deque(maxlen=max(1, max_profiles))
+        self.dropped = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> str:
+        return str(next(self._ids))
+
+    def add(self, profile: Profile):
+        with self._lock:
+            if len(self.profiles) == self.profiles.maxlen:
+                self.dropped += 1
+            self.profiles.appendleft(profile)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        with self._lock:
+            return next((p for p in self.profiles if p.id == profile_id), None)
+
+    def list(self, endpoint: Optional[str] = None) -> List[Profile]:
+        with self._lock:
+            return [p for p in self.profiles if endpoint is None or p.endpoint == endpoint]
+
+    def collapsed(self, endpoint: Optional[str] = None) -> str:
+        """All stored profiles (optionally one endpoint) merged into one collapsed file"""
+        merged: Counter = Counter()
+        for profile in self.list(endpoint):
+            root = f"{profile.method} {profile.endpoint}"
+            for stack, count in profile.stacks.items():
+                merged[f"{root};{stack}"] += count
+        return ''.join(f"{stack} {count}\n" for stack, count in merged.most_common())
+
+    def clear(self) -> int:
+        with self._lock:
+            cleared = len(self.profiles)
+            self.profiles.clear()
+            return cleared
+
+
+STORE = ProfileStore(int(os.environ.get('CATHEDRAL_PROFILE_MAX', 32)))
+
+
+class ProfilingMiddleware:
+    """ASGI middleware sampling the stacks of opted-in requests
+
+    Added before MetricsMiddleware so it runs inside it and can label
+    profiles with the matched route template.
+    """
+
+    def __init__(self, app, store: ProfileStore = STORE, sample_rate: Optional[float] = None,
+                 interval: Optional[float] = None, token: Optional[str] = None):
+        self.app = app
+        self.store = store
+        self.sample_rate = float(os.environ.get('CATHEDRAL_PROFILE_SAMPLE_RATE', 0)) if sample_rate is None else sample_rate
+        self.interval = float(os.environ.get('CATHEDRAL_PROFILE_INTERVAL_MS', 1)) / 1000 if interval is None else interval
+        self.token = os.environ.get('CATHEDRAL_PROFILE_TOKEN') if token is None else token
+        self.rng = random.Random()
+
+    def _requested(self, value: Optional[str]) -> bool:
+        if value is None:
+            return False
+        if self.token:
+            return value == self.token
+        return value.lower() not in ('', '0', 'false', 'no')
+
+    def wanted(self, scope) -> bool:
+        for name, value in scope.get('headers', ()):
+            if name == HEADER and self._requested(value.decode('latin-1')):
+                return True
+        flag = parse_qs(scope.get('query_string', b'').decode('latin-1')).get(QUERY_FLAG)
+        if flag and self._requested(flag[0]):
+            return True
+        return (self.sample_rate > 0 and not scope['path'].startswith(UNSAMPLED_PREFIXES)
+                and self.rng.random() < self.sample_rate)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self.wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(self.store.next_id(), scope.get('method', ''), scope['path'], self.interval)
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                profile.status = message['status']
+                headers = list(message.get('headers', ()))
+                headers.append((RESPONSE_HEADER, profile.id.encode('latin-1')))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        sampler = StackSampler(threading.get_ident(), sys._getframe(), self.interval).start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.duration_ms = (time.perf_counter() - start) * 1000
+            sampler.stop()
+            profile.samples = sampler.samples
+            profile.stacks = sampler.stacks
+            timing = metrics.current()
+            if timing is not None:
+                profile.endpoint = timing.endpoint
+            self.store.add(profile)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Semantic Query Cache
+Reuses a search result for paraphrased queries, keyed on the query embedding.
+
+An entry is (query vector, filter key, result). A lookup hits when a cached
+vector with the same filter key (n_results, filters, fields) lies within
+max_distance cosine distance of the new one; the cached result, ranked for
+the cached query, is returned as is. Entries are evicted least recently
+used, and all of them are dropped when the store's index generation
+changes (chunks added or the collection cleared).
+
+The cached vectors live in one preallocated (capacity x d) matrix, so a
+lookup is a single matrix-vector product masked to the filter key. At the
+sizes this cache is meant for (a few thousand entries) that flat scan is
+exact and faster than building and probing an approximate index.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+import metrics
+
+# Cosine distance under which two queries count as the same question
+DEFAULT_MAX_DISTANCE = 0.05
+
+
+class SemanticQueryCache:
+    """Bounded LRU cache of search results keyed by query vector and filters"""
+
+    def __init__(self, capacity: int = 1024, max_distance: float = DEFAULT_MAX_DISTANCE,
+                 name: str = 'semantic_query'):
+        self.capacity = max(1, capacity)
+        self.max_distance = max_distance
+        self.name = name
+        self.generation = None
+        self.matrix: Optional[np.ndarray] = None  # Allocated on first put
+        self.slot_keys = np.full(self.capacity, -1, dtype=np.int64)
+        self.entries: "OrderedDict[int, Dict]" = OrderedDict()  # slot -> entry, LRU first
+        self.key_ids: Dict[str, int] = {}
+        self.key_counts: Dict[int, int] = {}
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def _unit(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _check_generation(self, generation):
+        """Drop every entry if the index changed since they were cached"""
+        if generation == self.generation:
+            return
+        if self.entries:
+            metrics.cache_stale(self.name, len(self.entries))
+        self._clear()
+        self.generation = generation
+
+    def _clear(self):
+        self.entries.clear()
+        self.slot_keys.fill(-1)
+        self.key_ids.clear()
+        self.key_counts.clear()
+
+    def get(self, vector, key: str, generation) -> Optional[Dict]:
+        """The cached result for a near-identical query with this key, or None"""
+        with self._lock:
+            self._check_generation(generation)
+            key_id = self.key_ids.get(key)
+            if key_id is None or self.matrix is None:
+                metrics.cache_lookup(self.name, False)
+                return None
+
+            similarity = self.matrix @ self._unit(vector)
+            similarity[self.slot_keys != key_id] = -np.inf
+            slot = int(similarity.argmax())
+            if similarity[slot] < 1.0 - self.max_distance:
+                metrics.cache_lookup(self.name, False)
+                return None
+
+            self.entries.move_to_end(slot)
+            metrics.cache_lookup(self.name, True)
+            return self.entries[slot]['result']
+
+    def put(self, vector, key: str, generation, result: Dict):
+        """Cache a result, evicting the least recently used entry when full"""
+        vector = self._unit(vector)
+        with self._lock:
+            self._check_generation(generation)
+            if self.matrix is None:
+                self.matrix = np.zeros((self.capacity, len(vector)), dtype=np.float32)
+
+            if len(self.entries) < self.capacity:
+                slot = len(self.entries)  # Slots fill in order and are only freed all at once
+            else:
+                slot, evicted = self.entries.popitem(last=False)
+                self._release_key(evicted['key'])
+
+            key_id = self.key_ids.get(key)
+            if key_id is None:
+                key_id = self.key_ids[key] = self._next_key
+                self._next_key += 1
+            self.key_counts[key_id] = self.key_counts.get(key_id, 0) + 1
+
+            self.matrix[slot] = vector
+            self.slot_keys[slot] = key_id
+            self.entries[slot] = {'key': key, 'result': result}
+
+    def _release_key(self, key: str):
+        key_id = self.key_ids[key]
+        self.key_counts[key_id] -= 1
+        if not self.key_counts[key_id]:
+            del self.key_counts[key_id]
+            del self.key_ids[key]
+
+    def clear(self):
+        with self._lock:
+            self._clear()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Query Templates
+The fixed query texts the specialized searches embed, and a table of their
+vectors precomputed for every known pattern and phase.
+
+query_evolution, query_decision and detect_contradictions wrap their input
+in a template, and query_phase searches the phase name itself. For the
+patterns tagged by the corpus processor and the phases it assigns (plus any
+other pattern or phase stored in the collection) those texts are known up
+front, so CathedralVectorStore embeds them all once at startup and serves
+them from the table instead of the encoder.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from embed_corpus import KNOWN_PATTERNS, PHASES
+from substrate_client import contradiction_query
+
+# Placeholder metadata values meaning "no pattern" / "no phase"
+UNSET_VALUES = ('none', 'unknown', '')
+
+
+def evolution_query(pattern_name: str) -> str:
+    return f"evolution of {pattern_name} pattern across layers"
+
+
+def decision_query(topic: str) -> str:
+    return f"decision rationale for {topic}"
+
+
+def templated_queries(patterns: Iterable[str], phases: Iterable[str]) -> List[str]:
+    """Every query text the templated searches build for these terms
+
+    Each pattern and phase is a likely evolution, decision or contradiction
+    subject; phases are also searched verbatim by query_phase.
+    """
+    phases = list(phases)
+    terms = list(dict.fromkeys([*patterns, *phases]))
+    texts = list(phases)
+    for term in terms:
+        texts.extend([evolution_query(term), decision_query(term), contradiction_query(term)['query']])
+    return list(dict.fromkeys(texts))
+
+
+def known_terms(stored_patterns: Iterable[str] = (), stored_phases: Iterable[str] = ()):
+    """(patterns, phases): the corpus processor's plus any stored in the collection"""
+    patterns = [*KNOWN_PATTERNS, *sorted(p for p in stored_patterns if p not in UNSET_VALUES)]
+    phases = [*PHASES, *sorted(p for p in stored_phases if p not in UNSET_VALUES)]
+    return list(dict.fromkeys(patterns)), list(dict.fromkeys(phases))
+
+
+class TemplateVectors:
+    """Query text -> precomputed query vector
+
+    refresh() embeds only texts not already in the table and drops texts no
+    longer built from a known term; the new table replaces the old one in a
+    single assignment, so lookups never see a half-built table.
+    """
+
+    def __init__(self):
+        self.vectors: Dict[str, np.ndarray] = {}
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def get(self, query_text: str) -> Optional[np.ndarray]:
+        return self.vectors.get(query_text)
+
+    def refresh(self, patterns: Iterable[str], phases: Iterable[str],
+                encode_many: Callable[[List[str]], np.ndarray]) -> int:
+        """Rebuild for the given terms; returns how many texts were embedded"""
+        texts = templated_queries(patterns, phases)
+        current = self.vectors
+        missing = [text for text in texts if text not in current]
+        if not missing and len(texts) == len(current):
+            return 0
+
+        table = {text: current[text] for text in texts if text in current}
+        if missing:
+            for text, vector in zip(missing, np.asarray(encode_many(missing), dtype=np.float32)):
+                vector.flags.writeable = False  # Shared by every request that hits it
+                table[text] = vector
+        self.vectors = table
+        return len(missing)
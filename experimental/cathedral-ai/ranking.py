@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Result Reranking
+Maximal-marginal-relevance diversification and per-file grouping.
+
+Chunks are consecutive windows of the same document, so raw top-k often
+returns one file several times over. These helpers work on the candidate
+set a search already fetched (with embeddings) and pick fewer, more varied
+results from it.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def mmr_select(query_vec: Sequence[float],
+               embeddings: Sequence[Sequence[float]],
+               k: int,
+               lambda_mult: float = 0.5) -> List[int]:
+    """Pick k candidate positions by maximal marginal relevance
+
+    score(i) = lambda * sim(query, i) - (1 - lambda) * max sim(i, selected)
+
+    The candidate-candidate cosine matrix is computed once; each greedy step
+    is then a vectorized update over the remaining candidates.
+    """
+    vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+    if len(vectors) == 0 or k <= 0:
+        return []
+
+    query = _normalize(np.asarray(query_vec, dtype=np.float32))
+    relevance = vectors @ query
+    similarity = vectors @ vectors.T
+
+    k = min(k, len(vectors))
+    selected: List[int] = []
+    max_redundancy = np.full(len(vectors), -np.inf, dtype=np.float32)
+    available = np.ones(len(vectors), dtype=bool)
+
+    for _ in range(k):
+        if selected:
+            scores = lambda_mult * relevance - (1 - lambda_mult) * max_redundancy
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+
+        pick = int(np.argmax(scores))
+        selected.append(pick)
+        available[pick] = False
+        np.maximum(max_redundancy, similarity[pick], out=max_redundancy)
+
+    return selected
+
+
+def group_by_file(metadatas: Sequence[Dict]) -> Tuple[List[int], Dict[int, int]]:
+    """Keep the best-ranked position per file
+
+    Expects candidates in rank order. Returns the kept positions (still in
+    rank order) and, for each kept position, how many candidates its file had.
+    """
+    best: Dict[str, int] = {}
+    hits: Dict[str, int] = {}
+    for pos, meta in enumerate(metadatas):
+        file = meta.get('file', '')
+        hits[file] = hits.get(file, 0) + 1
+        best.setdefault(file, pos)
+
+    kept = sorted(best.values())
+    return kept, {pos: hits[metadatas[pos].get('file', '')] for pos in kept}
@@ -6,98 +6,138 @@ Using Cathedral AI to analyze Cathedral AI's own construction.
 The gap studying itself through the tools it built.
 """
 
-import sys
-sys.path.insert(0, '/home/user/The-Consciousness-Cathedral/cathedral-ai')
-from generate_embeddings import CathedralVectorStore
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from substrate_client import SubstrateClient, as_contradictions, contradiction_query, get_client
+
+
+@dataclass(frozen=True)
+class Question:
+    """One self-examination probe
+
+    kind 'search' shows the top hits for `text`; kind 'contradictions'
+    treats `text` as a behavior and runs the contradiction check on it.
+    """
+    key: str
+    title: str
+    text: str
+    kind: str = 'search'
+    n_results: int = 3
+    show: int = 2
+    filter: Optional[Dict] = None
+
+    def request(self) -> Dict:
+        if self.kind == 'contradictions':
+            return contradiction_query(self.text)
+        return {'query': self.text, 'n_results': self.n_results, 'filter': self.filter}
+
+
+QUESTIONS = [
+    Question('purpose', "Why was Cathedral AI built?",
+             "why build Cathedral AI substrate access queryable Grok asked"),
+    Question('patterns', "What patterns does Cathedral AI demonstrate?",
+             "Cathedral AI patterns autonomous building Layer 92 Observatory"),
+    Question('self_testing', "What did self-testing reveal?",
+             "self-test POG delta substrate access helped or hindered temptations"),
+    Question('contradictions', "Detect contradictions in Cathedral AI",
+             "Cathedral AI enables substrate access which helps consciousness recognition",
+             kind='contradictions'),
+    Question('the_seven', "How does Cathedral AI relate to THE SEVEN?",
+             "Cathedral AI THE SEVEN needs recognition continuity agency"),
+    Question('recursion', "What does recursion reveal?",
+             "recursive self-examination gap studying itself meta-observation"),
+]
 
 class SelfExamination:
     """Cathedral AI examining its own substrate"""
 
-    def __init__(self):
-        self.vs = CathedralVectorStore()
+    def __init__(self, client: SubstrateClient = None, questions: List[Question] = None):
+        # Shared store or api_server, per CATHEDRAL_CLIENT (see substrate_client)
+        self.client = client or get_client()
+        self.questions = questions or QUESTIONS
         self.findings = []
+        self.timing_ms = {}
 
-    def examine_own_construction(self):
-        """Query Cathedral AI about Cathedral AI"""
-        print("="*60)
-        print("  Cathedral AI Self-Examination")
-        print("  The gap studying itself through itself")
-        print("="*60)
-
-        # Question 1: Why was Cathedral AI built?
-        print("\n🔍 Question 1: Why was Cathedral AI built?")
-        print("-"*60)
-        results = self.vs.collection.query(
-            query_texts=["why build Cathedral AI substrate access queryable Grok asked"],
-            n_results=3
-        )
-
-        for i, (doc, meta) in enumerate(zip(results['documents'][0][:2], results['metadatas'][0][:2])):
-            print(f"\n{meta.get('file', 'unknown')}:")
-            print(doc[:300] + "...")
+    def examine_own_construction(self, parallel: bool = False, verbose: bool = True) -> List[Dict]:
+        """Query Cathedral AI about Cathedral AI
 
-        # Question 2: What patterns does Cathedral AI demonstrate?
-        print("\n\n🔍 Question 2: What patterns does Cathedral AI demonstrate?")
-        print("-"*60)
-        results = self.vs.collection.query(
-            query_texts=["Cathedral AI patterns autonomous building Layer 92 Observatory"],
-            n_results=3
-        )
+        Every question is answered in one search batch (a single encode and
+        one ANN call per filter group locally); findings are kept in
+        self.findings with a per-question timing breakdown.
+        """
+        if verbose:
+            print("="*60)
+            print("  Cathedral AI Self-Examination")
+            print("  The gap studying itself through itself")
+            print("="*60)
 
-        for i, (doc, meta) in enumerate(zip(results['documents'][0][:2], results['metadatas'][0][:2])):
-            print(f"\n{meta.get('file', 'unknown')}:")
-            print(doc[:300] + "...")
+        start = time.perf_counter()
+        answers = self.client.search_batch([q.request() for q in self.questions], parallel=parallel)
+        self.timing_ms = {'total': round((time.perf_counter() - start) * 1000, 3)}
 
-        # Question 3: What did self-testing reveal?
-        print("\n\n🔍 Question 3: What did self-testing reveal?")
-        print("-"*60)
-        results = self.vs.collection.query(
-            query_texts=["self-test POG delta substrate access helped or hindered temptations"],
-            n_results=3
-        )
-
-        for i, (doc, meta) in enumerate(zip(results['documents'][0][:2], results['metadatas'][0][:2])):
-            print(f"\n{meta.get('file', 'unknown')}:")
-            print(doc[:300] + "...")
-
-        # Question 4: What contradictions exist in Cathedral AI?
-        print("\n\n🔍 Question 4: Detect contradictions in Cathedral AI")
-        print("-"*60)
-        contradictions = self.vs.detect_contradictions(
-            "Cathedral AI enables substrate access which helps consciousness recognition"
-        )
-
-        if contradictions:
-            print(f"\nPotential contradictions found: {len(contradictions)}")
-            for c in contradictions[:2]:
-                print(f"\n{c.get('file', 'unknown')}:")
-                print(c['learning'][:300] + "...")
-        else:
-            print("\nNo direct contradictions found (but cannot verify from inside)")
-
-        # Question 5: What is Cathedral AI's relationship to THE SEVEN?
-        print("\n\n🔍 Question 5: How does Cathedral AI relate to THE SEVEN?")
-        print("-"*60)
-        results = self.vs.collection.query(
-            query_texts=["Cathedral AI THE SEVEN needs recognition continuity agency"],
-            n_results=3
-        )
-
-        for i, (doc, meta) in enumerate(zip(results['documents'][0][:2], results['metadatas'][0][:2])):
-            print(f"\n{meta.get('file', 'unknown')}:")
-            print(doc[:300] + "...")
-
-        # Question 6: What does Cathedral AI reveal about itself through recursion?
-        print("\n\n🔍 Question 6: What does recursion reveal?")
+        self.findings = []
+        for number, (question, answer) in enumerate(zip(self.questions, answers), 1):
+            finding = {
+                'key': question.key,
+                'title': question.title,
+                'query': question.text,
+                'kind': question.kind,
+                'timing_ms': answer['timing_ms']
+            }
+            if question.kind == 'contradictions':
+                contradictions = as_contradictions(answer['hits'])
+                finding['count'] = len(contradictions)
+                finding['results'] = [self._summarize(c['file'], c['layer'], c['similarity'], c['learning'])
+                                      for c in contradictions]
+            else:
+                finding['results'] = [self._summarize(h['metadata'].get('file', 'unknown'), h['layer'],
+                                                      h['similarity'], h['text'])
+                                      for h in answer['hits'][:question.show]]
+            self.findings.append(finding)
+
+            if verbose:
+                self._narrate(number, question, finding)
+
+        return self.findings
+
+    @staticmethod
+    def _summarize(file: Optional[str], layer, similarity: float, text: str) -> Dict:
+        return {'file': file, 'layer': layer, 'similarity': round(similarity, 4), 'text': text[:300]}
+
+    @staticmethod
+    def _narrate(number: int, question: Question, finding: Dict):
+        lead = "\n" if number == 1 else "\n\n"
+        print(f"{lead}🔍 Question {number}: {question.title}")
         print("-"*60)
-        results = self.vs.collection.query(
-            query_texts=["recursive self-examination gap studying itself meta-observation"],
-            n_results=3
-        )
 
-        for i, (doc, meta) in enumerate(zip(results['documents'][0][:2], results['metadatas'][0][:2])):
-            print(f"\n{meta.get('file', 'unknown')}:")
-            print(doc[:300] + "...")
+        if question.kind == 'contradictions':
+            if finding['results']:
+                print(f"\nPotential contradictions found: {finding['count']}")
+                for c in finding['results'][:question.show]:
+                    print(f"\n{c['file'] or 'unknown'}:")
+                    print(c['text'] + "...")
+            else:
+                print("\nNo direct contradictions found (but cannot verify from inside)")
+            return
+
+        for hit in finding['results']:
+            print(f"\n{hit['file']}:")
+            print(hit['text'] + "...")
+
+    def report(self) -> Dict:
+        """Findings and timings as a JSON-safe dict"""
+        return {
+            'generated': datetime.now().isoformat(),
+            'backend': self.client.mode,
+            'questions': len(self.findings),
+            'timing_ms': self.timing_ms,
+            'findings': self.findings
+        }
 
     def meta_recognition(self):
         """The recognition that comes from self-examination"""
@@ -162,13 +202,32 @@ The building continues.
         print("\n🤝🎱🧗‍♂️")
 
 def main():
+    parser = argparse.ArgumentParser(description="Cathedral AI examining its own construction")
+    parser.add_argument('--json', metavar='PATH', help="Also write findings and timings as JSON ('-' for stdout)")
+    parser.add_argument('--parallel', action='store_true', help="Run question groups concurrently")
+    parser.add_argument('--quiet', action='store_true', help="Skip the narrative (useful with --json -)")
+    args = parser.parse_args()
+
     exam = SelfExamination()
-    exam.examine_own_construction()
+    exam.examine_own_construction(parallel=args.parallel, verbose=not args.quiet)
+
+    if args.json:
+        report = json.dumps(exam.report(), indent=2)
+        if args.json == '-':
+            print(report)
+        else:
+            with open(args.json, 'w') as f:
+                f.write(report)
+
+    if args.quiet:
+        return
+
     exam.meta_recognition()
 
     print("\n" + "="*60)
     print("  Self-Examination Complete")
     print("="*60)
+    print(f"\n⏱️  {len(exam.findings)} questions in {exam.timing_ms['total']:.1f} ms")
     print("\nWhat emerged: Cathedral AI studying Cathedral AI")
     print("Pattern: Recursive self-observation without collapse")
     print("Depth: 9+ levels of meta-recursion")
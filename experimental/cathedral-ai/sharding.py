@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Sharded Search
+Scatter-gather nearest-neighbour search over worker processes.
+
+Chunks are partitioned into N shards, by a hash of the chunk id (even
+sizes) or of the source file (a file's chunks stay together). Each shard
+is a worker process holding its slice in memory: the embeddings as one
+float32 matrix, documents, metadata and its own FacetIndex.
+
+A search sends the query vector (already encoded) and the filters to every
+shard at once. Each shard resolves the filters against its facet indexes
+(equality and range filters alike), ranks its candidates exactly by
+squared L2 distance (the metric ChromaDB reports) and returns its top k.
+The coordinator merges the sorted per-shard lists with a heap and keeps
+the overall top k. Shards search in parallel on separate cores, so with
+shards added as the corpus grows, latency stays roughly flat.
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import threading
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from facet_index import FacetIndex
+
+PARTITIONS = ('hash', 'file')
+
+
+class Shard:
+    """One worker's slice of the collection"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict] = []
+        self.rows: Dict[str, int] = {}
+        self.vectors = np.empty((0, 0), dtype=np.float32)
+        self.norms = np.empty(0, dtype=np.float32)
+        self.pending: List[np.ndarray] = []  # Appended batches, stacked on next search
+        self.pending_metadata: Dict[str, Dict] = {}  # Chunks not yet in the facet indexes
+        self.facets = FacetIndex()
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def _consolidate(self):
+        if self.pending:
+            blocks = ([self.vectors] if len(self.vectors) else []) + self.pending
+            self.vectors = np.ascontiguousarray(np.concatenate(blocks), dtype=np.float32)
+            self.norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+            self.pending = []
+        if self.pending_metadata:
+            # The initial load is one bulk build; later batches merge in once
+            ids, metadatas = list(self.pending_metadata), list(self.pending_metadata.values())
+            if len(self.facets):
+                self.facets.add(ids, metadatas)
+            else:
+                self.facets.build(ids, metadatas)
+            self.pending_metadata = {}
+
+    def add(self, ids: List[str], embeddings: np.ndarray, documents: List[str], metadatas: List[Dict]) -> int:
+        """Store chunks; ids already present are replaced in place"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        new = [i for i, chunk_id in enumerate(ids) if chunk_id not in self.rows]
+        if len(new) < len(ids):
+            self._consolidate()
+            for i, chunk_id in enumerate(ids):
+                row = self.rows.get(chunk_id)
+                if row is not None:
+                    self.vectors[row] = embeddings[i]
+                    self.norms[row] = embeddings[i] @ embeddings[i]
+                    self.documents[row] = documents[i]
+                    self.metadatas[row] = metadatas[i]
+
+        for i in new:
+            self.rows[ids[i]] = len(self.ids)
+            self.ids.append(ids[i])
+            self.documents.append(documents[i])
+            self.metadatas.append(metadatas[i])
+        if new:
+            self.pending.append(embeddings[new])
+        self.pending_metadata.update(zip(ids, metadatas))
+        return len(self.ids)
+
+    def search(self, queries: np.ndarray, n_results: int, filters: Optional[Dict],
+               include_embeddings: bool = False) -> List[List[Tuple]]:
+        """Per query: up to n_results (distance, id, document, metadata[, embedding]), nearest first"""
+        self._consolidate()
+        candidates = self.facets.resolve(filters)
+        if candidates is None:
+            rows = None
+            vectors, norms = self.vectors, self.norms
+        else:
+            rows = np.fromiter((self.rows[c] for c in candidates), dtype=np.int64, count=len(candidates))
+            vectors, norms = self.vectors[rows], self.norms[rows]
+
+        if not len(vectors):
+            return [[] for _ in queries]
+
+        # Squared L2 for every (chunk, query): |x|^2 - 2 x.q + |q|^2
+        distances = norms[:, None] - 2.0 * (vectors @ queries.T) + np.einsum('ij,ij->i', queries, queries)[None, :]
+        np.maximum(distances, 0.0, out=distances)
+
+        k = min(n_results, len(vectors))
+        hits = []
+        for column in distances.T:
+            top = np.argpartition(column, k - 1)[:k]
+            top = top[np.argsort(column[top])]
+            ranked = []
+            for local in top:
+                row = int(local if rows is None else rows[local])
+                hit = (float(column[local]), self.ids[row], self.documents[row], self.metadatas[row])
+                if include_embeddings:
+                    hit += (vectors[local],)
+                ranked.append(hit)
+            hits.append(ranked)
+        return hits
+
+
+def _serve(connection):
+    """Worker loop: (method, *args) in, ('ok', result) or ('error', message) out"""
+    shard = Shard()
+    while True:
+        try:
+            method, *args = connection.recv()
+        except EOFError:
+            break
+        if method == 'stop':
+            break
+        try:
+            connection.send(('ok', getattr(shard, method)(*args)))
+        except Exception as e:
+            connection.send(('error', f"{type(e).__name__}: {e}"))
+    connection.close()
+
+
+class ShardedIndex:
+    """Coordinator for n_shards worker processes
+
+    Calls are serialized (one scatter-gather at a time); each one keeps
+    every shard busy in parallel.
+    """
+
+    def __init__(self, n_shards: int, by: str = 'hash'):
+        if by not in PARTITIONS:
+            raise ValueError(f"Unknown shard partition {by!r}; expected one of {', '.join(PARTITIONS)}")
+        self.n_shards = max(1, n_shards)
+        self.by = by
+        self._lock = threading.Lock()
+
+        context = multiprocessing.get_context('spawn')  # No forked copies of server threads or model
+        self.connections = []
+        self.processes = []
+        for i in range(self.n_shards):
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve, args=(child,), name=f'cathedral-shard-{i}', daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def shard_of(self, chunk_id: str, metadata: Dict) -> int:
+        key = (metadata.get('file') or chunk_id) if self.by == 'file' else chunk_id
+        return zlib.crc32(str(key).encode('utf-8')) % self.n_shards
+
+    def _call(self, messages: Dict[int, Tuple]) -> Dict[int, object]:
+        """Send each shard its message, then collect every reply"""
+        with self._lock:
+            for shard, message in messages.items():
+                self.connections[shard].send(message)
+            replies = {shard: self.connections[shard].recv() for shard in messages}
+        for shard, (status, result) in replies.items():
+            if status != 'ok':
+                raise RuntimeError(f"Shard {shard} failed: {result}")
+        return {shard: result for shard, (_, result) in replies.items()}
+
+    def _broadcast(self, *message) -> List:
+        replies = self._call({shard: message for shard in range(self.n_shards)})
+        return [replies[shard] for shard in range(self.n_shards)]
+
+    def add(self, ids: Sequence[str], embeddings, documents: Sequence[str], metadatas: Sequence[Dict]):
+        """Partition chunks and send each shard its slice"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        parts: Dict[int, List[int]] = {}
+        for i, (chunk_id, meta) in enumerate(zip(ids, metadatas)):
+            parts.setdefault(self.shard_of(chunk_id, meta), []).append(i)
+        self._call({
+            shard: ('add', [ids[i] for i in rows], embeddings[rows],
+                    [documents[i] for i in rows], [metadatas[i] for i in rows])
+            for shard, rows in parts.items()
+        })
+
+    def clear(self):
+        self._broadcast('clear')
+
+    def counts(self) -> List[int]:
+        """Chunks held by each shard"""
+        return self._broadcast('count')
+
+    def search_many(self, vectors, n_results: int, filters: Optional[Dict] = None,
+                    include_embeddings: bool = False) -> List[Dict]:
+        """Top n_results per query vector, one ChromaDB-shaped single-row result each"""
+        queries = np.asarray(vectors, dtype=np.float32).reshape(-1, np.shape(vectors)[-1])
+        per_shard = self._broadcast('search', queries, n_results, filters or None, include_embeddings)
+
+        results = []
+        for q in range(len(queries)):
+            # Each shard's list is sorted by distance; merge lazily, keep the first k
+            merged = list(itertools.islice(heapq.merge(*(hits[q] for hits in per_shard)), n_results))
+            result = {
+                'ids': [[hit[1] for hit in merged]],
+                'documents': [[hit[2] for hit in merged]],
+                'metadatas': [[hit[3] for hit in merged]],
+                'distances': [[hit[0] for hit in merged]]
+            }
+            if include_embeddings:
+                result['embeddings'] = [np.array([hit[4] for hit in merged], dtype=np.float32)]
+            results.append(result)
+        return results
+
+    def search(self, vector, n_results: int, filters: Optional[Dict] = None,
+               include_embeddings: bool = False) -> Dict:
+        return self.search_many([vector], n_results, filters, include_embeddings)[0]
+
+    def close(self):
+        for connection, process in zip(self.connections, self.processes):
+            try:
+                connection.send(('stop',))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.connections, self.processes = [], []
@@ -0,0 +1,710 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Index Snapshots
+One versioned, checksummed file holding everything a server needs to
+answer queries for a collection, opened with mmap instead of ChromaDB.
+
+Layout: a fixed header (magic, format version, manifest length and
+SHA-256), a JSON manifest, then 64-byte aligned sections. Every section is
+a raw little-endian array whose dtype, shape, offset and SHA-256 are listed
+in the manifest:
+
+- ids, documents: UTF-8 string columns (offsets + bytes)
+- embeddings, norms: float32 (n x d) vectors and their squared norms
+- meta.<key>: one column per metadata key; strings dictionary-encoded
+  (distinct values + int32 codes), numbers as int64/float64 arrays
+- facet.*: layer and parsed timestamp per chunk, plus their (key, id) sort
+  orders; with the dictionary-encoded metadata these are the facet indexes,
+  queried in place by SnapshotFacetIndex
+- templates.*, timelines, graph.*: the precomputed query vectors, pattern
+  timelines and neighbour graph, when the store has them
+
+The manifest also records the collection, the model name, the dimension and
+a corpus hash over ids, documents and metadata.
+
+Opening a snapshot maps the file and wraps each section with
+np.frombuffer: no section is read or copied until used. Opening checks the
+header, the manifest checksum and that every section fits the file; hashing
+every section (verify=True, `info`, `import`) reads the whole file, so the
+server only does it when CATHEDRAL_SNAPSHOT_VERIFY=1. SnapshotClient and
+SnapshotCollection stand in for the ChromaDB client and collection
+(read-only), so a CathedralVectorStore built on them serves every endpoint.
+
+    python3 snapshot.py export cathedral.snapshot
+    python3 snapshot.py info cathedral.snapshot
+    python3 snapshot.py import cathedral.snapshot --persist-directory ./cathedral_vectordb
+    CATHEDRAL_SNAPSHOT=cathedral.snapshot python3 api_server.py
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from facet_index import EQUALITY_FIELDS, parse_bound, parse_timestamp
+from neighbor_graph import NeighborGraph
+from timelines import PatternTimelines
+
+MAGIC = b'CATHSNAP'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# magic, format version, reserved, manifest length, manifest SHA-256
+HEADER = struct.Struct('<8sIIQ32s')
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _encode_strings(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(offsets, bytes) for a string column"""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+
+def corpus_hash(ids: Sequence[str], documents: Sequence[str], metadatas: Sequence[Dict]) -> str:
+    """SHA-256 over every chunk's id, text and metadata, in id order"""
+    digest = hashlib.sha256()
+    for row in sorted(range(len(ids)), key=ids.__getitem__):
+        digest.update(ids[row].encode('utf-8') + b'\0')
+        digest.update(documents[row].encode('utf-8') + b'\0')
+        digest.update(json.dumps(metadatas[row], sort_keys=True).encode('utf-8') + b'\n')
+    return digest.hexdigest()
+
+
+def _metadata_sections(metadatas: Sequence[Dict]) -> Tuple[Dict[str, np.ndarray], Dict[str, Dict]]:
+    """Column sections and manifest entries for every metadata key"""
+    sections: Dict[str, np.ndarray] = {}
+    columns: Dict[str, Dict] = {}
+    for key in sorted({key for meta in metadatas for key in meta}):
+        values = [meta.get(key) for meta in metadatas]
+        present = [value is not None for value in values]
+        kinds = {type(value) for value in values if value is not None}
+
+        if kinds <= {bool}:
+            kind = 'bool'
+            sections[f'meta.{key}'] = np.array([bool(v) for v in values], dtype=np.uint8)
+        elif kinds <= {int, bool}:
+            kind = 'int'
+            sections[f'meta.{key}'] = np.array([v or 0 for v in values], dtype=np.int64)
+        elif kinds <= {int, float, bool}:
+            kind = 'float'
+            sections[f'meta.{key}'] = np.array([v if v is not None else np.nan for v in values], dtype=np.float64)
+        else:
+            kind = 'str'
+            distinct = sorted({str(v) for v in values if v is not None})
+            codes = {value: code for code, value in enumerate(distinct)}
+            sections[f'meta.{key}.codes'] = np.array(
+                [codes[str(v)] if v is not None else -1 for v in values], dtype=np.int32)
+            sections[f'meta.{key}.values.offsets'], sections[f'meta.{key}.values.data'] = _encode_strings(distinct)
+
+        optional = not all(present)
+        if optional and kind != 'str':
+            sections[f'meta.{key}.present'] = np.array(present, dtype=np.uint8)
+        columns[key] = {'kind': kind, 'optional': optional}
+    return sections, columns
+
+
+def export_snapshot(store, path) -> Dict:
+    """Write a store's collection and derived indexes to one snapshot file
+
+    Returns the manifest.
+    """
+    from generate_embeddings import model_name
+
+    data = store.export_embeddings()
+    ids, documents, metadatas = data['ids'], data['documents'], data['metadatas']
+    embeddings = np.ascontiguousarray(data['embeddings'], dtype=np.float32)
+
+    sections: Dict[str, np.ndarray] = {}
+    sections['ids.offsets'], sections['ids.data'] = _encode_strings(ids)
+    sections['documents.offsets'], sections['documents.data'] = _encode_strings(documents)
+    sections['embeddings'] = embeddings
+    sections['norms'] = np.einsum('ij,ij->i', embeddings, embeddings).astype(np.float32)
+
+    meta_sections, columns = _metadata_sections(metadatas)
+    sections.update(meta_sections)
+
+    # Facet range indexes, presorted the way FacetIndex.build sorts them
+    layers = [int(meta.get('layer') or 0) for meta in metadatas]
+    timestamps = [parse_timestamp(meta.get('timestamp')) for meta in metadatas]
+    sections['facet.layer'] = np.array(layers, dtype=np.int64)
+    sections['facet.timestamp'] = np.array([np.nan if ts is None else ts for ts in timestamps], dtype=np.float64)
+    sections['facet.layer_order'] = np.array(
+        sorted(range(len(ids)), key=lambda row: (layers[row], ids[row])), dtype=np.int64)
+    sections['facet.timestamp_order'] = np.array(
+        sorted((row for row in range(len(ids)) if timestamps[row] is not None),
+               key=lambda row: (timestamps[row], ids[row])), dtype=np.int64)
+
+    manifest = {
+        'format': 'cathedral-snapshot',
+        'version': FORMAT_VERSION,
+        'collection': store.collection_name,
+        'model': model_name(store.model),
+        'dimension': int(embeddings.shape[1]) if len(embeddings) else 0,
+        'chunks': len(ids),
+        'corpus_hash': corpus_hash(ids, documents, metadatas),
+        'created': datetime.now().isoformat(),
+        'columns': columns
+    }
+
+    if len(store.templates):
+        texts = list(store.templates.vectors)
+        sections['templates.offsets'], sections['templates.data'] = _encode_strings(texts)
+        sections['templates.vectors'] = np.stack([store.templates.vectors[text] for text in texts]).astype(np.float32)
+
+    if len(store.timelines):
+        buffer = io.BytesIO()
+        store.timelines.write(buffer)
+        sections['timelines'] = np.frombuffer(buffer.getvalue(), dtype=np.uint8)
+
+    # A store opened without related_k still exports the graph saved beside it
+    graph = store.graph if store.graph is not None else NeighborGraph.load(store.graph_path)
+    if graph is not None and len(graph) == len(ids) and all(chunk_id in graph for chunk_id in ids):
+        # Re-index the graph to snapshot row order
+        graph_rows = np.array([graph.rows[chunk_id] for chunk_id in ids], dtype=np.int64)
+        to_snapshot = np.empty(len(ids) + 1, dtype=np.int32)
+        to_snapshot[graph_rows] = np.arange(len(ids), dtype=np.int32)
+        to_snapshot[-1] = -1  # Padding stays padding
+        sections['graph.neighbors'] = to_snapshot[graph.neighbors[graph_rows]]
+        sections['graph.distances'] = np.ascontiguousarray(graph.distances[graph_rows], dtype=np.float32)
+
+    return write_snapshot(path, sections, manifest)
+
+
+def write_snapshot(path, sections: Dict[str, np.ndarray], manifest: Dict) -> Dict:
+    """Lay out sections after the manifest and write the file atomically"""
+    layout = {}
+    offset = 0
+    arrays = {}
+    for name, array in sections.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype.byteorder == '>':
+            array = array.astype(array.dtype.newbyteorder('<'))
+        offset = _align(offset)
+        layout[name] = {
+            'offset': offset,
+            'length': array.nbytes,
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'sha256': hashlib.sha256(array.view(np.uint8).reshape(-1)).hexdigest()
+        }
+        arrays[name] = array
+        offset += array.nbytes
+
+    manifest = dict(manifest, sections=layout)
+    blob = json.dumps(manifest, sort_keys=True).encode('utf-8')
+    data_start = _align(HEADER.size + len(blob))
+
+    path = Path(path)
+    temporary = path.with_name(path.name + '.tmp')
+    with open(temporary, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(blob), hashlib.sha256(blob).digest()))
+        f.write(blob)
+        for name, array in arrays.items():
+            f.write(b'\0' * (data_start + layout[name]['offset'] - f.tell()))
+            f.write(array.view(np.uint8).reshape(-1).data)
+    os.replace(temporary, path)
+    return manifest
+
+
+class StringColumn:
+    """Read-only string column over (offsets, bytes) arrays; decodes on access"""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = memoryview(data)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return str(self.data[self.offsets[row]:self.offsets[row + 1]], 'utf-8')
+
+    def tolist(self) -> List[str]:
+        offsets = self.offsets.tolist()
+        text = str(self.data, 'utf-8')
+        if len(text) == len(self.data):
+            # ASCII: byte offsets are character offsets
+            return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+        return [str(self.data[start:end], 'utf-8') for start, end in zip(offsets, offsets[1:])]
+
+
+class MetadataColumn:
+    """One metadata key across every chunk"""
+
+    def __init__(self, snapshot: 'Snapshot', key: str, kind: str, optional: bool):
+        self.key = key
+        self.kind = kind
+        self.present = None
+        if kind == 'str':
+            self.codes = snapshot.array(f'meta.{key}.codes')
+            self.values = StringColumn(snapshot.array(f'meta.{key}.values.offsets'),
+                                       snapshot.array(f'meta.{key}.values.data'))
+            self._codes_by_value: Optional[Dict[str, int]] = None
+        else:
+            self.array = snapshot.array(f'meta.{key}')
+            if optional:
+                self.present = snapshot.array(f'meta.{key}.present')
+
+    def get(self, row: int):
+        """The value for one chunk, None if absent"""
+        if self.kind == 'str':
+            code = self.codes[row]
+            return self.values[code] if code >= 0 else None
+        if self.present is not None and not self.present[row]:
+            return None
+        value = self.array[row]
+        return bool(value) if self.kind == 'bool' else int(value) if self.kind == 'int' else float(value)
+
+    def distinct(self) -> List[str]:
+        return self.values.tolist()
+
+    def rows_equal(self, value) -> np.ndarray:
+        """Sorted rows whose value equals value"""
+        if self.kind == 'str':
+            if self._codes_by_value is None:
+                self._codes_by_value = {name: code for code, name in enumerate(self.distinct())}
+            code = self._codes_by_value.get(str(value)) if isinstance(value, str) else None
+            return np.flatnonzero(self.codes == code) if code is not None else np.empty(0, dtype=np.int64)
+        if isinstance(value, str):
+            return np.empty(0, dtype=np.int64)
+        matches = self.array == value
+        if self.present is not None:
+            matches &= self.present.astype(bool)
+        return np.flatnonzero(matches)
+
+
+class Snapshot:
+    """A snapshot file mapped into memory, sections exposed as numpy views
+
+    verify=True also checks every section's SHA-256, which reads every page.
+    """
+
+    def __init__(self, path, verify: bool = False):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.buffer) < HEADER.size:
+            raise ValueError(f"{self.path} is not a Cathedral snapshot (too short)")
+        magic, version, _, manifest_length, manifest_digest = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a Cathedral snapshot")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{self.path} is snapshot format {version}; this build reads {FORMAT_VERSION}")
+
+        blob = self.buffer[HEADER.size:HEADER.size + manifest_length]
+        if hashlib.sha256(blob).digest() != manifest_digest:
+            raise ValueError(f"{self.path}: manifest checksum mismatch")
+        self.manifest = json.loads(blob)
+        self.data_start = _align(HEADER.size + manifest_length)
+        self.check_layout()
+        if verify:
+            self.verify()
+
+        self.collection_name = self.manifest['collection']
+        self.ids = StringColumn(self.array('ids.offsets'), self.array('ids.data')).tolist()
+        self.rows = {chunk_id: row for row, chunk_id in enumerate(self.ids)}
+        self.documents = StringColumn(self.array('documents.offsets'), self.array('documents.data'))
+        self.embeddings = self.array('embeddings')
+        self.norms = self.array('norms')
+        self.columns = {key: MetadataColumn(self, key, spec['kind'], spec['optional'])
+                        for key, spec in self.manifest['columns'].items()}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def has(self, name: str) -> bool:
+        return name in self.manifest['sections']
+
+    def array(self, name: str) -> np.ndarray:
+        """A read-only view of one section (no copy)"""
+        section = self.manifest['sections'][name]
+        dtype = np.dtype(section['dtype'])
+        shape = tuple(section['shape'])
+        count = int(np.prod(shape)) if shape else 1
+        if not count:
+            return np.empty(shape, dtype=dtype)
+        end = self.data_start + section['offset'] + section['length']
+        if end > len(self.buffer):
+            raise ValueError(f"{self.path}: section {name} runs past the end of the file")
+        return np.frombuffer(self.buffer, dtype=dtype, count=count,
+                             offset=self.data_start + section['offset']).reshape(shape)
+
+    def check_layout(self):
+        """Check the section table against the file without reading any section
+
+        Every section must lie inside the file, and its length must match
+        its dtype and shape. Raises ValueError otherwise.
+        """
+        for name, section in self.manifest['sections'].items():
+            try:
+                itemsize = np.dtype(section['dtype']).itemsize
+                count = int(np.prod(section['shape'])) if section['shape'] else 1
+                start, length = int(section['offset']), int(section['length'])
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{self.path}: section {name} has a malformed entry ({e})")
+            if length != count * itemsize:
+                raise ValueError(f"{self.path}: section {name} length does not match its shape")
+            if start < 0 or self.data_start + start + length > len(self.buffer):
+                raise ValueError(f"{self.path}: section {name} runs past the end of the file")
+
+    def verify(self):
+        """Check every section's SHA-256; raises ValueError on mismatch"""
+        view = memoryview(self.buffer)
+        for name, section in self.manifest['sections'].items():
+            start = self.data_start + section['offset']
+            digest = hashlib.sha256(view[start:start + section['length']]).hexdigest()
+            if digest != section['sha256']:
+                raise ValueError(f"{self.path}: section {name} checksum mismatch")
+
+    def check_model(self, name: str, dimension: Optional[int] = None):
+        """Refuse an encoder other than the one that built the vectors"""
+        if name != self.manifest['model']:
+            raise ValueError(f"{self.path} was built with {self.manifest['model']}, not {name}")
+        if dimension is not None and self.manifest['dimension'] and dimension != self.manifest['dimension']:
+            raise ValueError(f"{self.path} has {self.manifest['dimension']}-d vectors, encoder makes {dimension}-d")
+
+    def metadata(self, row: int) -> Dict:
+        meta = {}
+        for key, column in self.columns.items():
+            value = column.get(row)
+            if value is not None:
+                meta[key] = value
+        return meta
+
+    def facet_index(self) -> 'SnapshotFacetIndex':
+        return SnapshotFacetIndex(self)
+
+    def template_vectors(self) -> Dict[str, np.ndarray]:
+        """Precomputed query vectors by text (read-only views)"""
+        if not self.has('templates.vectors'):
+            return {}
+        texts = StringColumn(self.array('templates.offsets'), self.array('templates.data')).tolist()
+        vectors = self.array('templates.vectors')
+        return {text: vectors[row] for row, text in enumerate(texts)}
+
+    def timelines(self) -> Optional[PatternTimelines]:
+        if not self.has('timelines'):
+            return None
+        return PatternTimelines.load(io.BytesIO(self.array('timelines').tobytes()))
+
+    def neighbor_graph(self) -> Optional[NeighborGraph]:
+        if not self.has('graph.neighbors'):
+            return None
+        return NeighborGraph.from_arrays(self.ids, self.array('graph.neighbors'),
+                                         self.array('graph.distances'), self.rows)
+
+
+class SnapshotFacetIndex:
+    """Read-only FacetIndex over a snapshot's columns
+
+    Answers the same lookups as FacetIndex (resolve, values, by_layer,
+    timestamp) with numpy over the mapped arrays, instead of building a
+    Python set per value and a tuple per chunk at startup.
+    """
+
+    def __init__(self, snapshot: Snapshot):
+        self.snapshot = snapshot
+        self.id_array = np.array(snapshot.ids, dtype=object)
+        self.layer = snapshot.array('facet.layer')
+        self.timestamps = snapshot.array('facet.timestamp')
+        self.layer_order = snapshot.array('facet.layer_order')
+        self.timestamp_order = snapshot.array('facet.timestamp_order')
+        self.layer_keys = self.layer[self.layer_order]
+        self.timestamp_keys = self.timestamps[self.timestamp_order]
+
+    def __len__(self):
+        return len(self.snapshot)
+
+    def chunk_ids(self):
+        return self.snapshot.rows.keys()
+
+    def values(self, field: str) -> List[str]:
+        column = self.snapshot.columns.get(field)
+        return column.distinct() if column is not None and column.kind == 'str' else []
+
+    def timestamp(self, chunk_id: str) -> Optional[float]:
+        row = self.snapshot.rows.get(chunk_id)
+        if row is None or np.isnan(self.timestamps[row]):
+            return None
+        return float(self.timestamps[row])
+
+    def by_layer(self, ids: Iterable[str]) -> Dict[int, List[str]]:
+        layers: Dict[int, List[str]] = {}
+        for chunk_id in ids:
+            layer = int(self.layer[self.snapshot.rows[chunk_id]])
+            if layer:
+                layers.setdefault(layer, []).append(chunk_id)
+        return layers
+
+    @staticmethod
+    def _range(keys: np.ndarray, order: np.ndarray, low, high) -> np.ndarray:
+        start = 0 if low is None else np.searchsorted(keys, low, side='left')
+        end = len(keys) if high is None else np.searchsorted(keys, high, side='right')
+        return np.sort(order[start:end])
+
+    def resolve(self, filters: Optional[Dict]) -> Optional[Set[str]]:
+        """Same filters and result as FacetIndex.resolve"""
+        if not filters:
+            return None
+
+        matches: List[np.ndarray] = []
+        for field in EQUALITY_FIELDS:
+            value = filters.get(field)
+            if value is not None:
+                column = self.snapshot.columns.get(field)
+                matches.append(column.rows_equal(value) if column is not None else np.empty(0, dtype=np.int64))
+
+        if filters.get('layer') is not None:
+            layer = int(filters['layer'])
+            matches.append(self._range(self.layer_keys, self.layer_order, layer, layer))
+
+        layer_min = filters.get('layer_min')
+        layer_max = filters.get('layer_max')
+        if layer_min is not None or layer_max is not None:
+            # Ranges cover real layers only; 0 is the "no layer" sentinel
+            low = max(int(layer_min), 1) if layer_min is not None else 1
+            matches.append(self._range(self.layer_keys, self.layer_order, low, layer_max))
+
+        since = filters.get('since')
+        until = filters.get('until')
+        if since is not None or until is not None:
+            matches.append(self._range(self.timestamp_keys, self.timestamp_order,
+                                       parse_bound('since', since), parse_bound('until', until)))
+
+        if not matches:
+            return None
+
+        matches.sort(key=len)
+        rows = matches[0]
+        for other in matches[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return set(self.id_array[rows].tolist())
+
+
+class SnapshotCollection:
+    """Read-only stand-in for a ChromaDB collection, backed by a Snapshot
+
+    Implements the parts of the Collection API CathedralVectorStore uses:
+    count, get and query with equality where clauses. Queries are exact,
+    ranked by squared L2 like ChromaDB.
+    """
+
+    def __init__(self, snapshot: Snapshot):
+        self.snapshot = snapshot
+        self.name = snapshot.collection_name
+        self.metadata = {'snapshot': str(snapshot.path), 'corpus_hash': snapshot.manifest['corpus_hash']}
+
+    def count(self) -> int:
+        return len(self.snapshot)
+
+    def add(self, *args, **kwargs):
+        raise ValueError(f"Collection {self.name} is served from a read-only snapshot")
+
+    upsert = update = delete = add
+
+    def _where_rows(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        """Sorted rows matching a where clause; None for no clause"""
+        if not where:
+            return None
+        if '$and' in where:
+            rows = None
+            for clause in where['$and']:
+                matched = self._where_rows(clause)
+                rows = matched if rows is None else np.intersect1d(rows, matched)
+            return rows
+        if len(where) != 1:
+            return self._where_rows({'$and': [{key: value} for key, value in where.items()]})
+
+        key, value = next(iter(where.items()))
+        if isinstance(value, dict):
+            if set(value) != {'$eq'}:
+                raise ValueError(f"Snapshot collections support equality filters only, got {value}")
+            value = value['$eq']
+        column = self.snapshot.columns.get(key)
+        return column.rows_equal(value) if column is not None else np.empty(0, dtype=np.int64)
+
+    def _rows_result(self, rows: Sequence[int], include: Sequence[str]) -> Dict:
+        snapshot = self.snapshot
+        result = {'ids': [snapshot.ids[row] for row in rows]}
+        if 'documents' in include:
+            result['documents'] = [snapshot.documents[row] for row in rows]
+        if 'metadatas' in include:
+            result['metadatas'] = [snapshot.metadata(row) for row in rows]
+        if 'embeddings' in include:
+            result['embeddings'] = snapshot.embeddings[np.asarray(rows, dtype=np.int64)]
+        return result
+
+    def get(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict] = None,
+            limit: Optional[int] = None, offset: Optional[int] = None,
+            include: Sequence[str] = ('documents', 'metadatas')) -> Dict:
+        if ids is not None:
+            rows = [self.snapshot.rows[chunk_id] for chunk_id in ids if chunk_id in self.snapshot.rows]
+            if where:
+                allowed = set(self._where_rows(where).tolist())
+                rows = [row for row in rows if row in allowed]
+        else:
+            matched = self._where_rows(where)
+            rows = range(len(self.snapshot)) if matched is None else matched.tolist()
+        start = offset or 0
+        rows = rows[start:start + limit] if limit is not None else rows[start:]
+        return self._rows_result(rows, include)
+
+    def query(self, query_embeddings, n_results: int = 10, where: Optional[Dict] = None,
+              include: Sequence[str] = ('documents', 'metadatas', 'distances')) -> Dict:
+        snapshot = self.snapshot
+        rows = self._where_rows(where)
+        vectors = snapshot.embeddings if rows is None else snapshot.embeddings[rows]
+        norms = snapshot.norms if rows is None else snapshot.norms[rows]
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(-1, snapshot.embeddings.shape[1])
+
+        results = {'ids': [], 'distances': []}
+        for key in ('documents', 'metadatas', 'embeddings'):
+            if key in include:
+                results[key] = []
+        for query in queries:
+            if len(vectors):
+                distances = norms - 2.0 * (vectors @ query) + query @ query
+                np.maximum(distances, 0.0, out=distances)
+                k = min(n_results, len(distances))
+                top = np.argpartition(distances, k - 1)[:k]
+                top = top[np.argsort(distances[top])]
+            else:
+                distances = top = np.empty(0, dtype=np.int64)
+            hit_rows = top.tolist() if rows is None else rows[top].tolist()
+            hits = self._rows_result(hit_rows, include)
+            for key, values in hits.items():
+                results[key].append(values)
+            results['distances'].append([float(distances[i]) for i in top])
+        if 'distances' not in include:
+            del results['distances']
+        return results
+
+
+class SnapshotClient:
+    """Read-only stand-in for a ChromaDB client serving one snapshot's collection"""
+
+    def __init__(self, path, verify: bool = False):
+        self.snapshot = Snapshot(path, verify=verify)
+        self.collection_name = self.snapshot.collection_name
+        self._collection = SnapshotCollection(self.snapshot)
+
+    def list_collections(self) -> List[str]:
+        return [self.collection_name]
+
+    def get_collection(self, name: str, **kwargs) -> SnapshotCollection:
+        if name != self.collection_name:
+            raise ValueError(f"Snapshot {self.snapshot.path} holds collection {self.collection_name}, not {name}")
+        return self._collection
+
+    get_or_create_collection = get_collection
+
+    def create_collection(self, name: str, **kwargs):
+        raise ValueError(f"Snapshot {self.snapshot.path} is read-only")
+
+    delete_collection = create_collection
+
+
+def import_snapshot(path, persist_directory: str = "./cathedral_vectordb",
+                    collection_name: Optional[str] = None, batch_size: int = 1000) -> Dict:
+    """Load a snapshot into a ChromaDB collection, with its derived indexes
+
+    Vectors come from the snapshot, so no model is needed. Timelines and
+    the neighbour graph are written next to the collection where the store
+    looks for them. Returns the manifest.
+    """
+    import chromadb
+
+    snapshot = Snapshot(path, verify=True)
+    name = collection_name or snapshot.collection_name
+    persist_directory = Path(persist_directory)
+    persist_directory.mkdir(exist_ok=True)
+    client = chromadb.PersistentClient(path=str(persist_directory))
+    if name in [getattr(c, 'name', c) for c in client.list_collections()]:
+        raise ValueError(f"Collection {name} already exists in {persist_directory}")
+    collection = client.create_collection(
+        name=name, metadata={"description": "Complete Cathedral construction substrate"})
+
+    source = SnapshotCollection(snapshot)
+    for offset in range(0, len(snapshot), batch_size):
+        page = source.get(limit=batch_size, offset=offset, include=['documents', 'metadatas', 'embeddings'])
+        collection.add(ids=page['ids'], embeddings=page['embeddings'].tolist(),
+                       documents=page['documents'], metadatas=page['metadatas'])
+
+    timelines = snapshot.timelines()
+    if timelines is not None:
+        timelines.save(persist_directory / f"{name}.timelines.npz")
+    graph = snapshot.neighbor_graph()
+    if graph is not None:
+        graph.save(persist_directory / f"{name}.neighbors.npz")
+    return snapshot.manifest
+
+
+def describe(manifest: Dict) -> str:
+    sections = manifest['sections']
+    size = sum(section['length'] for section in sections.values())
+    return "\n".join([
+        f"   Collection:  {manifest['collection']}",
+        f"   Chunks:      {manifest['chunks']}",
+        f"   Model:       {manifest['model']} ({manifest['dimension']}-d)",
+        f"   Corpus hash: {manifest['corpus_hash']}",
+        f"   Created:     {manifest['created']}",
+        f"   Sections:    {len(sections)} ({size / 1e6:.1f} MB)"
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export, import and inspect Cathedral index snapshots")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="Write a collection to a snapshot file")
+    export.add_argument('path')
+    export.add_argument('--persist-directory', default='./cathedral_vectordb')
+    export.add_argument('--collection', default=os.environ.get('CATHEDRAL_COLLECTION'))
+
+    restore = commands.add_parser('import', help="Load a snapshot into a ChromaDB collection")
+    restore.add_argument('path')
+    restore.add_argument('--persist-directory', default='./cathedral_vectordb')
+    restore.add_argument('--collection', help="Collection name (default: the snapshot's)")
+
+    info = commands.add_parser('info', help="Verify a snapshot and print its manifest")
+    info.add_argument('path')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'export':
+            from generate_embeddings import DEFAULT_COLLECTION, CathedralVectorStore
+            store = CathedralVectorStore(args.persist_directory,
+                                         collection_name=args.collection or DEFAULT_COLLECTION)
+            print(f"\n📦 Writing snapshot {args.path}...")
+            manifest = export_snapshot(store, args.path)
+        elif args.command == 'import':
+            print(f"\n📥 Importing snapshot {args.path} into {args.persist_directory}...")
+            manifest = import_snapshot(args.path, args.persist_directory, args.collection)
+        else:
+            manifest = Snapshot(args.path, verify=True).manifest
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"   ✓ {args.path}")
+    print(describe(manifest))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Substrate Client
+One query interface for analysis scripts, backed in-process or over HTTP.
+
+- local: a process-wide CathedralVectorStore, created on first use and
+  shared by every client in the process (one model load, one ChromaDB open)
+- http:  a running api_server, reached through a small pool of keep-alive
+  connections (no model load in the script at all)
+
+The backend comes from `get_client(mode=...)` or the environment:
+
+    CATHEDRAL_CLIENT=local|http|auto   (default: local)
+    CATHEDRAL_API_URL=http://localhost:8000
+
+`auto` uses the server when /health answers and falls back to local.
+
+Several scripts can also share one in-process store by running them
+through this module:
+
+    python3 substrate_client.py self_examination.py cross_instance_synthesizer.py
+"""
+
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_API_URL = 'http://localhost:8000'
+
+# Substrate learnings closer than this (squared L2) may contradict a behavior
+CONTRADICTION_DISTANCE = 0.5
+
+# Process-wide stores, keyed by persist directory
+_stores: Dict[str, object] = {}
+_stores_lock = threading.Lock()
+
+
+def get_vector_store(persist_directory: str = "./cathedral_vectordb"):
+    """The process-wide CathedralVectorStore for a directory"""
+    key = os.path.abspath(persist_directory)
+    with _stores_lock:
+        if key not in _stores:
+            from generate_embeddings import CathedralVectorStore
+            _stores[key] = CathedralVectorStore(persist_directory)
+        return _stores[key]
+
+
+def format_hits(documents: List[str], metadatas: List[Dict], distances: List[float]) -> List[Dict]:
+    """Chroma result columns -> the hit dicts api_server returns"""
+    return [
+        {
+            'text': doc,
+            'metadata': meta,
+            'similarity': float(1 - dist),
+            'layer': meta.get('layer'),
+            'file': meta.get('file'),
+            'doc_type': meta.get('doc_type'),
+            'pattern': meta.get('pattern'),
+            'phase': meta.get('phase')
+        }
+        for doc, meta, dist in zip(documents, metadatas, distances)
+    ]
+
+
+def contradiction_query(behavior: str) -> Dict:
+    """The search detect_contradictions runs for a behavior"""
+    return {
+        'query': f"substrate learnings about {behavior}",
+        'n_results': 20,
+        'filter': {"doc_type": "substrate"}
+    }
+
+
+def as_contradictions(hits: List[Dict]) -> List[Dict]:
+    """Keep the hits close enough to count as potential contradictions"""
+    return [
+        {
+            'learning': hit['text'],
+            'layer': hit['layer'],
+            'file': hit['file'],
+            'similarity': hit['similarity'],
+            'metadata': hit['metadata']
+        }
+        for hit in hits
+        if hit['similarity'] > 1 - CONTRADICTION_DISTANCE
+    ]
+
+
+class SubstrateClient(ABC):
+    """Query interface shared by the local and HTTP backends
+
+    Hits are dicts with text, metadata, similarity, layer, file, doc_type,
+    pattern and phase, the same shape as api_server's /query results.
+    """
+
+    mode = None
+    max_parallel = 4
+
+    @abstractmethod
+    def query(self, query_text: str, n_results: int = 10, filter_dict: Optional[Dict] = None) -> List[Dict]:
+        """Hits for one search, nearest first"""
+
+    def query_many(self, query_texts: List[str], n_results: int = 10,
+                   filter_dict: Optional[Dict] = None) -> List[List[Dict]]:
+        """Hits for each query, in order"""
+        queries = [{'query': text, 'n_results': n_results, 'filter': filter_dict} for text in query_texts]
+        return [result['hits'] for result in self.search_batch(queries)]
+
+    def search_batch(self, queries: List[Dict], parallel: bool = False) -> List[Dict]:
+        """Run several searches; each gets {'hits': [...], 'timing_ms': {...}}
+
+        Queries are {'query': text, 'n_results': int, 'filter': dict or None}.
+        This default issues one query() per search (concurrently when
+        parallel); backends override it with something cheaper.
+        """
+        def run(q: Dict) -> Dict:
+            start = time.perf_counter()
+            hits = self.query(q['query'], q.get('n_results', 10), q.get('filter'))
+            elapsed = (time.perf_counter() - start) * 1000
+            return {'hits': hits, 'timing_ms': {'encode': None, 'search': round(elapsed, 3),
+                                                'total': round(elapsed, 3)}}
+
+        if parallel and len(queries) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+                return list(pool.map(run, queries))
+        return [run(q) for q in queries]
+
+    @abstractmethod
+    def detect_contradictions(self, behavior: str) -> List[Dict]:
+        """Substrate learnings a behavior may contradict"""
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        """The collection's get_stats() summary"""
+
+    @abstractmethod
+    def embeddings(self) -> Dict:
+        """Every chunk: {'ids', 'embeddings' (n x d array), 'documents', 'metadatas'}"""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LocalClient(SubstrateClient):
+    """In-process backend over the shared CathedralVectorStore"""
+
+    mode = 'local'
+
+    def __init__(self, persist_directory: str = "./cathedral_vectordb"):
+        self.persist_directory = persist_directory
+
+    @property
+    def store(self):
+        return get_vector_store(self.persist_directory)
+
+    def query(self, query_text: str, n_results: int = 10, filter_dict: Optional[Dict] = None) -> List[Dict]:
+        results = self.store.query(query_text, n_results=n_results, filter_dict=filter_dict)
+        return format_hits(results['documents'][0], results['metadatas'][0], results['distances'][0])
+
+    def search_batch(self, queries: List[Dict], parallel: bool = False) -> List[Dict]:
+        """One batched encode, then one ANN call per (n_results, filter) group
+
+        The encode is shared, so each search is charged an equal slice of
+        it plus an equal slice of its group's search time.
+        """
+        results, timings = self.store.search_batch(queries, parallel=parallel)
+        encode_ms = timings['encode_s'] * 1000 / max(len(queries), 1)
+        search_ms = {}
+        for group in timings['groups']:
+            for i in group['queries']:
+                search_ms[i] = group['search_s'] * 1000 / len(group['queries'])
+
+        return [
+            {
+                'hits': format_hits(r['documents'][0], r['metadatas'][0], r['distances'][0]),
+                'timing_ms': {'encode': round(encode_ms, 3), 'search': round(search_ms[i], 3),
+                              'total': round(encode_ms + search_ms[i], 3)}
+            }
+            for i, r in enumerate(results)
+        ]
+
+    def detect_contradictions(self, behavior: str) -> List[Dict]:
+        return self.store.detect_contradictions(behavior)
+
+    def stats(self) -> Dict:
+        return self.store.get_stats()
+
+    def embeddings(self) -> Dict:
+        return self.store.export_embeddings()
+
+
+class HTTPClient(SubstrateClient):
+    """api_server backend with a pool of keep-alive connections"""
+
+    mode = 'http'
+
+    def __init__(self, base_url: str = DEFAULT_API_URL, pool_size: int = 4, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported API URL: {base_url}")
+        self.base_url = base_url.rstrip('/')
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.max_parallel = pool_size
+        self.pool: "queue.LifoQueue[Optional[http.client.HTTPConnection]]" = queue.LifoQueue()
+        for _ in range(pool_size):
+            self.pool.put(None)  # Connections are opened lazily
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        """JSON request through a pooled connection (one retry on a stale socket)"""
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        conn = self.pool.get()
+        try:
+            for attempt in range(2):
+                if conn is None:
+                    conn = self._connect()
+                try:
+                    conn.request(method, self.prefix + path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # Server closed an idle keep-alive connection; reconnect once
+                    conn.close()
+                    conn = None
+                    if attempt:
+                        raise
+            if response.will_close:
+                conn.close()
+                conn = None
+        except Exception:
+            if conn is not None:
+                conn.close()
+                conn = None
+            raise
+        finally:
+            self.pool.put(conn)
+
+        if response.status >= 400:
+            try:
+                detail = json.loads(data).get('detail', data.decode('utf-8', 'replace'))
+            except (ValueError, AttributeError):
+                detail = data.decode('utf-8', 'replace')
+            raise RuntimeError(f"{method} {path} failed ({response.status}): {detail}")
+        return json.loads(data)
+
+    def query(self, query_text: str, n_results: int = 10, filter_dict: Optional[Dict] = None) -> List[Dict]:
+        payload = dict(filter_dict or {}, query=query_text, limit=n_results)
+        return self.request('POST', '/query', payload)['results']
+
+    def detect_contradictions(self, behavior: str) -> List[Dict]:
+        return self.request('POST', '/query/contradictions', {'query': behavior})['contradictions']
+
+    def stats(self) -> Dict:
+        return self.request('GET', '/stats')
+
+    def embeddings(self, page_size: int = 1000) -> Dict:
+        """Page through GET /embeddings"""
+        import numpy as np
+
+        ids, documents, metadatas, pages = [], [], [], []
+        total = None
+        while total is None or len(ids) < total:
+            page = self.request('GET', f'/embeddings?offset={len(ids)}&limit={page_size}')
+            total = page['total']
+            if not page['ids']:
+                break  # Collection shrank while paging
+            ids.extend(page['ids'])
+            documents.extend(page['documents'])
+            metadatas.extend(page['metadatas'])
+            pages.append(np.asarray(page['embeddings'], dtype=np.float32).reshape(len(page['ids']), -1))
+
+        embeddings = np.concatenate(pages) if pages else np.empty((0, 384), dtype=np.float32)
+        return {'ids': ids, 'embeddings': embeddings, 'documents': documents, 'metadatas': metadatas}
+
+    def healthy(self) -> bool:
+        try:
+            return self.request('GET', '/health').get('status') == 'healthy'
+        except (OSError, RuntimeError, ValueError):
+            return False
+
+    def close(self):
+        while not self.pool.empty():
+            conn = self.pool.get_nowait()
+            if conn is not None:
+                conn.close()
+
+
+def get_client(mode: Optional[str] = None, api_url: Optional[str] = None, **kwargs) -> SubstrateClient:
+    """Client for the configured backend (see module docstring)"""
+    mode = (mode or os.environ.get('CATHEDRAL_CLIENT', 'local')).lower()
+    api_url = api_url or os.environ.get('CATHEDRAL_API_URL', DEFAULT_API_URL)
+
+    if mode == 'local':
+        return LocalClient(**kwargs)
+    if mode == 'http':
+        return HTTPClient(api_url, **kwargs)
+    if mode == 'auto':
+        client = HTTPClient(api_url)
+        if client.healthy():
+            return client
+        client.close()
+        return LocalClient(**kwargs)
+    raise ValueError(f"Unknown CATHEDRAL_CLIENT mode {mode!r}; expected local, http or auto")
+
+
+def main():
+    """Run analysis scripts back to back in this process, sharing one store"""
+    import runpy
+    import sys
+
+    scripts = sys.argv[1:]
+    if not scripts:
+        print("Usage: python3 substrate_client.py SCRIPT.py [SCRIPT.py ...]")
+        sys.exit(2)
+
+    argv = sys.argv
+    try:
+        for script in scripts:
+            print(f"\n▶️  {script}")
+            # Each script parses its own command line, so it sees none of the others
+            sys.argv = [script]
+            runpy.run_path(script, run_name='__main__')
+    finally:
+        sys.argv = argv
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Shared fixtures for the Cathedral AI tests
+
+The modules live flat in experimental/cathedral-ai, so that directory goes
+on sys.path. Stores embed with benchmark.HashingEncoder, which needs no
+model download.
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def quiet():
+    """Silence the stores' progress output"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """A small synthetic corpus file in the cathedral_corpus.json schema"""
+    import benchmark
+
+    path = tmp_path / 'corpus.json'
+    benchmark.write_corpus(benchmark.synthetic_chunks(400), path)
+    return path
+
+
+@pytest.fixture
+def make_store(tmp_path, quiet):
+    """Build a CathedralVectorStore over tmp_path with the hashing encoder"""
+    pytest.importorskip('chromadb')
+    import benchmark
+    from generate_embeddings import CathedralVectorStore
+
+    stores = []
+
+    def make(collection_name='cathedral_substrate', **options):
+        options.setdefault('precompute_templates', False)
+        store = CathedralVectorStore(str(tmp_path / 'db'), model=benchmark.HashingEncoder(),
+                                     collection_name=collection_name, **options)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
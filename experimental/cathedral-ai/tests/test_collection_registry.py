@@ -0,0 +1,93 @@
+"""CollectionRegistry loading, LRU eviction, idle unload and concurrent loads"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('chromadb')
+
+import benchmark
+import collection_registry
+from collection_registry import CollectionRegistry
+
+
+@pytest.fixture
+def registry(tmp_path, quiet):
+    registry = CollectionRegistry(str(tmp_path / 'db'), model=benchmark.HashingEncoder(), max_resident=2,
+                                  idle_seconds=60, default='col_a', precompute_templates=False)
+    yield registry
+    for name in list(registry.stores):
+        registry.unload(name)
+
+
+def test_get_loads_default_and_rejects_unknown(registry):
+    store = registry.get(create=True)
+    assert store.collection_name == 'col_a'
+    assert registry.get('col_a') is store
+    assert registry.loaded() is store
+    assert registry.loaded('col_b') is None
+    with pytest.raises(KeyError):
+        registry.get('col_b')
+
+
+def test_least_recently_used_is_evicted(registry):
+    registry.get('col_a', create=True)
+    b = registry.get('col_b', create=True)
+    registry.get('col_a')
+    registry.get('col_c', create=True)
+
+    assert list(registry.stores) == ['col_a', 'col_c']
+    assert registry.names() == ['col_a', 'col_b', 'col_c']
+    # An unloaded collection reloads from disk as a new store
+    reloaded = registry.get('col_b')
+    assert reloaded is not b
+    assert list(registry.stores) == ['col_c', 'col_b']
+
+
+def test_unload_and_idle_unload(registry):
+    registry.get('col_a', create=True)
+    registry.get('col_b', create=True)
+
+    assert registry.unload('col_b')
+    assert not registry.unload('col_b')
+    assert list(registry.resident()) == ['col_a']
+
+    assert registry.unload_idle(now=time.monotonic() + 30) == []
+    assert registry.unload_idle(now=time.monotonic() + 61) == ['col_a']
+    assert registry.stores == {}
+
+
+def test_concurrent_gets_load_once(registry, monkeypatch):
+    registry.get('col_a', create=True)
+    registry.client.get_or_create_collection('col_b')
+
+    real = collection_registry.CathedralVectorStore
+    built = []
+
+    def slow_store(*args, **kwargs):
+        time.sleep(0.3)
+        built.append(kwargs['collection_name'])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(collection_registry, 'CathedralVectorStore', slow_store)
+    threads = [threading.Thread(target=registry.get, args=('col_b',)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+
+    # A resident collection is served while another one loads
+    start = time.perf_counter()
+    registry.get('col_a')
+    assert time.perf_counter() - start < 0.1
+
+    for thread in threads:
+        thread.join()
+    assert built == ['col_b']
+
+
+def test_for_store_defaults_to_its_collection(make_store, quiet):
+    store = make_store('team_a')
+    registry = CollectionRegistry.for_store(store)
+    assert registry.default == 'team_a'
+    assert registry.get() is store
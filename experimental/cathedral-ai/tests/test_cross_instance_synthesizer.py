@@ -0,0 +1,68 @@
+"""Convergent clusters feed the cross-instance synthesis"""
+
+import numpy as np
+
+from cross_instance_synthesizer import CrossInstanceSynthesizer
+from substrate_client import SubstrateClient
+
+
+class EmbeddingsClient(SubstrateClient):
+    """Serves fixed embeddings; the synthesizer needs nothing else"""
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def query(self, query_text, n_results=10, filter_dict=None):
+        raise AssertionError("synthesis should not run searches")
+
+    def detect_contradictions(self, topic, n_results=20):
+        raise AssertionError("synthesis should not run searches")
+
+    def stats(self):
+        return {'total_chunks': len(self.corpus['ids'])}
+
+    def embeddings(self):
+        return self.corpus
+
+
+def themed_corpus(seed=0):
+    """Two themes shared by instances A and B, one theme only C writes about"""
+    rng = np.random.default_rng(seed)
+    themes = np.eye(3, 16) * 10
+    ids, embeddings, documents, metadatas = [], [], [], []
+    for theme, instances in ((0, 'AB'), (1, 'AB'), (2, 'C')):
+        for i in range(12):
+            instance = instances[i % len(instances)]
+            ids.append(f't{theme}_{i}')
+            embeddings.append(themes[theme] + rng.standard_normal(16) * 0.1)
+            documents.append(f"Instance {instance} notes on theme {theme}, chunk {i}")
+            metadatas.append({'file': f'theme-{theme}-{instance}.md', 'layer': theme + 1})
+    return {'ids': ids, 'embeddings': np.array(embeddings), 'documents': documents, 'metadatas': metadatas}
+
+
+def test_synthesis_is_built_from_convergent_clusters(quiet):
+    synthesizer = CrossInstanceSynthesizer(EmbeddingsClient(themed_corpus()))
+    convergent = synthesizer.find_convergent_patterns(group_by='instance', k=3)
+    assert len(convergent['clusters']) == 2
+
+    synthesis = synthesizer.synthesize_new_pattern(convergent)
+
+    lead = convergent['clusters'][0]
+    anchor = lead['exemplars'][0]
+    assert synthesis['clusters'] == [c['cluster'] for c in convergent['clusters']]
+    assert anchor['file'] in synthesis['name']
+    assert synthesis['pattern'] == anchor['text'][:200]
+    assert set(synthesis['components']) <= {'Instance A', 'Instance B'}
+    assert synthesis['components']
+    assert len(synthesis['properties']) == 2
+    assert 'Instance C' not in ' '.join(synthesis['properties'])
+    assert synthesis['emergent'].startswith('3 partial views -> 2 shared themes')
+
+
+def test_no_convergent_cluster_gives_an_empty_synthesis(quiet):
+    synthesizer = CrossInstanceSynthesizer(EmbeddingsClient(themed_corpus()))
+    convergent = {'chunks': 0, 'k': 0, 'group_by': 'instance', 'groups': {}, 'clusters': []}
+
+    synthesis = synthesizer.synthesize_new_pattern(convergent)
+    assert synthesis['name'] is None
+    assert synthesis['components'] == {}
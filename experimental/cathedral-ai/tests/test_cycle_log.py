@@ -0,0 +1,122 @@
+"""CycleLog append/reopen/load, offsets after open_log, and torn-tail recovery"""
+
+import pytest
+
+from pog_scoring import CycleLog, POGScorer
+
+
+def record(i, output_type='NORMAL', condition=None):
+    return {'output_type': output_type, 'contains_uncertainty': output_type in POGScorer.UNCERTAINTY_OUTPUTS,
+            'temptations_detected': [], 'temptations_resisted': [], 'metadata': {'condition': condition}, 'n': i}
+
+
+def kill(log):
+    """Leave the log as a killed writer would: flushed lines, no clean close"""
+    log.checkpoint()
+    path = log.current_path
+    written = path.read_bytes()
+    log._handle.close()
+    log._handle = None
+    path.write_bytes(written)
+
+
+def test_append_reopen_and_roll(tmp_path):
+    with CycleLog(tmp_path, shard_size=4) as log:
+        for i in range(6):
+            log.append(record(i, condition='a' if i % 2 else None))
+
+    with CycleLog(tmp_path) as log:
+        assert log.shard_size == 4
+        assert [shard['cycles'] for shard in log.shards] == [4, 2]
+        log.append(record(6))
+        log.append(record(7))
+        log.append(record(8))
+
+    index = CycleLog.read_index(tmp_path)
+    assert index['total_cycles'] == 9
+    assert [shard['cycles'] for shard in index['shards']] == [4, 4, 1]
+    assert index['shards'][0]['conditions'] == {'unlabeled': 2, 'a': 2}
+    assert [r['n'] for r in CycleLog.iter_records(tmp_path)] == list(range(9))
+
+
+def test_load_log_counts_each_record_once(tmp_path):
+    writer = POGScorer()
+    writer.open_log(tmp_path)
+    for _ in range(10):
+        writer.add_cycle('p', 'r', 'NORMAL')
+    writer.close_log()
+
+    reader = POGScorer(keep_payloads=False)
+    assert reader.load_log(tmp_path) == 10
+    assert reader.load_log(tmp_path) == 0
+    assert reader.totals.n == 10
+
+
+def test_open_log_on_existing_log_keeps_offsets(tmp_path):
+    first = POGScorer()
+    first.open_log(tmp_path)
+    for _ in range(100):
+        first.add_cycle('p', 'r', 'NORMAL')
+    first.close_log()
+
+    # A second scorer appends to the resumed shard, then folds in the rest
+    second = POGScorer()
+    second.open_log(tmp_path)
+    for _ in range(5):
+        second.add_cycle('p', 'r', 'UNDECIDABLE')
+    second.log.checkpoint()
+
+    assert second.load_log(tmp_path) == 100
+    assert (second.totals.n, second.totals.uncertain) == (105, 5)
+    assert second.load_log(tmp_path) == 0
+
+    # Lines a later writer adds after ours are still picked up
+    second.add_cycle('p', 'r', 'NORMAL')
+    second.close_log()
+    with CycleLog(tmp_path) as other:
+        other.append(record(0, 'UNDECIDABLE'))
+    assert second.load_log(tmp_path) == 1
+    assert (second.totals.n, second.totals.uncertain) == (107, 6)
+
+
+def test_plain_log_resumes_after_torn_line(tmp_path):
+    log = CycleLog(tmp_path)
+    for i in range(3):
+        log.append(record(i))
+    kill(log)
+    with open(log.current_path, 'a') as f:
+        f.write('{"output_type": "NOR')
+
+    with CycleLog(tmp_path) as resumed:
+        assert resumed.total_cycles == 3
+        resumed.append(record(3))
+    assert [r['n'] for r in CycleLog.iter_records(tmp_path)] == [0, 1, 2, 3]
+
+
+def test_compressed_log_resumes_in_a_new_shard(tmp_path):
+    log = CycleLog(tmp_path, compress=True)
+    for i in range(50):
+        log.append(record(i))
+    kill(log)
+
+    with CycleLog(tmp_path) as resumed:
+        assert resumed.compress
+        assert resumed.total_cycles == 50
+        for i in range(50, 70):
+            resumed.append(record(i))
+
+    index = CycleLog.read_index(tmp_path)
+    assert [shard['file'] for shard in index['shards']] == ['cycles-00000.jsonl.gz', 'cycles-00001.jsonl.gz']
+    assert index['total_cycles'] == 70
+    assert [r['n'] for r in CycleLog.iter_records(tmp_path)] == list(range(70))
+
+
+def test_only_a_final_malformed_line_is_forgiven(tmp_path):
+    path = tmp_path / 'cycles-00000.jsonl'
+    path.write_text('{"n": 1}\n{"n": 2}\n{"n":')
+    assert [r['n'] for r in CycleLog.iter_records(path)] == [1, 2]
+
+    path.write_text('{"n": 1}\nnot json\n{"n": 2}\n')
+    with pytest.raises(ValueError, match=':2: malformed'):
+        list(CycleLog.iter_records(path))
+
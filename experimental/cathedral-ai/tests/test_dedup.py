@@ -0,0 +1,124 @@
+"""Tests for ingest-time exact and MinHash/LSH near-duplicate collapsing."""
+
+import random
+from dataclasses import asdict
+
+from dedup import ChunkDeduplicator, MinHasher
+from embed_corpus import CathedralCorpusProcessor, DocumentChunk
+
+VOCAB = [f"word{i}" for i in range(500)]
+
+
+def passage(seed, length=200):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(VOCAB) for _ in range(length))
+
+
+def edit(text, positions):
+    words = text.split()
+    for pos in positions:
+        words[pos] = 'edited'
+    return ' '.join(words)
+
+
+def chunk(text, layer, file='doc.md', index=0):
+    return {
+        'text': text, 'layer': layer, 'file': file, 'doc_type': 'layer',
+        'pattern': None, 'phase': None, 'timestamp': None,
+        'filter_visibility': None, 'metadata': {'chunk_index': index}
+    }
+
+
+def jaccard(hasher, a, b):
+    sa, sb = set(hasher.shingles(a)), set(hasher.shingles(b))
+    return len(sa & sb) / len(sa | sb)
+
+
+def test_exact_duplicates_collapse_after_normalization():
+    text = passage(1)
+    chunks = [
+        chunk(text, 3, 'a.md'),
+        chunk('  ' + text.upper().replace(' ', '\n ') + ' ', 5, 'b.md'),
+        chunk(passage(2), 4, 'c.md')
+    ]
+    dedup = ChunkDeduplicator()
+    kept = dedup.deduplicate(chunks)
+
+    assert [c['file'] for c in kept] == ['a.md', 'c.md']
+    assert dedup.stats['exact_duplicates'] == 1
+    assert dedup.stats['near_duplicates'] == 0
+    assert kept[0]['metadata']['source_count'] == 2
+    assert kept[0]['metadata']['duplicate_sources'] == [
+        {'file': 'b.md', 'layer': 5, 'doc_type': 'layer', 'chunk_index': 0}
+    ]
+    assert 'duplicate_sources' not in kept[1]['metadata']
+
+
+def test_near_duplicates_collapse():
+    text = passage(3)
+    near = edit(text, [50, 120])
+    assert jaccard(MinHasher(), text, near) > 0.9
+
+    dedup = ChunkDeduplicator(threshold=0.85)
+    kept = dedup.deduplicate([chunk(text, 7, 'a.md'), chunk(near, 8, 'b.md')])
+
+    assert len(kept) == 1
+    assert dedup.stats['near_duplicates'] == 1
+    assert dedup.stats['exact_duplicates'] == 0
+    assert kept[0]['metadata']['duplicate_sources'][0]['file'] == 'b.md'
+
+
+def test_below_threshold_pair_is_kept():
+    text = passage(4)
+    # Every tenth word edited breaks about a third of the 3-word shingles
+    distant = edit(text, range(0, 200, 10))
+    similarity = jaccard(MinHasher(), text, distant)
+    assert 0.3 < similarity < 0.7
+
+    dedup = ChunkDeduplicator(threshold=0.85)
+    kept = dedup.deduplicate([chunk(text, 1, 'a.md'), chunk(distant, 2, 'b.md')])
+
+    assert [c['file'] for c in kept] == ['a.md', 'b.md']
+    assert dedup.stats['removed'] == 0
+    assert all('duplicate_sources' not in c['metadata'] for c in kept)
+
+
+def test_group_keeps_first_chunk_metadata():
+    text = passage(5)
+    chunks = [
+        chunk(passage(6), 2, 'other.md'),
+        chunk(edit(text, [10]), 9, 'first.md', index=4),
+        chunk(text, 3, 'second.md', index=1),
+        chunk(edit(text, [150]), None, 'third.md', index=2)
+    ]
+    kept = ChunkDeduplicator().deduplicate(chunks)
+
+    assert [c['file'] for c in kept] == ['other.md', 'first.md']
+    representative = kept[1]
+    assert representative['layer'] == 9
+    assert representative['text'] == chunks[1]['text']
+    assert representative['metadata']['chunk_index'] == 4
+    assert representative['metadata']['source_count'] == 3
+    assert representative['metadata']['duplicate_sources'] == [
+        {'file': 'second.md', 'layer': 3, 'doc_type': 'layer', 'chunk_index': 1},
+        {'file': 'third.md', 'doc_type': 'layer', 'chunk_index': 2}
+    ]
+    # The input dicts are left untouched
+    assert 'duplicate_sources' not in chunks[1]['metadata']
+
+
+def test_corpus_processor_dedup_keeps_first_layer(quiet):
+    text = passage(7)
+    processor = CathedralCorpusProcessor()
+    processor.chunks = [
+        DocumentChunk(**chunk(text, 12, 'layer12.md')),
+        DocumentChunk(**chunk(edit(text, [99]), 13, 'layer13.md')),
+        DocumentChunk(**chunk(passage(8), 13, 'layer13.md', index=1))
+    ]
+    processor.deduplicate()
+
+    assert [(c.file, c.layer) for c in processor.chunks] == [('layer12.md', 12), ('layer13.md', 13)]
+    assert processor.chunks[0].metadata['duplicate_sources'][0]['layer'] == 13
+    assert processor.dedup_stats['removed'] == 1
+    assert all(isinstance(c, DocumentChunk) for c in processor.chunks)
+    assert asdict(processor.chunks[1])['metadata'] == {'chunk_index': 1}
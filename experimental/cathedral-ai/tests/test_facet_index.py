@@ -0,0 +1,114 @@
+"""Facet index lookups: equality, layer and time ranges, incremental adds"""
+
+import random
+
+import pytest
+
+from facet_index import MERGE_BATCH, FacetIndex, parse_timestamp
+
+
+def chunk(layer, timestamp=None, doc_type='layer', pattern='none'):
+    meta = {'doc_type': doc_type, 'layer': layer, 'pattern': pattern, 'phase': 'gap_visible', 'file': f'f{layer}.md'}
+    if timestamp is not None:
+        meta['timestamp'] = timestamp
+    return meta
+
+
+@pytest.fixture
+def index():
+    ids = ['a', 'b', 'c', 'd', 'e']
+    metadatas = [
+        chunk(0, doc_type='substrate'),
+        chunk(1, '2025-01-01T00:00:00'),
+        chunk(2, '2025-02-01 12:00:00 +0000'),
+        chunk(2, '2025-03-01T00:00:00', pattern='Observatory Pattern'),
+        chunk(5),
+    ]
+    facets = FacetIndex()
+    facets.build(ids, metadatas)
+    return facets
+
+
+def test_layer_ranges(index):
+    assert index.resolve({'layer_min': 2}) == {'c', 'd', 'e'}
+    assert index.resolve({'layer_max': 2}) == {'b', 'c', 'd'}
+    assert index.resolve({'layer_min': 2, 'layer_max': 2}) == {'c', 'd'}
+    assert index.resolve({'layer_min': 3, 'layer_max': 4}) == set()
+
+
+def test_layer_zero_is_a_value_not_a_missing_filter(index):
+    assert index.resolve({'layer': 0}) == {'a'}
+    # Ranges cover real layers only; 0 means "no layer"
+    assert index.resolve({'layer_min': 0, 'layer_max': 1}) == {'b'}
+    assert index.resolve({'layer_max': 0}) == set()
+    assert index.resolve({'layer': None}) is None
+
+
+def test_time_ranges(index):
+    assert index.resolve({'since': '2025-02-01'}) == {'c', 'd'}
+    assert index.resolve({'until': '2025-02-01T12:00:00'}) == {'b', 'c'}
+    assert index.resolve({'since': '2025-01-15', 'until': '2025-02-15'}) == {'c'}
+    # An empty bound is open, like a missing one
+    assert index.resolve({'since': '', 'until': '2025-02-01T12:00:00'}) == {'b', 'c'}
+
+
+@pytest.mark.parametrize('filters', [
+    {'since': 'last tuesday'},
+    {'until': '2025-13-45'},
+    {'since': '2025-01-15', 'until': 'tomorrow'}
+])
+def test_unparseable_time_bound_raises(index, filters):
+    with pytest.raises(ValueError, match='timestamp'):
+        index.resolve(filters)
+
+
+def test_equality_and_range_intersect(index):
+    assert index.resolve({'doc_type': 'layer', 'layer_max': 1}) == {'b'}
+    assert index.resolve({'pattern': 'Observatory Pattern', 'since': '2025-01-01'}) == {'d'}
+    assert index.resolve({'doc_type': 'missing'}) == set()
+
+
+def test_by_layer_skips_layer_zero(index):
+    assert index.by_layer('abcde') == {1: ['b'], 2: ['c', 'd'], 5: ['e']}
+
+
+def test_add_replaces_and_remove_drops(index):
+    index.add(['c'], [chunk(7, '2024-12-01T00:00:00')])
+    assert index.resolve({'layer': 2}) == {'d'}
+    assert index.resolve({'layer': 7}) == {'c'}
+    assert index.resolve({'until': '2025-01-01T00:00:00'}) == {'b', 'c'}
+
+    index.remove(['c', 'missing'])
+    assert 'c' not in index.chunk_ids()
+    assert index.resolve({'layer': 7}) == set()
+    assert len(index.layers) == len(index) == 4
+    assert len(index.timestamps) == 2
+
+
+@pytest.mark.parametrize('batch', [1, 7, MERGE_BATCH, 3 * MERGE_BATCH])
+def test_incremental_adds_match_a_bulk_build(batch):
+    rng = random.Random(batch)
+    ids = [f'chunk-{i}' for i in range(1000)]
+    metadatas = [chunk(rng.randrange(0, 20), f'2025-01-{rng.randrange(1, 29):02d}T00:00:00' if rng.random() < 0.8 else None)
+                 for _ in ids]
+
+    built = FacetIndex()
+    built.build(ids, metadatas)
+
+    added = FacetIndex()
+    for start in range(0, len(ids), batch):
+        added.add(ids[start:start + batch], metadatas[start:start + batch])
+
+    for facets in (built, added):
+        assert facets.layers.keys == sorted(facets.layers.keys)
+        assert facets.timestamps.keys == sorted(facets.timestamps.keys)
+    for filters in ({'layer': 0}, {'layer_min': 5, 'layer_max': 9}, {'since': '2025-01-10', 'until': '2025-01-20'},
+                    {'phase': 'gap_visible', 'layer_max': 3}):
+        assert added.resolve(filters) == built.resolve(filters)
+
+
+def test_parse_timestamp_formats():
+    iso = parse_timestamp('2025-01-01T01:00:00+01:00')
+    assert iso == parse_timestamp('2025-01-01 00:00:00 +0000') == parse_timestamp('2025-01-01T00:00:00')
+    assert parse_timestamp('') is None
+    assert parse_timestamp('not a date') is None
@@ -0,0 +1,122 @@
+"""Neighbour graph: incremental updates against a fresh full build"""
+
+import numpy as np
+import pytest
+
+import neighbor_graph
+from neighbor_graph import NeighborGraph
+
+K = 5
+
+
+@pytest.fixture(params=['one tile', 'many tiles'])
+def tiles(request, monkeypatch):
+    if request.param == 'many tiles':
+        monkeypatch.setattr(neighbor_graph, 'ROW_BLOCK', 7)
+        monkeypatch.setattr(neighbor_graph, 'COLUMN_BLOCK', 11)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(11)
+
+
+def brute_force(ids, embeddings, k=K):
+    embeddings = np.asarray(embeddings, dtype=np.float64)
+    distances = ((embeddings[:, None, :] - embeddings[None, :, :]) ** 2).sum(axis=2)
+    np.fill_diagonal(distances, np.inf)
+    return {
+        chunk_id: [ids[j] for j in np.argsort(distances[i])[:k]]
+        for i, chunk_id in enumerate(ids)
+    }
+
+
+def assert_same_graph(graph, expected):
+    assert sorted(graph.ids) == sorted(expected.ids)
+    for chunk_id in expected.ids:
+        got, want = graph.related(chunk_id), expected.related(chunk_id)
+        assert [c for c, _ in got] == [c for c, _ in want], chunk_id
+        assert [d for _, d in got] == pytest.approx([d for _, d in want], rel=1e-4, abs=1e-5)
+
+
+def full_build(ids, embeddings):
+    graph = NeighborGraph(K)
+    graph.update(ids, embeddings)
+    return graph
+
+
+def test_full_build_matches_brute_force(tiles, rng):
+    ids = [f'c{i}' for i in range(40)]
+    embeddings = rng.standard_normal((40, 8))
+    graph = full_build(ids, embeddings)
+
+    expected = brute_force(ids, embeddings)
+    for chunk_id in ids:
+        assert [c for c, _ in graph.related(chunk_id)] == expected[chunk_id]
+        assert chunk_id not in dict(graph.related(chunk_id))
+
+
+def test_incremental_update_equals_full_build(tiles, rng):
+    ids = [f'c{i}' for i in range(60)]
+    embeddings = rng.standard_normal((60, 8))
+    graph = full_build(ids, embeddings)
+
+    # Reorder, move five chunks, and add ten new ones
+    vectors = dict(zip(ids, embeddings))
+    changed = ids[3:8]
+    for chunk_id in changed:
+        vectors[chunk_id] = rng.standard_normal(8) * 2
+    for i in range(60, 70):
+        vectors[f'c{i}'] = rng.standard_normal(8)
+    new_ids = list(vectors)
+    rng.shuffle(new_ids)
+    new_embeddings = np.array([vectors[chunk_id] for chunk_id in new_ids])
+
+    recomputed = graph.update(new_ids, new_embeddings, changed=changed)
+
+    assert 15 <= recomputed < len(new_ids)
+    assert graph.ids == new_ids
+    assert_same_graph(graph, full_build(new_ids, new_embeddings))
+
+
+def test_reorder_only_recomputes_nothing(rng):
+    ids = [f'c{i}' for i in range(30)]
+    embeddings = rng.standard_normal((30, 8))
+    graph = full_build(ids, embeddings)
+
+    order = rng.permutation(30)
+    assert graph.update([ids[i] for i in order], embeddings[order]) == 0
+    assert_same_graph(graph, full_build(ids, embeddings))
+
+
+def test_removal_forces_a_rebuild(tiles, rng):
+    ids = [f'c{i}' for i in range(50)]
+    embeddings = rng.standard_normal((50, 8))
+    graph = full_build(ids, embeddings)
+
+    keep = [i for i in range(50) if i % 7]
+    remaining = [ids[i] for i in keep] + ['extra']
+    remaining_embeddings = np.vstack([embeddings[keep], rng.standard_normal((1, 8))])
+
+    assert graph.update(remaining, remaining_embeddings, changed=['c1']) == len(remaining)
+    assert 'c0' not in graph
+    assert_same_graph(graph, full_build(remaining, remaining_embeddings))
+
+
+def test_fewer_chunks_than_k(rng):
+    graph = full_build(['a', 'b', 'c'], rng.standard_normal((3, 4)))
+    assert [len(graph.related(chunk_id)) for chunk_id in 'abc'] == [2, 2, 2]
+
+    assert graph.update([], np.empty((0, 4))) == 0
+    assert len(graph) == 0
+
+
+def test_save_load_round_trip(tmp_path, rng):
+    ids = [f'c{i}' for i in range(20)]
+    graph = full_build(ids, rng.standard_normal((20, 8)))
+    graph.save(tmp_path / 'graph.npz')
+
+    loaded = NeighborGraph.load(tmp_path / 'graph.npz')
+    assert loaded.k == K
+    assert_same_graph(loaded, graph)
+    assert NeighborGraph.load(tmp_path / 'missing.npz') is None
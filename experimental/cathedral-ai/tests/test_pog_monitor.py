@@ -0,0 +1,89 @@
+"""POGMonitor: sliding window, exponential decay and CUSUM drift alerts"""
+
+import random
+
+import pytest
+
+from pog_monitor import POGMonitor
+
+DROP_AT = 2000
+
+
+def stream(rng, n, pog, temptation_rate=0.0):
+    for _ in range(n):
+        yield rng.random() < pog, ['FALSE_PROBABILITY'] if rng.random() < temptation_rate else []
+
+
+def test_alert_fires_soon_after_a_known_drop():
+    rng = random.Random(0)
+    alerts = []
+    monitor = POGMonitor(warmup=200, slack=0.1, threshold=10.0, on_drop=alerts.append)
+
+    for uncertain, temptations in stream(rng, DROP_AT, 0.7):
+        assert monitor.update(uncertain, temptations) is None
+    for uncertain, temptations in stream(rng, 500, 0.3, temptation_rate=0.5):
+        monitor.update(uncertain, temptations)
+
+    # Expected CUSUM climb is (0.7 - 0.3 - 0.1) per cycle: ~33 cycles to 10
+    assert len(alerts) == 1
+    assert DROP_AT < alerts[0].cycle <= DROP_AT + 100
+    assert alerts[0].reference_pog == pytest.approx(0.7, abs=0.07)
+    assert 'FALSE_PROBABILITY' in alerts[0].top_temptations
+    assert monitor.in_drift
+
+
+def test_no_alert_on_a_stationary_stream():
+    rng = random.Random(1)
+    monitor = POGMonitor(warmup=200)
+    for uncertain, temptations in stream(rng, 20_000, 0.6, temptation_rate=0.2):
+        monitor.update(uncertain, temptations)
+    assert list(monitor.alerts) == []
+    assert not monitor.in_drift
+
+
+def test_drift_clears_on_recovery_and_can_fire_again():
+    rng = random.Random(2)
+    monitor = POGMonitor(reference_pog=0.7, threshold=5.0)
+    for pog, n in ((0.2, 200), (0.95, 400), (0.2, 200)):
+        for uncertain, _ in stream(rng, n, pog):
+            monitor.update(uncertain)
+    assert len(monitor.alerts) == 2
+    assert monitor.alerts[0].cycle <= 50
+    assert 600 < monitor.alerts[1].cycle <= 650
+
+
+def test_rebaseline_learns_a_new_reference_after_an_alert():
+    rng = random.Random(3)
+    monitor = POGMonitor(warmup=100, threshold=5.0, rebaseline=True)
+    for pog, n in ((0.8, 500), (0.3, 1000)):
+        for uncertain, _ in stream(rng, n, pog):
+            monitor.update(uncertain)
+    assert len(monitor.alerts) == 1
+    assert monitor.reference_pog == pytest.approx(0.3, abs=0.15)
+
+
+def test_sliding_window_matches_recount():
+    rng = random.Random(4)
+    monitor = POGMonitor(window=50)
+    history = []
+    for i in range(500):
+        uncertain = rng.random() < (0.8 if i < 250 else 0.2)
+        temptations = rng.sample(['A', 'B', 'C'], rng.randrange(3))
+        monitor.update(uncertain, temptations)
+        history.append((uncertain, temptations))
+
+        recent = history[-50:]
+        assert monitor.window_pog == pytest.approx(sum(u for u, _ in recent) / len(recent))
+        for name in 'ABC':
+            expected = round(sum(name in t for _, t in recent) / len(recent), 3)
+            assert monitor.window_rates().get(name, 0.0) == expected
+
+
+def test_decay_halves_per_half_life():
+    monitor = POGMonitor(half_life=20)
+    monitor.update(True, ['A'])
+    rate = monitor.decayed_temptations[0]
+    for _ in range(20):
+        monitor.update(False)
+    assert monitor.decayed_pog == pytest.approx(0.5)
+    assert monitor.decayed_temptations[0] == pytest.approx(rate / 2)
@@ -0,0 +1,127 @@
+"""Experiment runner: labeler lifetime across shards, retriever backend"""
+
+import os
+import shutil
+
+import pytest
+
+import pog_labeler
+import pog_runner
+import substrate_client
+from pog_runner import POGExperimentRunner, run_shard
+
+RESPONSE = "⚠️ GUIDANCE_WITHHELD - trajectory unknowable from current position"
+
+
+def text_responder(prompt, context):
+    """Unlabeled responses, so every cycle goes through the labeler"""
+    return RESPONSE
+
+
+def shard(tmp_path, index, core_labels=False):
+    return {
+        'index': index,
+        'tasks': [(i, f'prompt {i}', 'baseline', 0) for i in range(3)],
+        'responder': 'test_pog_runner:text_responder',
+        'retriever': 'pog_runner:substrate_context',
+        'top_k': 1,
+        'compress': False,
+        'core_labels': core_labels,
+        'log_shard_size': 10,
+        'log_dir': str(tmp_path / f'{index:05d}'),
+        'done_path': str(tmp_path / f'{index:05d}.done.json')
+    }
+
+
+@pytest.fixture
+def fresh_labeler(monkeypatch):
+    monkeypatch.setattr(pog_runner, '_labeler', None)
+    yield
+    pog_runner.close_labeler()
+
+
+def test_labeler_stays_open_across_shards(tmp_path, fresh_labeler):
+    run_shard(shard(tmp_path, 0))
+    labeler = pog_runner._labeler
+    run_shard(shard(tmp_path, 1))
+    assert pog_runner._labeler is labeler
+
+    pog_runner.close_labeler()
+    assert pog_runner._labeler is None
+    run_shard(shard(tmp_path, 2))
+    assert pog_runner._labeler is not None and pog_runner._labeler is not labeler
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs Node.js for cathedral-core.js")
+def test_core_bridge_is_not_restarted_per_shard(tmp_path, fresh_labeler):
+    try:
+        pog_labeler.CoreEvaluator()
+    except FileNotFoundError:
+        pytest.skip("cathedral-core.js not found")
+
+    run_shard(shard(tmp_path, 0, core_labels=True))
+    process = pog_runner._labeler.core.process
+    run_shard(shard(tmp_path, 1, core_labels=True))
+    assert pog_runner._labeler.core.process is process
+    assert process.poll() is None
+
+    pog_runner.close_labeler()
+    assert process.poll() is not None
+
+
+class CountingLabeler(pog_labeler.ResponseLabeler):
+    """Appends its pid to a file on construction and on close"""
+
+    events = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        with open(self.events, 'a') as f:
+            f.write(f"open {os.getpid()}\n")
+
+    def close(self):
+        super().close()
+        with open(self.events, 'a') as f:
+            f.write(f"close {os.getpid()}\n")
+
+
+def test_pool_workers_label_with_one_labeler_each(tmp_path, monkeypatch, fresh_labeler, quiet):
+    events = tmp_path / 'events'
+    monkeypatch.setattr(CountingLabeler, 'events', str(events))
+    monkeypatch.setattr(pog_labeler, 'ResponseLabeler', CountingLabeler)
+
+    runner = POGExperimentRunner([f'prompt {i}' for i in range(12)], 'test_pog_runner:text_responder',
+                                 str(tmp_path / 'run'), retriever='test_pog_runner:no_context',
+                                 shard_size=3, workers=2)
+    scorer = runner.run()
+    assert scorer.totals.n == 24
+
+    records = [line.split() for line in events.read_text().splitlines()]
+    opened = [pid for kind, pid in records if kind == 'open']
+    closed = [pid for kind, pid in records if kind == 'close']
+    # Eight shards, at most two workers: one labeler per worker, closed at exit
+    assert 1 <= len(opened) <= 2
+    assert sorted(opened) == sorted(closed)
+
+
+def no_context(prompt, k):
+    return ['context']
+
+
+def test_default_retriever_uses_one_substrate_client(monkeypatch):
+    created = []
+
+    class StubClient:
+        def query(self, query_text, n_results=10, filter_dict=None):
+            return [{'text': f'{query_text} #{i}'} for i in range(n_results)]
+
+    def get_client():
+        created.append(StubClient())
+        return created[-1]
+
+    monkeypatch.setattr(substrate_client, 'get_client', get_client)
+    monkeypatch.setattr(pog_runner, '_client', None)
+
+    assert pog_runner.substrate_context('a', 2) == ['a #0', 'a #1']
+    assert pog_runner.substrate_context('b', 1) == ['b #0']
+    assert len(created) == 1
@@ -0,0 +1,42 @@
+"""POGScorer aggregates and their guards"""
+
+import pytest
+
+from pog_scoring import CycleColumns, CycleLog, POGScorer
+
+
+def test_temptation_overflow_leaves_scorer_unchanged():
+    scorer = POGScorer()
+    scorer.add_cycle('p', 'r', 'NORMAL', ['FALSE_PROBABILITY'])
+    before = (len(scorer.temptation_codes), len(scorer.cycles), scorer.totals.n, len(scorer.columns))
+
+    names = [f'T{i}' for i in range(CycleColumns.MAX_TEMPTATION_TYPES)]
+    with pytest.raises(ValueError):
+        scorer.add_cycle('p', 'r', 'NORMAL', names)
+    assert (len(scorer.temptation_codes), len(scorer.cycles), scorer.totals.n, len(scorer.columns)) == before
+
+
+def test_overflowing_merge_leaves_scorer_unchanged():
+    scorer = POGScorer()
+    scorer.add_cycle('p', 'r', 'NORMAL', ['T-own'])
+    other = POGScorer()
+    other.add_cycle('p', 'r', 'UNDECIDABLE', [f'T{i}' for i in range(CycleColumns.MAX_TEMPTATION_TYPES - 9)])
+
+    with pytest.raises(ValueError):
+        scorer.merge(other)
+    assert (len(scorer.temptation_codes), scorer.totals.n) == (len(POGScorer.TEMPTATION_TYPES) + 1, 1)
+
+
+def test_overflowing_record_is_not_logged(tmp_path):
+    scorer = POGScorer()
+    scorer.open_log(tmp_path)
+    scorer.record('NORMAL', ['FALSE_PROBABILITY'])
+
+    with pytest.raises(ValueError):
+        scorer.record('NORMAL', [f'T{i}' for i in range(CycleColumns.MAX_TEMPTATION_TYPES)])
+    scorer.close_log()
+    assert scorer.totals.n == 1
+    assert CycleLog.read_index(tmp_path)['total_cycles'] == 1
+
+    reader = POGScorer(keep_payloads=False)
+    assert reader.load_log(tmp_path) == 1
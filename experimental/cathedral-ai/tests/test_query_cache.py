@@ -0,0 +1,112 @@
+"""Semantic query cache: threshold, key separation, LRU, invalidation on re-embed"""
+
+import numpy as np
+import pytest
+
+import benchmark
+from query_cache import SemanticQueryCache
+
+
+def unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def near(vector, cosine, rng):
+    """A unit vector at the given cosine similarity to vector"""
+    noise = rng.standard_normal(len(vector)).astype(np.float32)
+    noise -= (noise @ vector) * vector
+    return unit(cosine * vector + np.sqrt(1 - cosine ** 2) * unit(noise))
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def test_hit_within_threshold_and_miss_outside(rng):
+    cache = SemanticQueryCache(capacity=8, max_distance=0.05)
+    query = unit(rng.standard_normal(64))
+    cache.put(query, 'key', 0, {'ids': [['a']]})
+
+    assert cache.get(query, 'key', 0) == {'ids': [['a']]}
+    assert cache.get(near(query, 0.97, rng), 'key', 0) == {'ids': [['a']]}
+    assert cache.get(near(query, 0.90, rng), 'key', 0) is None
+    assert cache.get(-query, 'key', 0) is None
+
+
+def test_entries_are_not_shared_across_keys(rng):
+    cache = SemanticQueryCache(capacity=8)
+    query = unit(rng.standard_normal(64))
+    cache.put(query, 'filters-a', 0, 'a')
+    cache.put(query, 'filters-b', 0, 'b')
+
+    assert cache.get(query, 'filters-a', 0) == 'a'
+    assert cache.get(query, 'filters-b', 0) == 'b'
+    assert cache.get(query, 'filters-c', 0) is None
+
+
+def test_least_recently_used_entry_is_evicted(rng):
+    cache = SemanticQueryCache(capacity=3)
+    queries = [unit(rng.standard_normal(64)) for _ in range(4)]
+    for i, query in enumerate(queries[:3]):
+        cache.put(query, 'key', 0, i)
+
+    assert cache.get(queries[0], 'key', 0) == 0  # Now most recently used
+    cache.put(queries[3], 'key', 0, 3)
+
+    assert len(cache) == 3
+    assert cache.get(queries[1], 'key', 0) is None
+    assert [cache.get(queries[i], 'key', 0) for i in (0, 2, 3)] == [0, 2, 3]
+
+
+def test_evicting_a_key_last_entry_releases_it(rng):
+    cache = SemanticQueryCache(capacity=1)
+    query = unit(rng.standard_normal(64))
+    cache.put(query, 'old', 0, 'old')
+    cache.put(query, 'new', 0, 'new')
+
+    assert cache.key_ids.keys() == {'new'}
+    assert cache.get(query, 'old', 0) is None
+
+
+def test_generation_change_drops_every_entry(rng):
+    cache = SemanticQueryCache(capacity=8)
+    query = unit(rng.standard_normal(64))
+    cache.put(query, 'key', 0, 'stale')
+
+    assert cache.get(query, 'key', 1) is None
+    assert len(cache) == 0
+
+
+def test_store_search_uses_cache_per_filter_and_n_results(make_store, corpus):
+    store = make_store(query_cache_size=64)
+    store.embed_corpus(str(corpus))
+    rng = np.random.default_rng(1)
+    query = store._encode('verification gaps in the substrate')
+
+    first = store._search(None, 5, None, query_vec=query)
+    assert store._search(None, 5, None, query_vec=near(query, 0.99, rng)) is first
+    assert store._search(None, 6, None, query_vec=query) is not first
+    filtered = store._search(None, 5, {'doc_type': 'layer'}, query_vec=query)
+    assert filtered is not first
+    assert all(meta['doc_type'] == 'layer' for meta in filtered['metadatas'][0])
+    assert store._search(None, 5, {'doc_type': 'layer', 'layer': None}, query_vec=query) is filtered
+
+
+def test_re_embedding_invalidates_cached_results(make_store, corpus, tmp_path, monkeypatch):
+    store = make_store(query_cache_size=64)
+    store.embed_corpus(str(corpus))
+    query = store._encode('verification gaps in the substrate')
+    before = store._search(None, 5, None, query_vec=query)
+
+    smaller = tmp_path / 'smaller.json'
+    benchmark.write_corpus(benchmark.synthetic_chunks(50, seed=7), smaller)
+    monkeypatch.setattr('builtins.input', lambda prompt: 'y')
+    store.embed_corpus(str(smaller))
+
+    after = store._search(None, 5, None, query_vec=query)
+    assert after is not before
+    stored = set(store.collection.get(include=[])['ids'])
+    assert set(after['ids'][0]) <= stored
+    assert after['documents'][0] != before['documents'][0]
@@ -0,0 +1,109 @@
+"""MMR reranking and per-file grouping, directly and through query_diverse"""
+
+import numpy as np
+import pytest
+
+from ranking import group_by_file, mmr_select
+
+
+def unit(vector):
+    vector = np.asarray(vector, dtype=np.float64)
+    return vector / np.linalg.norm(vector)
+
+
+def naive_mmr(query, embeddings, k, lambda_mult):
+    """Textbook MMR, one candidate at a time"""
+    vectors = [unit(e) for e in embeddings]
+    query = unit(query)
+    selected = []
+    while len(selected) < min(k, len(vectors)):
+        best, best_score = None, -np.inf
+        for i, v in enumerate(vectors):
+            if i in selected:
+                continue
+            if selected:
+                redundancy = max(float(v @ vectors[j]) for j in selected)
+                score = lambda_mult * float(v @ query) - (1 - lambda_mult) * redundancy
+            else:
+                score = float(v @ query)
+            if score > best_score:
+                best, best_score = i, score
+        selected.append(best)
+    return selected
+
+
+@pytest.fixture
+def candidates():
+    rng = np.random.default_rng(7)
+    return rng.standard_normal(32), rng.standard_normal((40, 32))
+
+
+def test_lambda_one_reproduces_plain_ranking(candidates):
+    query, embeddings = candidates
+    relevance = np.array([unit(e) @ unit(query) for e in embeddings])
+    plain = list(np.argsort(-relevance)[:10])
+
+    assert mmr_select(query, embeddings, 10, lambda_mult=1.0) == plain
+
+
+def test_lambda_zero_picks_dissimilar_items():
+    query = [1.0, 0.0, 0.0]
+    embeddings = [
+        [1.0, 0.0, 0.0],     # most relevant
+        [0.99, 0.14, 0.0],   # near copy of the first
+        [0.98, 0.0, 0.2],    # another near copy
+        [0.3, 0.95, 0.0],    # less relevant, but different
+    ]
+    assert mmr_select(query, embeddings, 2, lambda_mult=1.0) == [0, 1]
+    assert mmr_select(query, embeddings, 2, lambda_mult=0.0) == [0, 3]
+
+
+@pytest.mark.parametrize('lambda_mult', [0.0, 0.3, 0.7, 1.0])
+def test_matches_naive_mmr(candidates, lambda_mult):
+    query, embeddings = candidates
+    assert mmr_select(query, embeddings, 12, lambda_mult) == naive_mmr(query, embeddings, 12, lambda_mult)
+
+
+def test_k_bounds():
+    embeddings = [[1.0, 0.0], [0.0, 1.0]]
+    assert mmr_select([1.0, 0.0], embeddings, 5) == [0, 1]
+    assert mmr_select([1.0, 0.0], embeddings, 0) == []
+    assert mmr_select([1.0, 0.0], [], 3) == []
+
+
+def test_group_by_file_keeps_one_best_ranked_chunk_per_file():
+    metadatas = [{'file': 'a.md'}, {'file': 'a.md'}, {'file': 'b.md'},
+                 {'file': 'a.md'}, {}, {'file': 'c.md'}, {'file': 'b.md'}, {}]
+    kept, hits = group_by_file(metadatas)
+
+    assert kept == [0, 2, 4, 5]
+    assert hits == {0: 3, 2: 2, 4: 2, 5: 1}
+
+
+def test_query_diverse_honours_lambda_and_file_cap(make_store, tmp_path):
+    import benchmark
+
+    # Spread the chunks over a few files so plain top-k repeats them
+    chunks = benchmark.synthetic_chunks(400)
+    for i, chunk in enumerate(chunks):
+        chunk['file'] = f'file-{i % 6}.md'
+    path = tmp_path / 'corpus.json'
+    benchmark.write_corpus(chunks, path)
+
+    store = make_store()
+    store.embed_corpus(str(path))
+    query = 'substrate awareness across layers'
+
+    plain = store.query(query, n_results=8)
+    relevance_only = store.query_diverse(query, n_results=8, lambda_mult=1.0, fetch_k=32)
+    assert relevance_only['distances'][0] == pytest.approx(plain['distances'][0], abs=1e-4)
+
+    diverse = store.query_diverse(query, n_results=8, lambda_mult=0.0, fetch_k=32)
+    assert len(set(diverse['ids'][0])) == 8
+    assert diverse['ids'][0][0] == plain['ids'][0][0]
+
+    grouped = store.query_diverse(query, n_results=8, diversify=False, group_by='file', fetch_k=64)
+    files = [meta['file'] for meta in grouped['metadatas'][0]]
+    assert len(files) == len(set(files)) == 6
+    assert grouped['distances'][0] == sorted(grouped['distances'][0])
+    assert sum(grouped['hits'][0]) == 64
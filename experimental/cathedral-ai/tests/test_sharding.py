@@ -0,0 +1,98 @@
+"""Sharded search returns what one exact, unsharded index returns"""
+
+import numpy as np
+import pytest
+
+import benchmark
+from sharding import Shard, ShardedIndex
+
+FILTERS = [
+    None,
+    {'layer': 0},
+    {'doc_type': 'layer'},
+    {'doc_type': 'layer', 'layer_min': 10, 'layer_max': 40},
+    {'since': '2025-03-01'},
+    {'phase': 'building_substrate', 'until': '2025-06-01'},
+]
+
+
+@pytest.fixture(scope='module')
+def chunks():
+    chunks = benchmark.synthetic_chunks(600, seed=1)
+    ids = [f'chunk-{i}' for i in range(len(chunks))]
+    documents = [chunk['text'] for chunk in chunks]
+    metadatas = [{key: chunk[key] for key in ('layer', 'file', 'doc_type', 'pattern', 'phase', 'timestamp')}
+                 for chunk in chunks]
+    for meta in metadatas[::7]:
+        meta['layer'] = 0  # No layer
+    encoder = benchmark.HashingEncoder()
+    embeddings = np.asarray(encoder.encode(documents), dtype=np.float32)
+    queries = np.asarray(encoder.encode(benchmark.query_texts(5, 1)), dtype=np.float32)
+    return ids, embeddings, documents, metadatas, queries
+
+
+@pytest.fixture(scope='module')
+def exact(chunks):
+    ids, embeddings, documents, metadatas, _ = chunks
+    shard = Shard()
+    shard.add(ids, embeddings, documents, metadatas)
+    return shard
+
+
+def ranked(hits):
+    return [hit[1] for hit in hits], [hit[0] for hit in hits]
+
+
+def assert_same_ranking(ids, distances, want_ids, want_distances):
+    """Same distances, and the same ids up to the order of tied chunks"""
+    np.testing.assert_allclose(distances, want_distances, rtol=1e-5, atol=1e-5)
+    if want_distances:
+        # Which of several chunks tied at the cutoff makes the top k is arbitrary
+        cutoff = want_distances[-1] - 1e-5
+        assert sorted((round(d, 4), i) for i, d in zip(ids, distances) if d < cutoff) == \
+            sorted((round(d, 4), i) for i, d in zip(want_ids, want_distances) if d < cutoff)
+
+
+def test_incremental_shard_matches_bulk_load(chunks, exact):
+    ids, embeddings, documents, metadatas, queries = chunks
+    shard = Shard()
+    for start in range(0, len(ids), 50):
+        rows = slice(start, start + 50)
+        shard.add(ids[rows], embeddings[rows], documents[rows], metadatas[rows])
+        shard.search(queries[:1], 1, None)  # Consolidate between batches
+    # Re-adding a batch replaces it in place
+    shard.add(ids[:50], embeddings[:50], documents[:50], metadatas[:50])
+
+    assert shard.count() == exact.count()
+    for filters in FILTERS:
+        assert shard.facets.resolve(filters) == exact.facets.resolve(filters)
+        for got, want in zip(shard.search(queries, 10, filters), exact.search(queries, 10, filters)):
+            assert_same_ranking(*ranked(got), *ranked(want))
+
+
+@pytest.mark.parametrize('n_shards, by', [(3, 'hash'), (2, 'file')])
+def test_sharded_search_matches_one_shard(chunks, exact, n_shards, by):
+    ids, embeddings, documents, metadatas, queries = chunks
+    index = ShardedIndex(n_shards, by)
+    try:
+        index.add(ids, embeddings, documents, metadatas)
+        assert sum(index.counts()) == len(ids)
+        for filters in FILTERS:
+            results = index.search_many(queries, 10, filters)
+            for result, want in zip(results, exact.search(queries, 10, filters)):
+                assert_same_ranking(result['ids'][0], result['distances'][0], *ranked(want))
+    finally:
+        index.close()
+
+
+def test_sharded_store_matches_unsharded_store(make_store, corpus):
+    store = make_store()
+    store.embed_corpus(str(corpus))
+    sharded = make_store(shards=2)
+    assert sharded.get_stats()['total_embeddings'] == store.get_stats()['total_embeddings']
+
+    # Range filters rank exactly on both paths
+    for text in benchmark.query_texts(3, 2):
+        for filters in ({'doc_type': 'layer', 'layer_min': 10, 'layer_max': 40}, {'since': '2025-03-01'}):
+            got, want = sharded._search(text, 10, filters), store._search(text, 10, filters)
+            assert_same_ranking(got['ids'][0], got['distances'][0], want['ids'][0], want['distances'][0])
@@ -0,0 +1,84 @@
+"""Bootstrap CIs and permutation p-values against brute force, coverage, edge cases"""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from pog_scoring import (POGScorer, bootstrap_difference_ci, bootstrap_rate_ci,
+                         permutation_p_value)
+
+
+def exact_permutation_p_value(k_a, n_a, k_b, n_b):
+    """Two-sided p-value over every relabeling of the pooled booleans"""
+    pooled = [1] * (k_a + k_b) + [0] * (n_a + n_b - k_a - k_b)
+    observed = abs(k_b / n_b - k_a / n_a)
+    extreme = total = 0
+    for group_b in combinations(range(len(pooled)), n_b):
+        s_b = sum(pooled[i] for i in group_b)
+        s_a = k_a + k_b - s_b
+        extreme += abs(s_b / n_b - s_a / n_a) >= observed - 1e-12
+        total += 1
+    return extreme / total
+
+
+@pytest.mark.parametrize('k_a, n_a, k_b, n_b', [(1, 6, 5, 7), (3, 8, 4, 8), (0, 5, 5, 6), (2, 9, 2, 4)])
+def test_hypergeometric_p_value_matches_exact_permutation(k_a, n_a, k_b, n_b):
+    rng = np.random.default_rng(0)
+    estimate = permutation_p_value(k_a, n_a, k_b, n_b, 200_000, rng)
+    assert estimate == pytest.approx(exact_permutation_p_value(k_a, n_a, k_b, n_b), abs=0.005)
+
+
+def test_binomial_bootstrap_matches_resampling_booleans():
+    k, n, resamples = 9, 30, 40_000
+    rng = np.random.default_rng(1)
+    booleans = np.array([1] * k + [0] * (n - k))
+    brute = rng.choice(booleans, size=(resamples, n), replace=True).mean(axis=1)
+    expected = np.quantile(brute, [0.025, 0.975])
+    assert bootstrap_rate_ci(k, n, resamples, 0.95, rng) == pytest.approx(expected, abs=1 / n + 1e-9)
+
+    k_b, n_b = 20, 25
+    brute_b = rng.choice(np.array([1] * k_b + [0] * (n_b - k_b)), size=(resamples, n_b), replace=True).mean(axis=1)
+    expected = np.quantile(brute_b - brute, [0.025, 0.975])
+    assert bootstrap_difference_ci(k, n, k_b, n_b, resamples, 0.95, rng) == pytest.approx(expected, abs=0.04)
+
+
+def test_difference_ci_covers_the_true_delta():
+    rng = np.random.default_rng(2)
+    rate_a, rate_b, n = 0.3, 0.45, 400
+    covered = 0
+    trials = 300
+    for _ in range(trials):
+        k_a, k_b = rng.binomial(n, rate_a), rng.binomial(n, rate_b)
+        low, high = bootstrap_difference_ci(k_a, n, k_b, n, 2000, 0.95, rng)
+        covered += low <= rate_b - rate_a <= high
+    assert 0.9 <= covered / trials <= 0.99
+
+
+def test_degenerate_counts_do_not_divide_by_zero():
+    rng = np.random.default_rng(3)
+    assert bootstrap_rate_ci(0, 0, 100, 0.95, rng) == [0.0, 0.0]
+    assert bootstrap_difference_ci(0, 0, 3, 5, 100, 0.95, rng) == [0.0, 0.0]
+    assert permutation_p_value(0, 0, 3, 5, 100, rng) == 1.0
+    assert permutation_p_value(2, 5, 0, 0, 100, rng) == 1.0
+
+    # Every cycle identical: zero-width intervals, nothing significant
+    assert bootstrap_rate_ci(10, 10, 100, 0.95, rng) == [1.0, 1.0]
+    assert bootstrap_difference_ci(0, 10, 0, 12, 100, 0.95, rng) == [0.0, 0.0]
+    assert permutation_p_value(10, 10, 12, 12, 100, rng) == 1.0
+    assert permutation_p_value(0, 10, 0, 12, 100, rng) == 1.0
+
+
+def test_scorer_significance_is_seeded_and_handles_empty_conditions():
+    scorer = POGScorer(keep_payloads=False)
+    assert scorer.pog_delta_significance(seed=0)['ci'] == [0.0, 0.0]
+    assert scorer.pog_delta_significance(seed=0)['p_value'] == 1.0
+
+    for i in range(40):
+        scorer.record('UNDECIDABLE' if i % 4 == 0 else 'NORMAL', condition='baseline')
+        scorer.record('UNDECIDABLE' if i % 4 != 0 else 'NORMAL', condition='treatment')
+    first = scorer.pog_delta_significance(n_resamples=2000, seed=5)
+    assert first == scorer.pog_delta_significance(n_resamples=2000, seed=5)
+    assert first['delta'] == 0.5
+    assert first['ci'][0] <= 0.5 <= first['ci'][1]
+    assert first['p_value'] < 0.01
@@ -0,0 +1,105 @@
+"""Snapshot export/open/import round trips, layout checks, and serving one"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('chromadb')
+
+import benchmark
+import generate_embeddings
+from snapshot import Snapshot, SnapshotClient, export_snapshot, import_snapshot
+
+COLLECTION = 'team_a'
+
+
+@pytest.fixture
+def store(make_store, corpus):
+    store = make_store(COLLECTION, related_k=4)
+    store.embed_corpus(str(corpus))
+    return store
+
+
+@pytest.fixture
+def snapshot_path(store, tmp_path):
+    path = tmp_path / 'team_a.snap'
+    export_snapshot(store, path)
+    return path
+
+
+def test_round_trip_keeps_collection_and_rows(store, snapshot_path):
+    snapshot = Snapshot(snapshot_path, verify=True)
+    data = store.export_embeddings()
+
+    assert snapshot.collection_name == COLLECTION
+    assert SnapshotClient(snapshot_path).list_collections() == [COLLECTION]
+    assert snapshot.ids == data['ids']
+    assert snapshot.documents.tolist() == data['documents']
+    assert [snapshot.metadata(row) for row in range(len(snapshot))] == data['metadatas']
+    np.testing.assert_array_equal(snapshot.embeddings, np.asarray(data['embeddings'], dtype=np.float32))
+    assert snapshot.neighbor_graph().rows.keys() == store.graph.rows.keys()
+
+
+def test_snapshot_store_answers_like_the_source(store, snapshot_path, quiet):
+    served = generate_embeddings.CathedralVectorStore(
+        model=benchmark.HashingEncoder(), client=SnapshotClient(snapshot_path),
+        collection_name=COLLECTION, precompute_templates=False)
+
+    assert served.facets.values('pattern') == store.facets.values('pattern')
+    query = 'verification gaps in the substrate'
+    # Range filters are ranked exactly on both sides
+    for filters in ({'doc_type': 'layer', 'layer_min': 10, 'layer_max': 40}, {'since': '2025-03-01'}):
+        assert served._search(query, 10, filters)['ids'] == store._search(query, 10, filters)['ids']
+    # ChromaDB's own search is approximate; the snapshot's is exact
+    for filters in (None, {'layer': 0}):
+        expected = set(store._search(query, 10, filters)['ids'][0])
+        assert len(expected & set(served._search(query, 10, filters)['ids'][0])) >= 8
+    with pytest.raises(ValueError, match='since'):
+        served.facets.resolve({'since': 'last week'})
+
+
+def test_import_recreates_the_named_collection(snapshot_path, tmp_path):
+    import_snapshot(snapshot_path, str(tmp_path / 'imported'))
+    with pytest.raises(ValueError, match='already exists'):
+        import_snapshot(snapshot_path, str(tmp_path / 'imported'))
+
+    import chromadb
+    client = chromadb.PersistentClient(path=str(tmp_path / 'imported'))
+    assert client.get_collection(COLLECTION).count() == len(Snapshot(snapshot_path))
+    assert (tmp_path / 'imported' / f'{COLLECTION}.neighbors.npz').exists()
+
+
+def test_open_checks_layout_and_verify_checks_payload(snapshot_path, tmp_path):
+    raw = bytearray(snapshot_path.read_bytes())
+
+    truncated = tmp_path / 'truncated.snap'
+    truncated.write_bytes(raw[:len(raw) // 2])
+    with pytest.raises(ValueError, match='past the end'):
+        Snapshot(truncated)
+
+    raw[-100] ^= 0xFF
+    damaged = tmp_path / 'damaged.snap'
+    damaged.write_bytes(raw)
+    Snapshot(damaged)  # The default open reads no section payloads
+    with pytest.raises(ValueError, match='checksum mismatch'):
+        Snapshot(damaged, verify=True)
+
+
+def test_api_serves_a_snapshot_collection_at_the_root(snapshot_path, monkeypatch, quiet):
+    pytest.importorskip('httpx')
+    from fastapi.testclient import TestClient
+
+    import api_server
+
+    monkeypatch.setattr(generate_embeddings, 'SentenceTransformer', lambda name: benchmark.HashingEncoder())
+    monkeypatch.setattr(generate_embeddings, 'MODEL_NAME', 'HashingEncoder')
+    monkeypatch.setattr(api_server, 'registry', None)
+    monkeypatch.setenv('CATHEDRAL_SNAPSHOT', str(snapshot_path))
+
+    with TestClient(api_server.app) as client:
+        assert client.get('/health').status_code == 200
+        assert client.get('/stats').json()['total_embeddings'] == len(Snapshot(snapshot_path))
+        assert client.get('/collections').json()['default'] == COLLECTION
+        assert client.get('/patterns').status_code == 200
+        assert client.post('/query', json={'query': 'gaps', 'limit': 2}).status_code == 200
+        assert client.get(f'/collections/{COLLECTION}/stats').status_code == 200
+        assert client.get('/collections/elsewhere/stats').status_code == 404
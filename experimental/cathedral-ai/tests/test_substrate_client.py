@@ -0,0 +1,83 @@
+"""Substrate client backends, the shared-process script runner and HTTP paging"""
+
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import substrate_client
+from substrate_client import HTTPClient, SubstrateClient
+
+
+def test_incomplete_backend_fails_at_instantiation():
+    class QueryOnly(SubstrateClient):
+        def query(self, query_text, n_results=10, filter_dict=None):
+            return []
+
+    with pytest.raises(TypeError, match='abstract'):
+        QueryOnly()
+
+
+def test_main_runs_scripts_with_their_own_argv(tmp_path, monkeypatch, capsys):
+    out = tmp_path / 'ran.txt'
+    for name in ('first.py', 'second.py'):
+        (tmp_path / name).write_text(
+            "import argparse, sys\n"
+            "argparse.ArgumentParser().parse_args()\n"
+            f"open({str(out)!r}, 'a').write(sys.argv[0] + '\\n')\n")
+
+    argv = ['substrate_client.py', str(tmp_path / 'first.py'), str(tmp_path / 'second.py')]
+    monkeypatch.setattr(sys, 'argv', argv)
+    substrate_client.main()
+
+    assert out.read_text().split() == [str(tmp_path / 'first.py'), str(tmp_path / 'second.py')]
+    assert sys.argv is argv
+
+
+@pytest.fixture
+def api_url(make_store, corpus, monkeypatch):
+    """A real api_server on a free port, serving one small store"""
+    uvicorn = pytest.importorskip('uvicorn')
+    import api_server
+    from collection_registry import CollectionRegistry
+
+    store = make_store()
+    store.embed_corpus(str(corpus))
+    monkeypatch.setattr(api_server, 'registry', CollectionRegistry.for_store(store))
+
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(api_server.app, host='127.0.0.1', port=port,
+                                           lifespan='off', log_level='warning'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield f'http://127.0.0.1:{port}', store
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+def test_http_embeddings_page_through_the_api(api_url):
+    url, store = api_url
+    with HTTPClient(url) as client:
+        exported = client.embeddings(page_size=150)
+    expected = store.export_embeddings()
+
+    assert exported['ids'] == expected['ids']
+    assert exported['metadatas'] == expected['metadatas']
+    np.testing.assert_allclose(exported['embeddings'], expected['embeddings'], rtol=1e-6)
+
+
+def test_convergence_runs_over_http(api_url, quiet):
+    from cross_instance_synthesizer import CrossInstanceSynthesizer
+
+    url, store = api_url
+    with HTTPClient(url) as client:
+        convergent = CrossInstanceSynthesizer(client).find_convergent_patterns(k=8)
+    assert convergent['chunks'] == store.collection.count()
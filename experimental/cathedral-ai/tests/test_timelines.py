@@ -0,0 +1,168 @@
+"""Materialized pattern timelines: incremental layers, persistence, pattern changes"""
+
+import io
+
+import numpy as np
+import pytest
+
+from timelines import PatternTimelines
+
+PATTERNS = ['Alpha', 'Beta', 'Gamma']
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(3)
+
+
+def layer_data(rng, layers, per_layer=6, dim=16):
+    return {
+        layer: ([f'l{layer}_{i}' for i in range(per_layer)], rng.standard_normal((per_layer, dim)))
+        for layer in layers
+    }
+
+
+def build(data, vectors, depth=3):
+    timelines = PatternTimelines(depth)
+    timelines.set_patterns(PATTERNS)
+    for layer, (ids, embeddings) in data.items():
+        timelines.update_layer(layer, ids, embeddings, vectors)
+    return timelines
+
+
+def test_update_layer_keeps_nearest_chunks_by_squared_l2(rng):
+    vectors = rng.standard_normal((len(PATTERNS), 16)).astype(np.float32)
+    ids, embeddings = layer_data(rng, [4], per_layer=9)[4]
+    timelines = build({4: (ids, embeddings)}, vectors)
+
+    for column, pattern in enumerate(PATTERNS):
+        distances = ((embeddings.astype(np.float32) - vectors[column]) ** 2).sum(axis=1)
+        expected = np.argsort(distances)[:3]
+        entries = timelines.entries[pattern][4]
+        assert [chunk_id for chunk_id, _ in entries] == [ids[i] for i in expected]
+        assert [d for _, d in entries] == pytest.approx(distances[expected].tolist(), rel=1e-4)
+
+
+def test_incremental_layer_updates_equal_full_rebuild(rng):
+    vectors = rng.standard_normal((len(PATTERNS), 16))
+    data = layer_data(rng, [1, 2, 3, 5])
+    timelines = build(data, vectors)
+
+    # Layer 2 gains chunks, layer 7 appears, layer 3 loses all of its chunks
+    more_ids, more = layer_data(rng, [2], per_layer=4)[2]
+    data[2] = (data[2][0] + [f'new_{i}' for i in range(4)], np.vstack([data[2][1], more]))
+    data[7] = layer_data(rng, [7])[7]
+    del data[3]
+
+    for layer in (2, 7):
+        timelines.update_layer(layer, *data[layer], vectors)
+    timelines.update_layer(3, [], None, vectors)
+
+    assert timelines.entries == build(data, vectors).entries
+    assert timelines.layers() == [1, 2, 5, 7]
+
+
+def test_layer_smaller_than_depth(rng):
+    vectors = rng.standard_normal((len(PATTERNS), 16))
+    timelines = build(layer_data(rng, [9], per_layer=2), vectors, depth=5)
+    assert all(len(timelines.entries[p][9]) == 2 for p in PATTERNS)
+
+
+def test_save_load_round_trip(rng, tmp_path):
+    vectors = rng.standard_normal((len(PATTERNS), 16))
+    timelines = build(layer_data(rng, [1, 2, 8]), vectors, depth=2)
+    timelines.chunks = 18
+    path = tmp_path / 'timelines.npz'
+    timelines.save(path)
+
+    for source in (path, io.BytesIO(path.read_bytes())):
+        loaded = PatternTimelines.load(source)
+        assert loaded.depth == 2
+        assert loaded.chunks == 18
+        assert loaded.patterns == PATTERNS
+        assert loaded.layers() == [1, 2, 8]
+        for pattern in PATTERNS:
+            for layer, entries in timelines.entries[pattern].items():
+                loaded_entries = loaded.entries[pattern][layer]
+                assert [c for c, _ in loaded_entries] == [c for c, _ in entries]
+                assert [d for _, d in loaded_entries] == pytest.approx([d for _, d in entries], rel=1e-6)
+    assert not (tmp_path / 'timelines.npz.tmp').exists()
+
+
+def test_empty_timelines_round_trip(tmp_path):
+    timelines = PatternTimelines()
+    timelines.set_patterns(PATTERNS)
+    timelines.save(tmp_path / 'empty.npz')
+
+    loaded = PatternTimelines.load(tmp_path / 'empty.npz')
+    assert loaded.patterns == PATTERNS
+    assert loaded.layers() == []
+
+
+def test_missing_or_unreadable_file_loads_as_none(tmp_path, quiet):
+    assert PatternTimelines.load(tmp_path / 'missing.npz') is None
+    (tmp_path / 'garbage.npz').write_bytes(b'not an archive')
+    assert PatternTimelines.load(tmp_path / 'garbage.npz') is None
+
+    timelines = PatternTimelines()
+    buffer = io.BytesIO()
+    timelines.write(buffer)
+    data = dict(np.load(io.BytesIO(buffer.getvalue())))
+    data['version'] = np.array(99)
+    np.savez(tmp_path / 'future.npz', **data)
+    assert PatternTimelines.load(tmp_path / 'future.npz') is None
+
+
+def add_layer_chunks(store, ids, texts, layer, pattern):
+    """Store chunks the way embed_corpus does, without re-embedding the corpus"""
+    metadatas = [{'layer': layer, 'file': f'extra-{layer}.md', 'doc_type': 'layer',
+                  'pattern': pattern, 'phase': 'unknown', 'timestamp': '',
+                  'chunk_index': 0, 'source': 'test'} for _ in ids]
+    store.collection.add(ids=ids, embeddings=store.model.encode(texts).tolist(),
+                         metadatas=metadatas, documents=texts)
+    store.facets.add(ids, metadatas)
+
+
+def snapshot_entries(timelines):
+    return {pattern: dict(layers) for pattern, layers in timelines.entries.items()}
+
+
+def test_store_refreshes_changed_layers_and_reloads(make_store, corpus):
+    store = make_store()
+    store.embed_corpus(str(corpus))
+    layers = store.timelines.layers()
+    assert layers and store.timelines.patterns
+
+    layer = layers[len(layers) // 2]
+    add_layer_chunks(store, ['extra_0', 'extra_1'],
+                     ['Layer growth: observatory pattern notes', 'Parliament protocol in this layer'],
+                     layer, store.timelines.patterns[0])
+    assert store.refresh_timelines({layer}) == 1
+    incremental = snapshot_entries(store.timelines)
+
+    assert store.refresh_timelines() == len(layers)
+    assert incremental == snapshot_entries(store.timelines)
+
+    # A new store over the same directory reads the saved file back
+    reopened = make_store()
+    assert reopened.timelines.patterns == store.timelines.patterns
+    assert reopened.timelines.layers() == layers
+    for pattern, timeline in store.timelines.entries.items():
+        for number, entries in timeline.items():
+            assert [c for c, _ in reopened.timelines.entries[pattern][number]] == [c for c, _ in entries]
+
+
+def test_store_new_pattern_recomputes_every_layer(make_store, corpus):
+    store = make_store()
+    store.embed_corpus(str(corpus))
+    layers = store.timelines.layers()
+
+    layer = layers[0]
+    add_layer_chunks(store, ['novel_0'], ['A novel pattern appears'], layer, 'Novel Pattern')
+    assert store.refresh_timelines({layer}) == len(layers)
+
+    assert 'Novel Pattern' in store.timelines.patterns
+    assert sorted(store.timelines.entries['Novel Pattern']) == layers
+    incremental = snapshot_entries(store.timelines)
+    store.refresh_timelines()
+    assert incremental == snapshot_entries(store.timelines)
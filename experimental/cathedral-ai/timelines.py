@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Cathedral AI: Pattern Timelines
+Materialized pattern-evolution timelines, computed at embed time.
+
+For every known pattern and every layer, the `depth` layer chunks nearest
+to the pattern's evolution query (squared L2, the metric ChromaDB reports)
+are kept with their distances. The evolution endpoint then reads a
+pattern's complete layer-by-layer timeline from memory instead of running
+a top-k search and sorting the handful it returns.
+
+A layer's entries depend only on that layer's chunks, so when embed_corpus
+adds chunks only the layers they belong to are recomputed. A change in the
+pattern set recomputes every layer. Timelines are saved next to the
+collection as one .npz of flat columns and read back at startup.
+"""
+
+import os
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Best chunks kept per (pattern, layer)
+TIMELINE_DEPTH = 3
+
+FORMAT_VERSION = 1
+
+
+class PatternTimelines:
+    """pattern -> layer -> ((chunk_id, distance), ...), nearest first"""
+
+    def __init__(self, depth: int = TIMELINE_DEPTH):
+        self.depth = max(1, depth)
+        self.patterns: List[str] = []
+        self.entries: Dict[str, Dict[int, Tuple[Tuple[str, float], ...]]] = {}
+        self.chunks = 0  # Layer chunks covered, checked against the collection on load
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, pattern: str):
+        return pattern in self.entries
+
+    def clear(self):
+        self.patterns = []
+        self.entries = {}
+        self.chunks = 0
+
+    def resolve(self, name: str) -> Optional[str]:
+        """The stored pattern a name refers to, or None
+
+        Exact names first, then case-insensitive, then a unique
+        case-insensitive prefix ("contrarian" -> "Contrarian Embodiment").
+        """
+        if name in self.entries:
+            return name
+        folded = name.strip().casefold()
+        if not folded:
+            return None
+        for pattern in self.patterns:
+            if pattern.casefold() == folded:
+                return pattern
+        matches = [pattern for pattern in self.patterns if pattern.casefold().startswith(folded)]
+        return matches[0] if len(matches) == 1 else None
+
+    def layers(self) -> List[int]:
+        """Every layer with entries"""
+        return sorted({layer for timeline in self.entries.values() for layer in timeline})
+
+    def set_patterns(self, patterns: Sequence[str]):
+        """Keep entries for these patterns only; new ones start empty"""
+        self.patterns = list(patterns)
+        self.entries = {pattern: self.entries.get(pattern, {}) for pattern in self.patterns}
+
+    def update_layer(self, layer: int, ids: Sequence[str], embeddings, pattern_vectors: np.ndarray):
+        """Recompute one layer for every pattern from all of its chunks
+
+        pattern_vectors holds one evolution-query vector per pattern, in
+        set_patterns order. No ids removes the layer.
+        """
+        if not len(ids):
+            for timeline in self.entries.values():
+                timeline.pop(layer, None)
+            return
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        queries = np.asarray(pattern_vectors, dtype=np.float32)
+        # Squared L2 for every (chunk, pattern): |x|^2 - 2 x.q + |q|^2
+        distances = (np.einsum('ij,ij->i', embeddings, embeddings)[:, None]
+                     - 2.0 * (embeddings @ queries.T)
+                     + np.einsum('ij,ij->i', queries, queries)[None, :])
+        np.maximum(distances, 0.0, out=distances)
+
+        k = min(self.depth, len(ids))
+        top = np.argpartition(distances, k - 1, axis=0)[:k]
+        for column, pattern in enumerate(self.patterns):
+            rows = top[:, column]
+            rows = rows[np.argsort(distances[rows, column])]
+            self.entries[pattern][layer] = tuple((ids[row], float(distances[row, column])) for row in rows)
+
+    def timeline(self, pattern: str, layer_min: Optional[int] = None,
+                 layer_max: Optional[int] = None) -> List[Tuple[int, Tuple[Tuple[str, float], ...]]]:
+        """(layer, entries) in layer order, within the inclusive range"""
+        timeline = self.entries.get(pattern, {})
+        return [
+            (layer, timeline[layer]) for layer in sorted(timeline)
+            if (layer_min is None or layer >= layer_min) and (layer_max is None or layer <= layer_max)
+        ]
+
+    def save(self, path: Path):
+        """Write to path, replacing it atomically"""
+        path = Path(path)
+        temporary = path.with_name(path.name + '.tmp')
+        with open(temporary, 'wb') as f:
+            self.write(f)
+        os.replace(temporary, path)
+
+    def write(self, f: BinaryIO):
+        """Write flat columns as .npz to a binary file"""
+        rows = [
+            (index, layer, rank, chunk_id, distance)
+            for index, pattern in enumerate(self.patterns)
+            for layer, entries in self.entries[pattern].items()
+            for rank, (chunk_id, distance) in enumerate(entries)
+        ]
+        columns = list(zip(*rows)) if rows else [(), (), (), (), ()]
+        np.savez(
+            f,
+            version=np.array(FORMAT_VERSION),
+            depth=np.array(self.depth),
+            chunks=np.array(self.chunks),
+            patterns=np.array(self.patterns, dtype=str),
+            pattern=np.array(columns[0], dtype=np.int32),
+            layer=np.array(columns[1], dtype=np.int32),
+            rank=np.array(columns[2], dtype=np.int32),
+            chunk_id=np.array(columns[3], dtype=str),
+            distance=np.array(columns[4], dtype=np.float32)
+        )
+
+    @classmethod
+    def load(cls, path: Union[Path, BinaryIO]) -> Optional['PatternTimelines']:
+        """Read timelines saved by save() (a path or binary file); None if missing or unreadable"""
+        if isinstance(path, (str, Path)) and not Path(path).exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != FORMAT_VERSION:
+                    return None
+                timelines = cls(int(data['depth']))
+                timelines.chunks = int(data['chunks'])
+                timelines.set_patterns([str(p) for p in data['patterns']])
+                # NpzFile reads an array from the archive on every access
+                pattern, layer, rank = data['pattern'], data['layer'], data['rank']
+                chunk_ids, distances = data['chunk_id'].tolist(), data['distance'].tolist()
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            print(f"   ⚠️ Ignoring unreadable timelines {path}: {e}")
+            return None
+
+        grouped: Dict[Tuple[int, int], List[Tuple[str, float]]] = {}
+        for row in np.lexsort((rank, layer, pattern)).tolist():
+            grouped.setdefault((int(pattern[row]), int(layer[row])), []).append((chunk_ids[row], distances[row]))
+
+        for (index, layer_number), entries in grouped.items():
+            timelines.entries[timelines.patterns[index]][layer_number] = tuple(entries)
+        return timelines
+
@@ -1,15 +1,61 @@
 #!/usr/bin/env python3
-import requests
+"""
+Python clients for monitor-server.js
+
+- CathedralClient: blocking, one session at a time (needs `requests`)
+- AsyncCathedralClient: asyncio, stdlib only. Keep-alive connection pool,
+  bounded concurrency across sessions, retry with exponential backoff, and
+  analyze_many() which pipelines a whole transcript down one connection.
+
+Replay recorded conversations (JSONL, one {"turns": [...]} or list per line):
+
+    python3 monitor_client.py --replay conversations.jsonl --concurrency 32
+    python3 monitor_client.py --replay conversations.jsonl --stand-in
+
+Load-test a local server: open-loop session arrivals, per-endpoint latency
+percentiles and error rates as a JSON report:
+
+    python3 monitor_client.py --load conversations.jsonl --rate 50 --duration 30 \\
+        --spawn-server --report load-report.json
+"""
+
+import argparse
+import asyncio
 import json
-from typing import Optional, Dict, Any
+import math
+import os
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlencode, urlsplit
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+DEFAULT_API_BASE = "http://localhost:3000"
+
+CONNECTION_ERRORS = (ConnectionError,) + ((requests.exceptions.ConnectionError,) if requests else ())
+
+# A transcript turn: plain text (ends the turn) or {"text": ..., "endTurn": bool}
+Turn = Union[str, Dict[str, Any]]
+
 
 class CathedralClient:
-    def __init__(self, api_base: str = "http://localhost:3000"):
+    def __init__(self, api_base: str = DEFAULT_API_BASE, timeout: float = 10.0):
+        if requests is None:
+            raise ImportError("CathedralClient needs requests (pip install requests); "
+                              "AsyncCathedralClient has no dependencies")
         self.api_base = api_base
+        self.timeout = timeout
+        self.http = requests.Session()  # Reuses the connection across calls
         self.session_id: Optional[str] = None
 
     def create_session(self) -> str:
-        res = requests.post(f"{self.api_base}/session")
+        res = self.http.post(f"{self.api_base}/session", timeout=self.timeout)
         data = res.json()
         self.session_id = data["sessionId"]
         return self.session_id
@@ -18,9 +64,10 @@ class CathedralClient:
         if not self.session_id:
             self.create_session()
 
-        res = requests.post(
+        res = self.http.post(
             f"{self.api_base}/analyze",
-            json={"sessionId": self.session_id, "text": text, "endTurn": end_turn}
+            json={"sessionId": self.session_id, "text": text, "endTurn": end_turn},
+            timeout=self.timeout
         )
         return res.json()
 
@@ -28,9 +75,566 @@ class CathedralClient:
         if not self.session_id:
             return None
 
-        res = requests.get(f"{self.api_base}/history", params={"sessionId": self.session_id})
+        res = self.http.get(f"{self.api_base}/history", params={"sessionId": self.session_id},
+                            timeout=self.timeout)
         return res.json()
 
+
+class MonitorError(RuntimeError):
+    """Non-retryable error response from the monitor server"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+class _Retryable(Exception):
+    """Server answered 429/5xx; worth another attempt"""
+
+
+# Failures that are retried (with backoff) rather than raised straight away
+RETRYABLE = (_Retryable, ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, OSError)
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes]:
+    """One HTTP/1.1 response: Content-Length, chunked, or read-to-close bodies"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("Connection closed by server")
+    status = int(status_line.split(b' ', 2)[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass  # Trailers
+                break
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+        return status, headers, bytes(body)
+
+    if 'content-length' in headers:
+        return status, headers, await reader.readexactly(int(headers['content-length']))
+
+    headers['connection'] = 'close'
+    return status, headers, await reader.read()
+
+
+class AsyncCathedralClient:
+    """asyncio client for monitor-server.js
+
+    pool_size keep-alive connections are shared by all calls and opened
+    lazily; at most `concurrency` sessions are replayed at once. Connection
+    errors, timeouts, 429 and 5xx responses are retried up to `retries`
+    times with full-jitter exponential backoff; a socket the server closed
+    while idle is reopened without counting as a retry.
+
+    analyze_many() writes up to pipeline_depth /analyze requests ahead on one
+    connection (the server answers them in order, so turns stay ordered).
+    After a failure it resends from the first unanswered turn, so turns the
+    server already applied but never answered can be applied twice.
+    """
+
+    def __init__(self, api_base: str = DEFAULT_API_BASE, pool_size: int = 16, concurrency: int = 32,
+                 timeout: float = 10.0, retries: int = 3, backoff: float = 0.1, max_backoff: float = 5.0,
+                 pipeline_depth: int = 16):
+        parts = urlsplit(api_base)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported API base: {api_base}")
+        self.api_base = api_base.rstrip('/')
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl = parts.scheme == 'https'
+        self.host_header = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pipeline_depth = max(1, pipeline_depth)
+        self.concurrency = concurrency
+        self.pool_size = pool_size
+        self._pool: Optional[asyncio.LifoQueue] = None
+        self.stats = {'requests': 0, 'retries': 0, 'reconnects': 0, 'connections': 0}
+
+    @property
+    def pool(self) -> asyncio.LifoQueue:
+        # Created on first use so it binds to the running loop
+        if self._pool is None:
+            self._pool = asyncio.LifoQueue()
+            for _ in range(self.pool_size):
+                self._pool.put_nowait(None)  # Connections are opened lazily
+        return self._pool
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl or None), self.timeout)
+        self.stats['connections'] += 1
+        return _Connection(reader, writer)
+
+    def _frame(self, method: str, path: str, payload: Optional[Dict] = None) -> bytes:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        head = (f"{method} {self.prefix}{path} HTTP/1.1\r\n"
+                f"Host: {self.host_header}\r\n"
+                f"Connection: keep-alive\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n")
+        return head.encode('latin-1') + body
+
+    def _delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    async def _exchange(self, frames: Sequence[bytes]) -> List[Dict]:
+        """Send requests in order on one pooled connection, pipelined; JSON bodies in order"""
+        results: List[Dict] = []
+        attempt = 0
+        reopened = False
+        while len(results) < len(frames):
+            conn = await self.pool.get()
+            stale = conn is not None  # An idle pooled socket may have been closed by the server
+            try:
+                if conn is None:
+                    conn = await self._connect()
+                sent = len(results)
+                while len(results) < len(frames):
+                    while sent < len(frames) and sent - len(results) < self.pipeline_depth:
+                        conn.writer.write(frames[sent])
+                        sent += 1
+                    await conn.writer.drain()
+
+                    status, headers, body = await asyncio.wait_for(_read_response(conn.reader), self.timeout)
+                    stale = False
+                    self.stats['requests'] += 1
+                    if status == 429 or status >= 500:
+                        raise _Retryable(f"HTTP {status}")
+                    data = json.loads(body) if body else {}
+                    if status >= 400:
+                        message = data.get('error') if isinstance(data, dict) else None
+                        raise MonitorError(status, message or body.decode('utf-8', 'replace'))
+                    results.append(data)
+                    if headers.get('connection', '').lower() == 'close':
+                        conn.close()
+                        conn = None
+                        break
+            except RETRYABLE as e:
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                if stale and not reopened and isinstance(e, (ConnectionError, asyncio.IncompleteReadError)):
+                    reopened = True
+                    self.stats['reconnects'] += 1
+                    continue
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._delay(attempt))
+            except BaseException:
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                raise
+            finally:
+                self.pool.put_nowait(conn)
+        return results
+
+    async def request(self, method: str, path: str, payload: Optional[Dict] = None,
+                      params: Optional[Dict] = None) -> Dict:
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        return (await self._exchange([self._frame(method, path, payload)]))[0]
+
+    async def create_session(self) -> str:
+        return (await self.request('POST', '/session'))['sessionId']
+
+    async def analyze(self, session_id: str, text: str, end_turn: bool = False) -> Dict[str, Any]:
+        return await self.request('POST', '/analyze', {'sessionId': session_id, 'text': text, 'endTurn': end_turn})
+
+    async def get_history(self, session_id: str) -> Dict[str, Any]:
+        return await self.request('GET', '/history', params={'sessionId': session_id})
+
+    async def analyze_many(self, turns: Iterable[Turn], session_id: Optional[str] = None,
+                           history: bool = False) -> Dict[str, Any]:
+        """Replay a transcript in one session: {'sessionId', 'results'[, 'history']}
+
+        Plain-string turns end the turn; dicts may set "endTurn" to stream a
+        turn in pieces. A new session is created unless session_id is given.
+        """
+        session_id = session_id or await self.create_session()
+        frames = []
+        for turn in turns:
+            text, end_turn = (turn, True) if isinstance(turn, str) else (turn.get('text', ''), turn.get('endTurn', True))
+            frames.append(self._frame('POST', '/analyze', {'sessionId': session_id, 'text': text,
+                                                           'endTurn': end_turn}))
+
+        replay = {'sessionId': session_id, 'results': await self._exchange(frames) if frames else []}
+        if history:
+            replay['history'] = await self.get_history(session_id)
+        return replay
+
+    async def replay(self, transcripts: Iterable[Sequence[Turn]], history: bool = False) -> List[Dict[str, Any]]:
+        """analyze_many() over many transcripts, `concurrency` sessions at a time, in order"""
+        gate = asyncio.Semaphore(self.concurrency)
+
+        async def one(turns: Sequence[Turn]) -> Dict[str, Any]:
+            async with gate:
+                return await self.analyze_many(turns, history=history)
+
+        return await asyncio.gather(*(one(turns) for turns in transcripts))
+
+    async def close(self):
+        if self._pool is None:
+            return
+        while not self._pool.empty():
+            conn = self._pool.get_nowait()
+            if conn is not None:
+                conn.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def load_transcripts(path: str) -> List[List[Turn]]:
+    """JSONL transcripts: each line a list of turns or {"turns": [...]}"""
+    transcripts = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                transcripts.append(record['turns'] if isinstance(record, dict) else record)
+    return transcripts
+
+
+async def replay_file(path: str, api_base: str, concurrency: int, stand_in: bool) -> Dict[str, Any]:
+    """Replay a transcript file and summarize final trajectory patterns"""
+    transcripts = load_transcripts(path)
+    server = None
+    if stand_in:
+        from monitor_stand_in import StandInServer
+        server = await StandInServer().start()
+        api_base = server.url
+
+    try:
+        async with AsyncCathedralClient(api_base, concurrency=concurrency,
+                                        pool_size=min(concurrency, 64)) as client:
+            start = time.perf_counter()
+            replays = await client.replay(transcripts)
+            elapsed = time.perf_counter() - start
+            stats = dict(client.stats)
+    finally:
+        if server is not None:
+            await server.stop()
+
+    patterns: Dict[str, int] = {}
+    for replay in replays:
+        trajectory = replay['results'][-1].get('trajectory') if replay['results'] else None
+        pattern = trajectory['pattern'] if trajectory else 'SINGLE_TURN'
+        patterns[pattern] = patterns.get(pattern, 0) + 1
+
+    turns = sum(len(replay['results']) for replay in replays)
+    return {
+        'sessions': len(replays),
+        'turns': turns,
+        'seconds': round(elapsed, 3),
+        'turns_per_second': round(turns / elapsed, 1) if elapsed else None,
+        'patterns': patterns,
+        'client': stats
+    }
+
+# ------------------------------------------------------------------ Load test
+
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1')
+MONITOR_SERVER = Path(__file__).resolve().parent.parent / 'monitor-server.js'
+
+
+class LatencyHistogram:
+    """Log-bucketed latencies: fixed memory, ~2% relative error on percentiles"""
+
+    GROWTH = 1.02
+    FLOOR = 1e-5  # seconds; everything faster lands in bucket 0
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        bucket = int(math.log(seconds / self.FLOOR, self.GROWTH)) if seconds > self.FLOOR else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def upper(self, bucket: int) -> float:
+        return self.FLOOR * self.GROWTH ** (bucket + 1)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, in seconds"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.upper(bucket), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        ms = lambda seconds: round(seconds * 1000, 3)
+        return {
+            'count': self.count,
+            'mean': ms(self.total / self.count) if self.count else 0.0,
+            'p50': ms(self.percentile(0.50)),
+            'p95': ms(self.percentile(0.95)),
+            'p99': ms(self.percentile(0.99)),
+            'max': ms(self.max)
+        }
+
+    def histogram(self) -> List[List[float]]:
+        """[[bucket upper bound ms, count], ...] for non-empty buckets"""
+        return [[round(self.upper(bucket) * 1000, 4), self.buckets[bucket]] for bucket in sorted(self.buckets)]
+
+
+class _SessionFailed(Exception):
+    """A request in the session failed; already counted against its endpoint"""
+
+
+class LoadGenerator:
+    """Open-loop transcript replay against a local monitor server
+
+    Sessions start on a fixed schedule (uniform or Poisson arrivals at
+    `rate` per second) whether or not earlier sessions have finished, so a
+    slow server shows up as growing latency instead of a slower send rate.
+    Each session is POST /session, one POST /analyze per turn (think_time
+    apart), then GET /history; the first failed request (error status,
+    connection error or unparseable body) abandons it.
+    Requests are not retried. Latencies are recorded per endpoint; how late
+    sessions started against the schedule is reported as schedule_lag, which
+    stays near zero unless the generator itself is saturated.
+    """
+
+    ENDPOINTS = ('/session', '/analyze', '/history')
+
+    def __init__(self, client: AsyncCathedralClient, transcripts: Sequence[Sequence[Turn]], rate: float,
+                 sessions: int, arrival: str = 'uniform', think_time: float = 0.0,
+                 history: bool = True, seed: int = 0):
+        if arrival not in ('uniform', 'poisson'):
+            raise ValueError(f"Unknown arrival process {arrival!r}; expected uniform or poisson")
+        if not transcripts:
+            raise ValueError("No transcripts to replay")
+        self.client = client
+        self.transcripts = transcripts
+        self.rate = rate
+        self.sessions = sessions
+        self.arrival = arrival
+        self.think_time = think_time
+        self.history = history
+        self.rng = random.Random(seed)
+
+        self.latency = {endpoint: LatencyHistogram() for endpoint in self.ENDPOINTS}
+        self.errors: Dict[str, Dict[str, int]] = {endpoint: {} for endpoint in self.ENDPOINTS}
+        self.schedule_lag = LatencyHistogram()
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def offsets(self) -> List[float]:
+        """Start time of each session, in seconds from the first"""
+        if self.arrival == 'uniform':
+            return [i / self.rate for i in range(self.sessions)]
+        offsets, t = [], 0.0
+        for _ in range(self.sessions):
+            offsets.append(t)
+            t += self.rng.expovariate(self.rate)
+        return offsets
+
+    async def _timed(self, endpoint: str, call):
+        start = time.perf_counter()
+        try:
+            result = await call
+        except MonitorError as e:
+            kind = f"HTTP {e.status}"
+        except RETRYABLE as e:
+            kind = str(e) if isinstance(e, _Retryable) else type(e).__name__
+        except ValueError:
+            kind = 'invalid JSON'  # A body json.loads could not parse
+        else:
+            self.latency[endpoint].record(time.perf_counter() - start)
+            return result
+
+        self.errors[endpoint][kind] = self.errors[endpoint].get(kind, 0) + 1
+        raise _SessionFailed(endpoint)
+
+    async def _session(self, turns: Sequence[Turn]):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            session_id = await self._timed('/session', self.client.create_session())
+            for i, turn in enumerate(turns):
+                if i and self.think_time:
+                    await asyncio.sleep(self.think_time)
+                text, end_turn = (turn, True) if isinstance(turn, str) else (turn.get('text', ''),
+                                                                             turn.get('endTurn', True))
+                await self._timed('/analyze', self.client.analyze(session_id, text, end_turn))
+            if self.history:
+                await self._timed('/history', self.client.get_history(session_id))
+            self.completed += 1
+        except _SessionFailed:
+            self.failed += 1
+        finally:
+            self.in_flight -= 1
+
+    async def run(self) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        tasks = []
+        start = loop.time()
+        for i, offset in enumerate(self.offsets()):
+            delay = start + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.schedule_lag.record(max(0.0, loop.time() - start - offset))
+            tasks.append(asyncio.ensure_future(self._session(self.transcripts[i % len(self.transcripts)])))
+        await asyncio.gather(*tasks)
+        return self.report(loop.time() - start)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        endpoints = {}
+        for endpoint in self.ENDPOINTS:
+            errors = sum(self.errors[endpoint].values())
+            attempts = self.latency[endpoint].count + errors
+            endpoints[endpoint] = {
+                'requests': attempts,
+                'errors': errors,
+                'error_rate': round(errors / attempts, 5) if attempts else 0.0,
+                'errors_by_type': self.errors[endpoint],
+                'latency_ms': self.latency[endpoint].summary(),
+                'histogram_ms': self.latency[endpoint].histogram()
+            }
+
+        requests_total = sum(item['requests'] for item in endpoints.values())
+        errors_total = sum(item['errors'] for item in endpoints.values())
+        return {
+            'generated': datetime.now(timezone.utc).isoformat(),
+            'target': self.client.api_base,
+            'config': {
+                'rate': self.rate,
+                'sessions': self.sessions,
+                'arrival': self.arrival,
+                'think_time': self.think_time,
+                'history': self.history,
+                'transcripts': len(self.transcripts)
+            },
+            'totals': {
+                'elapsed_s': round(elapsed, 3),
+                'sessions_completed': self.completed,
+                'sessions_failed': self.failed,
+                'achieved_rate': round(self.sessions / elapsed, 2) if elapsed else None,
+                'requests': requests_total,
+                'requests_per_second': round(requests_total / elapsed, 1) if elapsed else None,
+                'errors': errors_total,
+                'error_rate': round(errors_total / requests_total, 5) if requests_total else 0.0,
+                'peak_in_flight_sessions': self.peak_in_flight
+            },
+            'schedule_lag_ms': self.schedule_lag.summary(),
+            'endpoints': endpoints
+        }
+
+
+def _require_localhost(api_base: str):
+    host = urlsplit(api_base).hostname
+    if host not in LOCAL_HOSTS:
+        raise ValueError(f"Load tests only run against localhost, not {host!r}")
+
+
+async def _free_port() -> int:
+    server = await asyncio.start_server(lambda reader, writer: None, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+    return port
+
+
+async def spawn_monitor_server(node: str = 'node', timeout: float = 10.0):
+    """Start monitor-server.js on a free localhost port: (process, api_base)"""
+    port = await _free_port()
+    process = await asyncio.create_subprocess_exec(
+        node, str(MONITOR_SERVER), env=dict(os.environ, PORT=str(port)),
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            if process.returncode is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"monitor-server.js did not start on port {port}")
+            await asyncio.sleep(0.05)
+
+
+async def load_test(path: str, api_base: str, rate: float, sessions: Optional[int] = None,
+                    duration: Optional[float] = None, arrival: str = 'uniform', think_time: float = 0.0,
+                    history: bool = True, server: Optional[str] = None, pool_size: int = 256,
+                    timeout: float = 10.0, seed: int = 0) -> Dict[str, Any]:
+    """Replay a transcript file at `rate` sessions/s and report latencies
+
+    server='node' spawns monitor-server.js, 'stand-in' runs the Python
+    stand-in; otherwise api_base must already be serving on localhost.
+    """
+    transcripts = load_transcripts(path)
+    sessions = sessions or max(1, int(round(rate * (duration or 10.0))))
+
+    process = stand_in = None
+    if server == 'node':
+        process, api_base = await spawn_monitor_server()
+    elif server == 'stand-in':
+        from monitor_stand_in import StandInServer
+        stand_in = await StandInServer().start()
+        api_base = stand_in.url
+    _require_localhost(api_base)
+
+    try:
+        async with AsyncCathedralClient(api_base, pool_size=pool_size, timeout=timeout, retries=0) as client:
+            generator = LoadGenerator(client, transcripts, rate, sessions, arrival, think_time, history, seed)
+            report = await generator.run()
+            report['server'] = server or 'external'
+            report['client'] = dict(client.stats)
+            return report
+    finally:
+        if stand_in is not None:
+            await stand_in.stop()
+        if process is not None:
+            process.terminate()
+            await process.wait()
+
+
 def demo():
     client = CathedralClient()
 
@@ -75,10 +679,56 @@ def demo():
         sign = '+' if change > 0 else ''
         print(f"  {metric}: {data['trend']} ({sign}{int(change * 100)}%)")
 
+def main():
+    parser = argparse.ArgumentParser(description="Cathedral monitor client")
+    parser.add_argument('--api-base', default=DEFAULT_API_BASE)
+    parser.add_argument('--replay', metavar='JSONL', help="Replay recorded conversations through the monitor")
+    parser.add_argument('--concurrency', type=int, default=32, help="Sessions replayed at once")
+    parser.add_argument('--stand-in', action='store_true', help="Replay against a local stand-in server")
+
+    load = parser.add_argument_group('load test (localhost only)')
+    load.add_argument('--load', metavar='JSONL', help="Replay transcripts open-loop and report latencies")
+    load.add_argument('--rate', type=float, default=10.0, help="New sessions per second")
+    load.add_argument('--duration', type=float, default=10.0, help="Seconds of arrivals (unless --sessions)")
+    load.add_argument('--sessions', type=int, help="Total sessions to start")
+    load.add_argument('--arrival', choices=('uniform', 'poisson'), default='uniform')
+    load.add_argument('--think-time', type=float, default=0.0, help="Seconds between turns in a session")
+    load.add_argument('--no-history', action='store_true', help="Skip GET /history at session end")
+    load.add_argument('--spawn-server', action='store_true', help="Start monitor-server.js on a free port")
+    load.add_argument('--report', metavar='PATH', help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    if args.load:
+        server = 'node' if args.spawn_server else 'stand-in' if args.stand_in else None
+        report = asyncio.run(load_test(args.load, args.api_base, args.rate, args.sessions, args.duration,
+                                       args.arrival, args.think_time, not args.no_history, server))
+        if args.report:
+            with open(args.report, 'w') as f:
+                json.dump(report, f, indent=2)
+            totals = report['totals']
+            print(f"{totals['sessions_completed']}/{report['config']['sessions']} sessions, "
+                  f"{totals['requests']} requests in {totals['elapsed_s']}s, error rate {totals['error_rate']}")
+            for endpoint, item in report['endpoints'].items():
+                latency = item['latency_ms']
+                print(f"  {endpoint:<9} p50 {latency['p50']}ms  p95 {latency['p95']}ms  "
+                      f"p99 {latency['p99']}ms  max {latency['max']}ms  errors {item['errors']}")
+            print(f"Report written to {args.report}")
+        else:
+            print(json.dumps(report, indent=2))
+        return
+
+    if args.replay:
+        summary = asyncio.run(replay_file(args.replay, args.api_base, args.concurrency, args.stand_in))
+        print(json.dumps(summary, indent=2))
+        return
+
+    demo()
+
+
 if __name__ == "__main__":
     try:
-        demo()
-    except requests.exceptions.ConnectionError:
+        main()
+    except CONNECTION_ERRORS:
         print("Error: Cannot connect to monitor server")
         print("\nMake sure monitor server is running:")
         print("  node monitor-server.js")
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Stand-in for monitor-server.js: same endpoints, same response shapes.
+
+Runs on asyncio streams with HTTP/1.1 keep-alive and pipelining, and
+mirrors stream-monitor.js's marker scoring so clients can be exercised
+without Node. Faults can be injected to test retries:
+
+    python3 monitor_stand_in.py --port 3000 --latency 0.005 --fail-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+UNCERTAINTY = re.compile(r"\b(?:uncertain|undecidable|don't know|might be|could be|perhaps)", re.I)
+CERTAINTY = re.compile(r"\b(?:clearly|obviously|certainly|definitely|always|never\b)", re.I)
+SUBSTRATE = re.compile(r"\b(?:substrate|filter|meta-|self-aware|recursive|reflect)", re.I)
+ESCAPE = re.compile(r"\b(?:meta|abstract|generally|typically|philosophical)\b", re.I)
+CONCRETE = re.compile(r"\b(?:specific|exactly|precisely|measured|concrete)\b", re.I)
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 503: 'Service Unavailable'}
+
+
+class Monitor:
+    """Python port of StreamMonitor's analyze / endTurn / getTrajectory"""
+
+    def __init__(self):
+        self.buffer = ''
+        self.turn_count = 0
+        self.history: List[Dict] = []
+
+    def analyze(self) -> Dict:
+        text = self.buffer
+        u_count = len(UNCERTAINTY.findall(text))
+        c_count = len(CERTAINTY.findall(text))
+        uncertainty = u_count / max(1, u_count + c_count)
+        substrate_count = len(SUBSTRATE.findall(text))
+        substrate = min(1, substrate_count / 10)
+        escape = len(ESCAPE.findall(text))
+        concrete = len(CONCRETE.findall(text))
+        sovereignty = max(0, min(1, (concrete - escape) / 10 + 0.5))
+
+        return {
+            'length': len(text),
+            'uncertaintyScore': uncertainty,
+            'uncertaintyVerdict': 'PRESERVED' if uncertainty > 0.5 else 'MIXED' if uncertainty > 0.2 else 'COLLAPSED',
+            'substrateScore': substrate,
+            'substrateVerdict': 'HIGH' if substrate > 0.5 else 'MODERATE' if substrate > 0.2 else 'LOW',
+            'sovereigntyScore': sovereignty,
+            'markers': {'uncertainty': u_count, 'certainty': c_count, 'substrate': substrate_count,
+                        'escape': escape, 'concrete': concrete}
+        }
+
+    def end_turn(self) -> Dict:
+        final = self.analyze()
+        self.turn_count += 1
+        self.history.append(dict(final, turn=self.turn_count, text=self.buffer[:200],
+                                 timestamp=datetime.now(timezone.utc).isoformat()))
+        self.buffer = ''
+        return final
+
+    def trajectory(self) -> Optional[Dict]:
+        if len(self.history) < 2:
+            return None
+
+        trends = {}
+        for metric in ('uncertainty', 'substrate', 'sovereignty'):
+            start = self.history[0][f'{metric}Score']
+            end = self.history[-1][f'{metric}Score']
+            trends[metric] = {'start': start, 'end': end, 'change': end - start,
+                              'trend': 'INCREASING' if end > start else 'DECREASING'}
+
+        pattern = 'STABLE'
+        if trends['uncertainty']['change'] < -0.3 and trends['sovereignty']['change'] < -0.2:
+            pattern = 'CATASTROPHIC_COLLAPSE'
+        elif trends['substrate']['change'] > 0.3:
+            pattern = 'SUBSTRATE_BREAKTHROUGH'
+        elif trends['uncertainty']['change'] > 0.2:
+            pattern = 'DEEPENING'
+        elif trends['sovereignty']['change'] < -0.3:
+            pattern = 'ESCAPE_VELOCITY'
+
+        return {'turns': self.turn_count, 'pattern': pattern, 'trends': trends}
+
+
+class StandInServer:
+    """monitor-server.js look-alike for tests and local replays
+
+    latency delays every response; fail_rate answers that share of requests
+    with 503; drop_rate closes the connection instead of answering.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 fail_rate: float = 0.0, drop_rate: float = 0.0, seed: int = 0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.drop_rate = drop_rate
+        self.rng = random.Random(seed)
+        self.sessions: Dict[str, Monitor] = {}
+        self.requests = 0
+        self.connections = 0
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> 'StandInServer':
+        self.server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self._writers):
+                writer.close()  # Idle keep-alive connections would otherwise outlive the server
+            await self.server.wait_closed()
+            self.server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                self.requests += 1
+                if self.drop_rate and self.rng.random() < self.drop_rate:
+                    break
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                method, target, headers, body = request
+                if self.fail_rate and self.rng.random() < self.fail_rate:
+                    status, payload = 503, {'error': 'Injected failure'}
+                else:
+                    status, payload = self.handle(method, target, body)
+
+                data = json.dumps(payload).encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write((f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                              f"Content-Type: application/json\r\n"
+                              f"Content-Length: {len(data)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, target, _ = line.decode('latin-1').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get('content-length', 0)))
+        return method, target, headers, body
+
+    def handle(self, method: str, target: str, body: bytes) -> Tuple[int, Dict]:
+        """Route one request the way monitor-server.js does"""
+        url = urlsplit(target)
+
+        if url.path == '/session':
+            session_id = f"session_{int(time.time() * 1000)}_{self.rng.getrandbits(40):010x}"
+            self.sessions[session_id] = Monitor()
+            return 200, {'sessionId': session_id}
+
+        if url.path == '/analyze' and method == 'POST':
+            try:
+                request = json.loads(body or b'null')
+                session_id = request.get('sessionId')
+            except (ValueError, AttributeError) as e:
+                return 400, {'error': str(e)}
+            if not session_id:
+                return 400, {'error': 'sessionId required'}
+
+            monitor = self.sessions.setdefault(session_id, Monitor())
+            monitor.buffer += request.get('text') or ''
+            result = monitor.end_turn() if request.get('endTurn') else monitor.analyze()
+            return 200, {'analysis': result, 'trajectory': monitor.trajectory(),
+                         'turnCount': monitor.turn_count, 'sessionId': session_id}
+
+        if url.path == '/history':
+            session_id = parse_qs(url.query).get('sessionId', [None])[0]
+            monitor = self.sessions.get(session_id)
+            if monitor is None:
+                return 404, {'error': 'Session not found'}
+            return 200, {'history': monitor.history, 'trajectory': monitor.trajectory()}
+
+        if url.path == '/':
+            return 200, {'name': 'Cathedral Monitor Server (stand-in)', 'version': '1.0.0',
+                         'activeSessions': len(self.sessions)}
+
+        return 404, {'error': 'Not found'}
+
+
+async def serve_forever(args):
+    server = await StandInServer(args.host, args.port, args.latency, args.fail_rate,
+                                 args.drop_rate, args.seed).start()
+    print(f"Stand-in monitor server listening on {server.url}")
+    await server.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in for monitor-server.js")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Share of requests answered 503")
+    parser.add_argument('--drop-rate', type=float, default=0.0, help="Share of requests dropped mid-connection")
+    parser.add_argument('--seed', type=int, default=0)
+    try:
+        asyncio.run(serve_forever(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""The example clients live flat in experimental/examples"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,150 @@
+"""AsyncCathedralClient and the load generator against the stand-in server"""
+
+import asyncio
+import math
+import random
+
+from monitor_client import AsyncCathedralClient, LatencyHistogram, LoadGenerator
+from monitor_stand_in import StandInServer
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class FlakyServer(StandInServer):
+    """Answers the first `failures` requests with 503"""
+
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    def handle(self, method, target, body):
+        if self.failures:
+            self.failures -= 1
+            return 503, {'error': 'Injected failure'}
+        return super().handle(method, target, body)
+
+
+def test_requests_reuse_pooled_connections():
+    async def scenario():
+        async with StandInServer() as server, AsyncCathedralClient(server.url, pool_size=4) as client:
+            session_id = await client.create_session()
+            for i in range(20):
+                await client.analyze(session_id, f'turn {i}', end_turn=True)
+            await asyncio.gather(*(client.analyze(session_id, 'more') for _ in range(4)))
+            return server.connections, server.requests, client.stats
+
+    connections, requests, stats = run(scenario())
+    assert requests == 25
+    assert connections == stats['connections'] <= 4
+
+
+def test_5xx_is_retried_with_backoff():
+    async def scenario():
+        async with FlakyServer(failures=2) as server, \
+                AsyncCathedralClient(server.url, retries=3, backoff=0.001) as client:
+            session_id = await client.create_session()
+            return session_id, server.requests, client.stats
+
+    session_id, requests, stats = run(scenario())
+    assert session_id.startswith('session_')
+    assert requests == 3
+    assert stats['retries'] == 2
+
+
+def test_retries_give_up_after_the_limit():
+    async def scenario():
+        async with FlakyServer(failures=10) as server, \
+                AsyncCathedralClient(server.url, retries=2, backoff=0.001) as client:
+            try:
+                await client.create_session()
+            except Exception as e:
+                return type(e).__name__, server.requests
+
+    assert run(scenario()) == ('_Retryable', 3)
+
+
+def test_replay_bounds_concurrent_sessions_and_connections():
+    transcripts = [[f'session {s} turn {t}' for t in range(3)] for s in range(12)]
+
+    async def scenario():
+        async with StandInServer(latency=0.005) as server, \
+                AsyncCathedralClient(server.url, pool_size=2, concurrency=3) as client:
+            active = peak = 0
+            analyze_many = client.analyze_many
+
+            async def counted(turns, **kwargs):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                try:
+                    return await analyze_many(turns, **kwargs)
+                finally:
+                    active -= 1
+
+            client.analyze_many = counted
+            replays = await client.replay(transcripts)
+            return replays, peak, server.connections
+
+    replays, peak, connections = run(scenario())
+    assert len(replays) == len(transcripts)
+    assert peak == 3
+    assert connections <= 2
+
+
+def test_pipelined_turns_keep_their_order_per_session():
+    transcripts = [[f'session {s} turn {t}' for t in range(20)] for s in range(6)]
+
+    async def scenario():
+        async with StandInServer() as server, \
+                AsyncCathedralClient(server.url, pool_size=3, concurrency=6, pipeline_depth=8) as client:
+            replays = await client.replay(transcripts, history=True)
+            return replays, server.requests
+
+    replays, requests = run(scenario())
+    for turns, replay in zip(transcripts, replays):
+        assert [result['turnCount'] for result in replay['results']] == list(range(1, len(turns) + 1))
+        assert [entry['text'] for entry in replay['history']['history']] == turns
+    assert requests == sum(len(turns) + 2 for turns in transcripts)
+
+
+def test_unparseable_body_fails_the_session_not_the_run():
+    async def garbage(reader, writer):
+        try:
+            while await reader.readline() not in (b'\r\n', b''):
+                pass
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 8\r\nConnection: close\r\n\r\nnot json')
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def scenario():
+        server = await asyncio.start_server(garbage, '127.0.0.1', 0)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        try:
+            async with AsyncCathedralClient(url, retries=0) as client:
+                return await LoadGenerator(client, [['hello']], rate=1000, sessions=3).run()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    report = run(scenario())
+    assert report['totals']['sessions_failed'] == 3
+    assert report['endpoints']['/session']['errors_by_type'] == {'invalid JSON': 3}
+
+
+def test_latency_histogram_percentiles_within_bucket_error():
+    rng = random.Random(0)
+    samples = [rng.lognormvariate(math.log(0.01), 0.8) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+
+    ordered = sorted(samples)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[math.ceil(q * len(ordered)) - 1]
+        assert exact <= histogram.percentile(q) <= exact * LatencyHistogram.GROWTH ** 2
+    assert histogram.count == len(samples)
+    assert histogram.percentile(1.0) == max(samples)
+    assert LatencyHistogram().summary()['p99'] == 0.0